@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+from datetime import date
+
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+DEFAULT_CALENDAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "academic_calendar.json")
+
+
+class AcademicCalendar:
+    """
+    Holidays, exam blocks and off-day rules for any number of years.
+    Every year is compiled once into a boolean off-day bitmap (index = day of year),
+    so single-date checks are O(1) and date ranges are masked with one slice.
+    """
+
+    def __init__(self, holidays=None, exam_blocks=None, off_weekdays=(6,), off_saturdays=(3,),
+                 semester_ends=None, year_overrides=None):
+        self.holidays = dict(holidays or {})  # {date(2026, 1, 26): "Republic Day"}
+        self.exam_blocks = list(exam_blocks or [])  # [("Mid-sems", date(...), date(...))]
+        self.off_weekdays = set(off_weekdays)  # 6 = Sunday
+        self.off_saturdays = set(off_saturdays)  # Nth Saturday of the month, 3 = days 15-21
+        self.semester_ends = {'even': (5, 31), 'odd': (12, 15)}
+        self.semester_ends.update(semester_ends or {})
+        self.year_overrides = dict(year_overrides or {})  # {2027: {'even': (5, 29)}}
+        self._bitmaps = {}  # {2026: np.array([False, True, ...])}
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Loads a JSON calendar:
+        {"off_weekdays": [6], "off_saturdays": [3], "semester_ends": {"even": "05-31", "odd": "12-15"},
+         "holidays": {"2026-01-26": "Republic Day"},
+         "exam_blocks": [{"name": "Mid-sems", "start": "2026-02-14", "end": "2026-02-20"}],
+         "years": {"2027": {"semester_ends": {"even": "05-29"}}}}
+        """
+        with open(file_path, encoding="utf-8") as f:
+            raw = json.load(f)
+
+        def month_day(s):
+            m, d = s.split("-")
+            return int(m), int(d)
+
+        holidays = {date.fromisoformat(k): v for k, v in raw.get("holidays", {}).items()}
+        blocks = [(b.get("name", "Exams"), date.fromisoformat(b["start"]), date.fromisoformat(b["end"]))
+                  for b in raw.get("exam_blocks", [])]
+        overrides = {int(y): {k: month_day(v) for k, v in cfg.get("semester_ends", {}).items()}
+                     for y, cfg in raw.get("years", {}).items()}
+        return cls(holidays=holidays, exam_blocks=blocks,
+                   off_weekdays=raw.get("off_weekdays", [6]),
+                   off_saturdays=raw.get("off_saturdays", [3]),
+                   semester_ends={k: month_day(v) for k, v in raw.get("semester_ends", {}).items()},
+                   year_overrides=overrides)
+
+    @classmethod
+    def default(cls):
+        if os.path.exists(DEFAULT_CALENDAR_PATH):
+            return cls.from_file(DEFAULT_CALENDAR_PATH)
+        return cls()
+
+    def _year_bitmap(self, year):
+        bitmap = self._bitmaps.get(year)
+        if bitmap is not None: return bitmap
+
+        jan1 = date(year, 1, 1)
+        n_days = (date(year + 1, 1, 1) - jan1).days
+        days = np.datetime64(jan1) + np.arange(n_days)
+        weekday = (jan1.weekday() + np.arange(n_days)) % 7
+        dom = (days - days.astype('datetime64[M]')).astype(int) + 1
+
+        bitmap = np.isin(weekday, list(self.off_weekdays))
+        for nth in self.off_saturdays:
+            bitmap |= (weekday == 5) & ((dom - 1) // 7 + 1 == nth)
+        for d in self.holidays:
+            if d.year == year: bitmap[(d - jan1).days] = True
+        for _, start, end in self.exam_blocks:
+            lo, hi = max(start, jan1), min(end, date(year, 12, 31))
+            if lo <= hi: bitmap[(lo - jan1).days:(hi - jan1).days + 1] = True
+
+        self._bitmaps[year] = bitmap
+        return bitmap
+
+    def is_off(self, date_obj):
+        return bool(self._year_bitmap(date_obj.year)[date_obj.timetuple().tm_yday - 1])
+
+    def off_many(self, dates):
+        """ Vectorized is_off for an array of dates (any order, any years). """
+        days = np.asarray(dates, dtype='datetime64[D]')
+        out = np.zeros(len(days), dtype=bool)
+        if not len(days): return out
+        years = days.astype('datetime64[Y]')
+        doy = (days - years).astype(int)
+        years = years.astype(int) + 1970
+        for year in np.unique(years):
+            sel = years == year
+            out[sel] = self._year_bitmap(int(year))[doy[sel]]
+        return out
+
+    def off_mask(self, start_date, end_date):
+        """ Boolean array for [start_date, end_date], True where there are no classes. """
+        if end_date < start_date: return np.zeros(0, dtype=bool)
+        parts = []
+        for year in range(start_date.year, end_date.year + 1):
+            lo = start_date.timetuple().tm_yday - 1 if year == start_date.year else 0
+            bitmap = self._year_bitmap(year)
+            hi = end_date.timetuple().tm_yday if year == end_date.year else len(bitmap)
+            parts.append(bitmap[lo:hi])
+        return np.concatenate(parts)
+
+    def working_days(self, start_date, end_date):
+        """ Count of class days in [start_date, end_date]. """
+        return int((~self.off_mask(start_date, end_date)).sum())
+
+    def semester_end(self, year, term):
+        """ term is 'even' (Jan-Jun) or 'odd' (Jul-Dec). """
+        m, d = self.year_overrides.get(year, {}).get(term, self.semester_ends[term])
+        return date(year, m, d)
+
+    def fingerprint(self):
+        """ Stable digest of everything that decides which days are off. """
+        parts = [sorted(self.off_weekdays), sorted(self.off_saturdays), sorted(self.semester_ends.items()),
+                 sorted(self.year_overrides.items()), sorted(d.isoformat() for d in self.holidays),
+                 sorted((s.isoformat(), e.isoformat()) for _, s, e in self.exam_blocks)]
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+    def name_of(self, date_obj):
+        if date_obj in self.holidays: return self.holidays[date_obj]
+        for name, start, end in self.exam_blocks:
+            if start <= date_obj <= end: return name
+        return None
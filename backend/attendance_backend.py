@@ -1,281 +1,858 @@
-import pandas as pd
-import numpy as np
-from datetime import timedelta, date
+from datetime import timedelta, date, datetime
+from functools import partial
+import calendar
+import copy
+import json
 import math
+import os
 import re
-from sklearn.ensemble import RandomForestClassifier
+
+from backend.academic_calendar import AcademicCalendar
+from backend.cache import DiskCache, cache_key, file_digest, library_versions
+from backend.history_store import EPOCH_ORDINAL, HistoryStore
+from backend.instrumentation import NULL_PHASE, Instrumentation, instrumented
+from backend.lazy import LazyModule
+from backend.risk_models import FEATURE_SHAPE, feature_space, make_model
+from backend.schedule_engine import PLAN_STATUSES, PlanSweep, ScheduleEngine, plan_counts
+from backend.streaming import AbsenceAggregates, iter_csv_chunks
+from backend.subject_resolver import SubjectResolver, split_subject, subject_key
+from backend.summary import SUMMARY_CHUNK_ROWS, SummaryScanner, SummaryTable
+from backend.timetable import DEFAULT_WEEK_ANCHOR, TimetableFormatError, WeekTimetable, parse_timetable_frame
+
+# Imported on first use: together they are most of the GUI's cold-start time
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+sk_base = LazyModule("sklearn.base")
+
+# Bump whenever parse_timetable / parse_attendance_summary output changes, to retire cached parses
+PARSER_VERSION = 8
+
+# export_history() writes the history columns plus this file with everything else
+EXPORT_FILE = "brain.json"
+EXPORT_FORMAT = 3
+
+HEADER_TIME_RE = re.compile(r'(\d{1,2})[-:](\d{2})')
+DATE_FORMATS = ["%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y", "%d-%m-%y", "%d/%m/%y",
+                "%d-%b-%Y", "%d %b %Y", "%d-%b-%y", "%d %B %Y", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S"]
+
+
+def header_time(col):
+    """ "P8-45AM" -> "08:45" """
+    match = HEADER_TIME_RE.search(col)
+    if not match: return "Unknown"
+    h, m = match.groups()
+    return f"{int(h):02d}:{m}"
+
+
+def sniff_date_format(values):
+    """ First DATE_FORMATS entry that parses the first non-empty value, or None. """
+    sample = next((str(v).strip() for v in values if pd.notna(v) and str(v).strip()), None)
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+        except (TypeError, ValueError):
+            continue
+        return fmt
+    return None
+
+
+def parse_dates(values, fmt=None):
+    """
+    Day-first date parsing with the format sniffed from the first value,
+    so pandas applies one explicit format instead of inferring per column.
+    """
+    fmt = fmt or sniff_date_format(values)
+    if fmt: return pd.to_datetime(values, format=fmt, errors='coerce')
+    return pd.to_datetime(values, dayfirst=True, errors='coerce')
 
 
 class AttendanceBrain:
     def __init__(self):
-        self.model_daily = RandomForestClassifier(n_estimators=100, random_state=42)
-        self.timetable = {}  # {0: {'08:45': 'Social Psych'}, ...}
-        self.full_history = []
-        self.subject_map = {}  # Maps "BPSY201-4" -> "SOCIAL PSYCHOLOGY"
+        self._model_daily = None  # built on first use, see model_daily
+        self.week_timetable = WeekTimetable.empty()  # (week pattern, weekday, slot) -> subject
+        self.week_anchor = DEFAULT_WEEK_ANCHOR  # Monday of a week that follows pattern 0 ("Week A")
+        self.history = HistoryStore()
+        self.aggregates = None  # AbsenceAggregates when history was streamed instead of loaded
+        self.subject_resolver = SubjectResolver()  # raw strings -> canonical names, see subject_map
         self.is_trained = False
+        self.risk_model = "forest"  # which backend model_daily is built from, see set_risk_model()
+        self.n_jobs = None
+        self._risk_table = None  # risk for every (weekday, day - 1, month - 1), rebuilt after each fit
+        self._risk_cache = {}  # {(2026, 3): array of daily risks for March}
+
+        # Append-mode loads grow the forest instead of refitting, until one of these trips a full refit
+        self.incremental = {'base_trees': 100, 'trees_per_update': 20, 'max_trees': 300,
+                            'refit_growth': 0.5, 'drift': 0.15}
+        self._fit_stats = {'days': 0, 'absent_rate': 0.0}  # at the last full refit
+        self.model_cache = None  # DiskCache of trained models, see enable_cache()
+        self.parse_cache = None  # DiskCache of parsed timetables / summaries
 
         self.auto_total = 0
         self.auto_absent = 0
         self.has_summary_data = False
+        self.summary_table = SummaryTable.empty()  # the summary's subject rows
 
-        self.public_holidays = {
-            "Hazrat Ali Jayanti": date(2026, 1, 3),
-            "Republic Day": date(2026, 1, 26),
-            "Maha Shivaratri": date(2026, 2, 15),
-            "Holika Dahan": date(2026, 3, 2),
-            "Holi": date(2026, 3, 4),
-            "Id Ul-Fitr": date(2026, 3, 21),
-            "Ram Navami": date(2026, 3, 26),
-            "Mahavir Jayanti": date(2026, 3, 31),
-            "Good Friday": date(2026, 4, 3),
-            "Dr. B.R. Ambedkar Jayanti": date(2026, 4, 14),
-            "Buddha Purnima": date(2026, 5, 1),
-            "Bakrid/Eid-Ul-Zuha": date(2026, 5, 27),
-            "Muharram": date(2026, 6, 26),
-            "Independence Day": date(2026, 8, 15),
-            "Eid-E-Milad/Barawafat": date(2026, 8, 26),
-            "Raksha Bandhan": date(2026, 8, 28),
-            "Janmashatami": date(2026, 9, 4),
-            "Mahatam Gandhi Jayanti": date(2026, 10, 2),
-            "Dusshera (Maha Ashtami)": date(2026, 10, 19),
-            "Dushera (Maha Navami)/Vijaydashami": date(2026, 10, 20),
-            "Deepawali": date(2026, 11, 8),
-            "Govardhan Pooja": date(2026, 11, 9),
-            "Bhai Dooj / Chitragupta Jayanti": date(2026, 11, 11),
-            "Guru Nanak Jayanti / Kartik Purnima": date(2026, 11, 24),
-            "Christmas Day": date(2026, 12, 25),
-            "Mid-sems 4th 1": date(2026, 2, 14),
-            "Mid-sems 4th 2": date(2026, 2, 15),
-            "Mid-sems 4th 3": date(2026, 2, 16),
-            "Mid-sems 4th 4": date(2026, 2, 17),
-            "Mid-sems 4th 5": date(2026, 2, 18),
-            "Mid-sems 4th 6": date(2026, 2, 19),
-            "Mid-sems 4th 7": date(2026, 2, 20),
-        }
-        self.sem_config = {'even_end': (5, 31), 'odd_end': (12, 15)}
+        self.calendar = AcademicCalendar.default()
+        self._schedule_engine = None
+        self.instruments = None  # Instrumentation while enable_instrumentation() is on
+
+    @property
+    def model_daily(self):
+        if self._model_daily is None:
+            self._model_daily = make_model(self.risk_model, self.n_jobs)
+        return self._model_daily
+
+    @model_daily.setter
+    def model_daily(self, model):
+        self._model_daily = model
+
+    @property
+    def subject_map(self):
+        """ Maps "BPSY201-4" -> "SOCIAL PSYCHOLOGY": the subject resolver's exact-match table. """
+        return self.subject_resolver.mapping
+
+    @subject_map.setter
+    def subject_map(self, mapping):
+        self.subject_resolver.replace(mapping)
+
+    def subject_resolution_stats(self):
+        """ How subject strings were resolved so far: exact / parsed / normalized / fuzzy / unmatched. """
+        return self.subject_resolver.summary()
+
+    @property
+    def subject_totals(self):
+        """ {"SOCIAL PSYCHOLOGY": (held, absent)}: summary_table in the planners' layout. Read-only. """
+        return self.summary_table.subject_totals()
+
+    @subject_totals.setter
+    def subject_totals(self, totals):
+        self.summary_table = SummaryTable.from_totals(totals)
+
+    @property
+    def timetable(self):
+        """ {0: {'08:45': 'Social Psych'}, ...}: week_timetable with its week patterns merged. Read-only. """
+        return self.week_timetable.weekly()
+
+    @timetable.setter
+    def timetable(self, weekly):
+        self.week_timetable = WeekTimetable.from_dict(weekly)
+
+    def set_week_anchor(self, day):
+        """ Rotating timetables: the week containing day follows the first pattern ("Week A"). """
+        self.week_anchor = day - timedelta(days=day.weekday())
+
+    def set_risk_model(self, name, n_jobs=None, **params):
+        """
+        Switches the daily-risk backend ("forest", "hist_gb", "frequency" or "logistic", see
+        backend/risk_models.py) and retrains it on whatever history is loaded. n_jobs sets the
+        forest's worker count; params go to the backend's set_params.
+        """
+        self.model_daily = make_model(name, n_jobs, **params)
+        self.risk_model, self.n_jobs = name, n_jobs
+        self.is_trained = False
+        self._risk_table = None
+        self._risk_cache = {}
+        self.train_models()
+
+    def snapshot(self):
+        """
+        Copy that can be loaded into on another thread while this brain keeps serving reads.
+        Containers that loads mutate in place are copied; the fitted model is shared because
+        training always replaces model_daily instead of refitting it in place.
+        """
+        twin = copy.copy(self)
+        twin.subject_resolver = self.subject_resolver.copy()
+        twin.history = self.history.copy()
+        twin.incremental = dict(self.incremental)
+        twin._risk_cache = dict(self._risk_cache)
+        twin._schedule_engine = None
+        return twin
+
+    def enable_cache(self, cache_dir=None, max_bytes=256 * 2 ** 20, models=True, parses=True):
+        """
+        Persist trained models (keyed by input bytes, model config and library versions) and parsed
+        timetables / summaries (keyed by input bytes and PARSER_VERSION) between launches.
+        """
+        if models: self.model_cache = DiskCache(cache_dir, max_bytes, namespace="model")
+        if parses: self.parse_cache = DiskCache(cache_dir, max_bytes // 8, namespace="parse")
+
+    def cache_stats(self):
+        return {name: c.summary() for name, c in (("model", self.model_cache), ("parse", self.parse_cache)) if c}
+
+    def clear_caches(self):
+        for c in (self.model_cache, self.parse_cache):
+            if c: c.invalidate()
+
+    def enable_instrumentation(self, enabled=True):
+        """ Starts (or stops) recording call counts, latencies and rows; see instrumentation_stats(). """
+        if not enabled:
+            self.instruments = None
+        elif self.instruments is None:
+            self.instruments = Instrumentation()
+        return self.instruments
+
+    def instrumentation_stats(self):
+        return self.instruments.summary() if self.instruments is not None else {}
+
+    def _phase(self, name):
+        return self.instruments.phase(name) if self.instruments is not None else NULL_PHASE
+
+    @instrumented
+    def load_calendar(self, file_path):
+        """ Replaces the holiday / exam / off-Saturday calendar with one loaded from JSON. """
+        try:
+            self.calendar = AcademicCalendar.from_file(file_path)
+            self._risk_cache = {}
+            return True, f"Calendar: {len(self.calendar.holidays)} holidays, {len(self.calendar.exam_blocks)} exam blocks"
+        except Exception as e:
+            return False, str(e)
 
     def get_semester_end_date(self, start_date):
         year, month = start_date.year, start_date.month
         if 1 <= month <= 6:
-            end = date(year, self.sem_config['even_end'][0], self.sem_config['even_end'][1])
+            end = self.calendar.semester_end(year, 'even')
             return start_date + timedelta(days=180) if start_date > end else end
         else:
-            end = date(year, self.sem_config['odd_end'][0], self.sem_config['odd_end'][1])
-            return date(year + 1, 5, 31) if start_date > end else end
+            end = self.calendar.semester_end(year, 'odd')
+            return self.calendar.semester_end(year + 1, 'even') if start_date > end else end
 
     def is_holiday_or_off(self, date_obj):
-        if date_obj.weekday() == 6: return True
-        if date_obj.weekday() == 5 and 15 <= date_obj.day <= 21: return True
-        return date_obj in self.public_holidays.values()
+        return self.calendar.is_off(date_obj)
 
     def clean_subject_name(self, raw_text):
         """
-        Extracts clean name from "SUBJECT NAME CODE".
-        Example: "SOCIAL PSYCHOLOGY BPSY201-4" -> "SOCIAL PSYCHOLOGY"
+        Extracts clean name from "SUBJECT NAME CODE", or the known subject a variant resolves to.
+        Example: "SOCIAL PSYCHOLOGY BPSY201-4" -> "SOCIAL PSYCHOLOGY", "Social Psych." -> "SOCIAL PSYCHOLOGY"
+        """
+        return self.subject_resolver.resolve(raw_text)[0]
+
+    def clean_subject_sequence(self, raw_values, fuzzy=True):
+        """
+        clean_subject_name on every value in order, with the resolver run once per distinct
+        string. A bare code seen before the "NAME CODE" string that defines it changes meaning
+        mid-sequence, so those are replayed. Variants are matched after the exact pass, so they
+        also see the names defined later in the sequence. fuzzy=False never matches a variant to
+        a merely similar name (SubjectResolver.resolve_strict), as timetable cells need.
         """
-        raw_text = str(raw_text).strip()
+        codes, uniques = pd.factorize(np.asarray(raw_values, dtype=object), use_na_sentinel=False)
+        if not len(uniques): return np.empty(0, dtype=object)
+        first_pos = np.unique(codes, return_index=True)[1]
+        resolver = self.subject_resolver
 
-        # 1. If we already mapped this code/text to a clean name, use it
-        if raw_text in self.subject_map:
-            return self.subject_map[raw_text]
+        values, learned, variants = [], {}, []  # learned: {code: [(position, name), ...]}
+        for k, (u, pos) in enumerate(zip(uniques, first_pos)):
+            name, outcome = resolver.resolve(u, fuzzy=False)
+            if outcome == "parsed":
+                learned.setdefault(split_subject(str(u).strip())[1], []).append((pos, name))
+            elif outcome is None:
+                variants.append(k)
+            values.append(name)
+        for k in variants:
+            # A code this sequence defines keeps its raw form before the definition, as before
+            if values[k] in learned: continue
+            values[k] = (resolver.resolve(values[k]) if fuzzy else resolver.resolve_strict(values[k]))[0]
 
-        # 2. Heuristic: Split by known separators or regex
-        # Look for the pattern: (Name) (Code with numbers/dashes at end)
-        match = re.search(r'^(.*?)\s+([A-Z0-9-]{3,})$', raw_text)
-        if match:
-            name_part = match.group(1).strip()
-            code_part = match.group(2).strip()
-            # If name part is substantial, map code -> name
-            if len(name_part) > 2:
-                self.subject_map[code_part] = name_part
-                self.subject_map[raw_text] = name_part
-                return name_part
+        out = np.asarray(values, dtype=object)[codes]
+        for k, u in enumerate(uniques):
+            events = learned.get(str(u).strip())
+            if not events: continue
+            event_pos = np.array([p for p, _ in events])
+            for p in np.flatnonzero(codes == k):
+                i = np.searchsorted(event_pos, p) - 1
+                if i >= 0: out[p] = events[i][1]
+        return out
 
-        return raw_text
+    @instrumented
+    def parse_timetable(self, file_path, chunksize=None, progress=None, section=None, vectorized=True):
+        """
+        Fills week_timetable (see backend/timetable.py); section keeps one "Section X" block of a
+        multi-section export, which otherwise defaults to its first section (the message says so)
+        instead of merging every section's classes. chunksize reads the sheet in pieces; progress(rows_done, bytes_done,
+        bytes_total). vectorized=False runs the original row-by-row parser, which knows a single
+        weekly grid only. With enable_cache(), an unchanged file is restored from parse_cache.
+        """
+        if self.parse_cache is None: return self._parse_timetable_file(file_path, chunksize, progress, section, vectorized)
+        # The subject names it produces depend on what subject_map already knows
+        key = cache_key("timetable", PARSER_VERSION, file_digest(file_path), section, vectorized,
+                        sorted(self.subject_map.items()))
+        entry = self.parse_cache.get(key)
+        if entry is not None:
+            self.week_timetable = WeekTimetable.from_state(entry["timetable"])
+            self.subject_resolver.update(entry["learned"])
+            return True, entry["msg"]
+
+        before = dict(self.subject_map)
+        ok, msg = self._parse_timetable_file(file_path, chunksize, progress, section, vectorized)
+        if ok:
+            self.parse_cache.put(key, {"timetable": self.week_timetable.to_state(), "msg": msg,
+                                       "learned": self._learned_since(before)})
+        return ok, msg
 
-    def parse_timetable(self, file_path):
-        self.timetable = {}
+    def _learned_since(self, before):
+        return {k: v for k, v in self.subject_map.items() if k not in before or before[k] != v}
+
+    def _parse_timetable_file(self, file_path, chunksize=None, progress=None, section=None, vectorized=True):
+        self.week_timetable = WeekTimetable.empty()
         try:
-            df = pd.read_csv(file_path, header=None, dtype=str).fillna("")
-            days_map = {'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5}
-            col_to_time = {}
-
-            # 1. Map Time Columns
-            for idx, row in df.iterrows():
-                row_times = {}
-                for col_idx, val in enumerate(row.values):
-                    val_str = str(val).strip()
-                    match = re.search(r'(\d{1,2}:\d{2})', val_str)
-                    if match:
-                        # Normalize to HH:MM format
-                        h, m = match.group(1).split(':')
-                        clean_time = f"{int(h):02d}:{m}"
-                        row_times[col_idx] = clean_time
-                if len(row_times) >= 3:
-                    col_to_time = row_times
-                    break
-
-            if not col_to_time: return False, "Could not detect time slots."
-
-            # 2. Extract and Clean Subjects
-            for idx, row in df.iterrows():
-                row_vals = [str(x).strip().lower() for x in row.values]
-                if not row_vals: continue
-                first_col = re.sub(r'[^\w]', '', row_vals[0])
-
-                if first_col in days_map:
-                    current_day = days_map[first_col]
-                    if current_day not in self.timetable: self.timetable[current_day] = {}
-
-                    for col_idx, time_str in col_to_time.items():
-                        if col_idx < len(row):
-                            raw_subject = str(row[col_idx]).strip()
-                            bad = ['nan', '', 'break', 'lunch', 'mentoring', 'session', 'course code', 'time']
-                            if len(raw_subject) > 2 and not any(k == raw_subject.lower() for k in bad):
-                                # CLEAN THE NAME HERE
-                                clean_name = self.clean_subject_name(raw_subject)
-                                self.timetable[current_day][time_str] = clean_name
-
-            return True, f"Parsed {sum(len(v) for v in self.timetable.values())} classes."
+            if chunksize:
+                chunks = iter_csv_chunks(file_path, chunksize, progress, header=None, dtype=str)
+            else:
+                with self._phase("parse_timetable.read") as ph:
+                    chunks = [pd.read_csv(file_path, header=None, dtype=str)]
+                    ph.rows = len(chunks[0])
+            if not vectorized: return self._parse_timetable_rows(chunks)
+
+            with self._phase("parse_timetable.frame") as ph:
+                df = pd.concat(list(chunks), ignore_index=True) if chunksize else chunks[0]
+                ph.rows = len(df)
+                # Cells keep their own subject: a timetable defines subjects, it is not a variant of one
+                self.week_timetable = parse_timetable_frame(df, partial(self.clean_subject_sequence, fuzzy=False),
+                                                            section)
+        except TimetableFormatError as e:
+            return False, str(e)
         except Exception as e:
             return False, f"Error: {e}"
+        tt = self.week_timetable
+        weeks = f" over weeks {', '.join(tt.patterns)}" if tt.n_patterns > 1 else ""
+        where = ""
+        if len(tt.sections) > 1:
+            where = f" for {tt.section}"
+            if section is None:
+                where += f", the first of {len(tt.sections)} sections ({tt.section_list()}); pick another with section"
+        return True, f"Parsed {tt.n_classes} classes{weeks}{where}."
+
+    def _parse_timetable_rows(self, chunks):
+        timetable = {}
+        col_to_time = {}
+        pending = []  # rows seen before the time header, replayed once it is found
+        for df in chunks:
+            df = df.fillna("")
+            for row in df.itertuples(index=False, name=None):
+                if not col_to_time:
+                    # 1. Map Time Columns
+                    pending.append(row)
+                    with self._phase("parse_timetable.columns") as ph:
+                        ph.rows = 1
+                        row_times = self._timetable_time_row(row)
+                    if len(row_times) >= 3:
+                        col_to_time = row_times
+                        with self._phase("parse_timetable.subjects") as ph:
+                            ph.rows = len(pending)
+                            for early in pending: self._timetable_day_row(timetable, early, col_to_time)
+                        pending = []
+                    continue
+                # 2. Extract and Clean Subjects
+                with self._phase("parse_timetable.subjects") as ph:
+                    ph.rows = 1
+                    self._timetable_day_row(timetable, row, col_to_time)
+
+        if not col_to_time: return False, "Could not detect time slots."
+        self.week_timetable = WeekTimetable.from_dict(timetable)
+        return True, f"Parsed {sum(len(v) for v in timetable.values())} classes."
 
-    def parse_attendance_summary(self, file_path):
-        """ Learns Subject Names from Summary and gets Totals """
+    def _timetable_time_row(self, row):
+        row_times = {}
+        for col_idx, val in enumerate(row):
+            val_str = str(val).strip()
+            match = re.search(r'(\d{1,2}:\d{2})', val_str)
+            if match:
+                # Normalize to HH:MM format
+                h, m = match.group(1).split(':')
+                clean_time = f"{int(h):02d}:{m}"
+                row_times[col_idx] = clean_time
+        return row_times
+
+    def _timetable_day_row(self, timetable, row, col_to_time):
+        days_map = {'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5}
+        row_vals = [str(x).strip().lower() for x in row]
+        if not row_vals: return
+        first_col = re.sub(r'[^\w]', '', row_vals[0])
+
+        if first_col in days_map:
+            current_day = days_map[first_col]
+            if current_day not in timetable: timetable[current_day] = {}
+
+            for col_idx, time_str in col_to_time.items():
+                if col_idx < len(row):
+                    raw_subject = str(row[col_idx]).strip()
+                    bad = ['nan', '', 'break', 'lunch', 'mentoring', 'session', 'course code', 'time']
+                    if len(raw_subject) > 2 and not any(k == raw_subject.lower() for k in bad):
+                        # CLEAN THE NAME HERE
+                        clean_name = self.subject_resolver.resolve_strict(raw_subject)[0]
+                        timetable[current_day][time_str] = clean_name
+
+    @instrumented
+    def parse_attendance_summary(self, file_path, chunksize=None, progress=None):
+        """
+        Learns Subject Names from Summary and gets Totals, plus summary_table (held, attended,
+        absent, percentage per subject). The file is read once, chunksize rows at a time, and only
+        up to its first "Total" row: a multi-student export costs the first student's block.
+        With enable_cache(), an unchanged file is restored from parse_cache instead of re-parsed.
+        """
+        if self.parse_cache is None: return self._parse_summary_file(file_path, chunksize, progress)
+        key = cache_key("summary", PARSER_VERSION, file_digest(file_path))
+        entry = self.parse_cache.get(key)
+        if entry is None:
+            before = dict(self.subject_map)
+            had = self.has_summary_data
+            self.has_summary_data = False
+            ok, msg = self._parse_summary_file(file_path, chunksize, progress)
+            found = self.has_summary_data
+            self.has_summary_data = had or found
+            if not ok: return ok, msg
+            entry = {"learned": self._learned_since(before),
+                     "totals": (self.auto_total, self.auto_absent) if found else None,
+                     "table": self.summary_table.to_state()}
+            self.parse_cache.put(key, entry)
+            return ok, msg
+
+        self.subject_resolver.update(entry["learned"])
+        if entry["table"]["subjects"]: self.summary_table = SummaryTable.from_state(entry["table"])
+        if entry["totals"]:
+            self.auto_total, self.auto_absent = entry["totals"]
+            self.has_summary_data = True
+        return True, f"Auto: {self.auto_total} Total, {self.auto_absent} Absent"
+
+    def _parse_summary_file(self, file_path, chunksize=None, progress=None):
         try:
-            df = pd.read_csv(file_path)
-            # Normalize headers
-            df.columns = [c.strip() for c in df.columns]
-
-            # 1. Learn Names (Map Code/Name if possible)
-            # If summary has "Subject Name", assume it is the source of truth
-            col_sub = next((c for c in df.columns if 'Subject' in c), None)
-            if col_sub:
-                for val in df[col_sub].dropna():
-                    clean = str(val).strip()
-                    # Add to map so fuzzy match works later
-                    self.subject_map[clean] = clean
-
-            # 2. Get Totals
-            df_no_header = pd.read_csv(file_path, header=None)
-            for idx, row in df_no_header.iterrows():
-                row_str = " ".join([str(x).lower() for x in row.values[:3]])
-                if "total" in row_str and "percentage" not in row_str:
-                    nums = []
-                    for val in row.values:
-                        try:
-                            v = float(str(val).replace('%', '').strip())
-                            if not np.isnan(v): nums.append(int(v))
-                        except:
-                            pass
-                    if len(nums) >= 3:
-                        self.auto_total = nums[-3]
-                        self.auto_absent = nums[-1]
-                        if self.auto_total < self.auto_absent:
-                            self.auto_total = nums[-1]
-                            self.auto_absent = nums[-3]
-                        self.has_summary_data = True
-                        break
+            with self._phase("parse_attendance_summary.scan") as ph:
+                scanner = SummaryScanner()
+                chunks = iter_csv_chunks(file_path, chunksize or SUMMARY_CHUNK_ROWS, progress, header=None, dtype=str)
+                try:
+                    table = next(scanner.tables(chunks), None)
+                finally:
+                    chunks.close()
+                ph.rows = scanner.rows
+            if table is not None:
+                # Summary names are the source of truth; map them so fuzzy matching finds them later
+                self.subject_resolver.update({name: name for name in table.subjects})
+                if len(table): self.summary_table = table
+                if table.total is not None:
+                    self.auto_total, self.auto_absent = table.total[0], table.total[2]
+                    self.has_summary_data = True
             return True, f"Auto: {self.auto_total} Total, {self.auto_absent} Absent"
         except Exception as e:
             return False, str(e)
 
-    def load_absence_details(self, file_path):
+    @instrumented
+    def load_absence_details(self, file_path, vectorized=True, train=True, append=False, progress=None):
+        """
+        vectorized=True works column-at-a-time (melt, one holiday mask, one subject lookup per
+        distinct string); vectorized=False is the original row-by-row loop. Both build the same history.
+        train=False skips fitting the daily risk model (batch runs that only need plans and risks).
+        append=True keeps the current history, adds only dates it does not have yet and
+        updates the model incrementally (see update_models).
+        progress(rows_done, bytes_done, bytes_total) is called while the file is read.
+        """
         try:
-            abs_df = pd.read_csv(file_path)
-            abs_df['Date'] = pd.to_datetime(abs_df['Date'], dayfirst=True, errors='coerce').dt.date
-            abs_df = abs_df.dropna(subset=['Date'])
+            with self._phase("load_absence_details.read") as ph:
+                if progress:
+                    abs_df = pd.concat(list(iter_csv_chunks(file_path, 50_000, progress)), ignore_index=True)
+                else:
+                    abs_df = pd.read_csv(file_path)
+                ph.rows = len(abs_df)
+            with self._phase("load_absence_details.dates") as ph:
+                ph.rows = len(abs_df)
+                parsed = parse_dates(abs_df['Date'])
+                valid = parsed.notna().to_numpy()
+                abs_df['Date'] = parsed.dt.date
+                abs_df, days = abs_df[valid], parsed[valid].to_numpy(dtype='datetime64[D]')
             if abs_df.empty: return False, "No valid dates."
 
-            self.full_history = []
             col_total = next((c for c in abs_df.columns if 'Total' in c), None)
 
             # Identify Time Columns (P8-45AM etc)
             time_cols = [c for c in abs_df.columns if "P" in c and c not in ['Total', 'Percentage']]
 
-            for idx, row in abs_df.iterrows():
-                d = row['Date']
-                if self.is_holiday_or_off(d): continue
-
-                is_absent_day = 0
-                if col_total:
-                    val = pd.to_numeric(row[col_total], errors='coerce')
-                    if val > 0: is_absent_day = 1
-
-                for col in time_cols:
-                    val = str(row[col]).strip()
-                    if val and val.lower() != 'nan':
-                        # Infer time string for heatmap matching
-                        time_guess = "Unknown"
-                        match = re.search(r'(\d{1,2})[-:](\d{2})', col)
-                        if match:
-                            h, m = match.groups()
-                            time_guess = f"{int(h):02d}:{m}"
-
-                        # Use Clean Name
-                        clean_name = self.clean_subject_name(val)
-
-                        self.full_history.append({
-                            'Date': d, 'Day': d.weekday(),
-                            'Subject': clean_name,
-                            'Time': time_guess,
-                            'IsAbsent': 1
-                        })
-                        is_absent_day = 1
-
-                self.full_history.append({'Date': d, 'Subject': 'Daily_Aggregate', 'IsAbsent': is_absent_day})
+            append = append and bool(self.history) and self.aggregates is None
+            if append:
+                new = ~np.isin(days.astype(np.int64) + EPOCH_ORDINAL, self.history.agg_day)
+                abs_df, days = abs_df[new], days[new]
+                if abs_df.empty: return True, "No new dates."
+
+            self.aggregates = None
+            if vectorized:
+                batch = self._history_from_columns(abs_df, days, col_total, time_cols)
+            else:
+                with self._phase("load_absence_details.rows") as ph:
+                    ph.rows = len(abs_df)
+                    batch = HistoryStore.from_records(self._history_from_rows(abs_df, col_total, time_cols))
+
+            if not append:
+                self.history = batch
+                if train: return True, "Absence Details Loaded." + self._train_cached(file_path)
+                return True, "Absence Details Loaded."
+
+            if not batch: return True, "No new dates."
+            self.history.extend(batch)
+            mode = self.update_models(batch.n_days) if train else "skipped"
+            return True, f"Absence Details Appended ({batch.n_days} new days, model {mode})."
+        except Exception as e:
+            return False, str(e)
+
+    def _history_from_rows(self, abs_df, col_total, time_cols):
+        history = []
+        for idx, row in abs_df.iterrows():
+            d = row['Date']
+            if self.is_holiday_or_off(d): continue
 
+            is_absent_day = 0
+            if col_total:
+                val = pd.to_numeric(row[col_total], errors='coerce')
+                if val > 0: is_absent_day = 1
+
+            for col in time_cols:
+                val = str(row[col]).strip()
+                if val and val.lower() != 'nan':
+                    # Infer time string for heatmap matching
+                    time_guess = header_time(col)
+
+                    # Use Clean Name
+                    clean_name = self.clean_subject_name(val)
+
+                    history.append({
+                        'Date': d, 'Day': d.weekday(),
+                        'Subject': clean_name,
+                        'Time': time_guess,
+                        'IsAbsent': 1
+                    })
+                    is_absent_day = 1
+
+            history.append({'Date': d, 'Subject': 'Daily_Aggregate', 'IsAbsent': is_absent_day})
+        return history
+
+    def _melt_absences(self, abs_df, days, col_total, time_cols):
+        """
+        Column-at-a-time core of the vectorized loader. Returns the kept rows' date ordinals and
+        daily-absent flags, plus (row, subject, time) for every absent slot in row-major order.
+        """
+        # 1. Drop holidays / off-days with one vectorized calendar lookup
+        with self._phase("absences.holidays") as ph:
+            ph.rows = len(days)
+            keep = ~self.calendar.off_many(days)
+            df = abs_df[keep].reset_index(drop=True)
+            n_rows = len(df)
+            ordinals = days[keep].astype(np.int64) + EPOCH_ORDINAL
+
+        # 2. Melt time columns into (row, column, raw subject), time derived once per header
+        with self._phase("absences.melt") as ph:
+            rows, cols, raws = [], [], []
+            for j, col in enumerate(time_cols):
+                vals = df[col][df[col].notna()].astype(str).str.strip()
+                vals = vals[(vals != '') & (vals.str.lower() != 'nan')]
+                rows.append(vals.index.to_numpy())
+                cols.append(np.full(len(vals), j))
+                raws.append(vals.to_numpy(dtype=object))
+            col_times = [header_time(c) for c in time_cols]
+
+            rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+            cols = np.concatenate(cols) if cols else np.zeros(0, dtype=int)
+            raws = np.concatenate(raws) if raws else np.zeros(0, dtype=object)
+            order = np.lexsort((cols, rows))  # row-major, same order as the row loop
+            rows, cols, raws = rows[order], cols[order], raws[order]
+            ph.rows = len(raws)
+
+        # 3. Subject names resolved once per distinct raw string
+        with self._phase("absences.subjects") as ph:
+            ph.rows = len(raws)
+            subjects = self.clean_subject_sequence(raws).tolist()
+            times = [col_times[j] for j in cols.tolist()]
+
+        # 4. Daily aggregate: Total > 0 or any absent slot
+        absent_day = np.bincount(rows, minlength=n_rows) > 0
+        if col_total:
+            absent_day |= (pd.to_numeric(df[col_total], errors='coerce') > 0).to_numpy()
+        return ordinals, absent_day.astype(np.uint8), rows, subjects, times
+
+    def _history_from_columns(self, abs_df, days, col_total, time_cols):
+        history = HistoryStore()
+        columns = self._melt_absences(abs_df, days, col_total, time_cols)
+        with self._phase("absences.store") as ph:
+            ph.rows = len(columns[2])
+            history.append(*columns)
+        return history
+
+    @instrumented
+    def stream_absence_details(self, file_path, chunksize=100_000, progress=None):
+        """
+        Bounded-memory variant of load_absence_details for very large exports. Chunks are folded
+        into self.aggregates (per-date, per-subject and per-slot counts) and history stays empty.
+        progress(rows_done, bytes_done, bytes_total) is called after every chunk.
+        """
+        try:
+            self.history = HistoryStore()
+            aggregates = AbsenceAggregates()
+            fmt = col_total = time_cols = None
+            seen = 0
+            for chunk in iter_csv_chunks(file_path, chunksize, progress):
+                if time_cols is None:
+                    col_total = next((c for c in chunk.columns if 'Total' in c), None)
+                    time_cols = [c for c in chunk.columns if "P" in c and c not in ['Total', 'Percentage']]
+                    fmt = sniff_date_format(chunk['Date'])
+                parsed = parse_dates(chunk['Date'], fmt)
+                valid = parsed.notna().to_numpy()
+                chunk['Date'] = parsed.dt.date
+                chunk, days = chunk[valid], parsed[valid].to_numpy(dtype='datetime64[D]')
+                seen += len(chunk)
+
+                ordinals, absent_day, rows, subjects, times = self._melt_absences(chunk, days, col_total, time_cols)
+                aggregates.fold(ordinals, absent_day, (ordinals[rows] - 1) % 7, subjects, times)
+
+            if not seen: return False, "No valid dates."
+            self.aggregates = aggregates
             self.train_models()
-            return True, "Absence Details Loaded."
+            return True, f"Absence Details Streamed ({aggregates.rows:,} rows)."
         except Exception as e:
             return False, str(e)
 
+    @instrumented
     def train_models(self):
-        if not self.full_history: return
-        data = [x for x in self.full_history if x['Subject'] == 'Daily_Aggregate']
-        if not data: return
-        df = pd.DataFrame(data)
-        X = [[r['Date'].weekday(), r['Date'].day, r['Date'].month] for _, r in df.iterrows()]
-        y = df['IsAbsent'].tolist()
+        if self.aggregates is not None:
+            X, y, w = self.aggregates.training_set()
+            if self.aggregates.rows > 5:
+                with self._phase("train_models.fit") as ph:
+                    ph.rows = len(X)
+                    self.model_daily = sk_base.clone(self.model_daily).fit(X, y, sample_weight=w)
+                self.is_trained = True
+                self._refresh_risk_table()
+            return
+        if not self.history: return
+        with self._phase("train_models.features") as ph:
+            X, y = self.history.daily_features()
+            ph.rows = len(X)
         if len(X) > 5:
-            self.model_daily.fit(X, y)
+            with self._phase("train_models.fit") as ph:
+                ph.rows = len(X)
+                model = sk_base.clone(self.model_daily)
+                if self.risk_model == "forest":
+                    model.set_params(warm_start=False, n_estimators=self.incremental['base_trees'])
+                self.model_daily = model.fit(X, y)
             self.is_trained = True
+            self._refresh_risk_table()
+            self._fit_stats = {'days': len(X), 'absent_rate': float(y.mean())}
+
+    def _train_cached(self, file_path):
+        """ train_models(), or restore the model trained on identical input from model_cache. """
+        if self.model_cache is None:
+            self.train_models()
+            return ""
+        versions = library_versions()
+        key = cache_key(file_digest(file_path), sorted(self.model_daily.get_params().items()),
+                        sorted(self.incremental.items()), self.calendar.fingerprint(), versions)
+        X, y = self.history.daily_features()
+
+        def valid(entry):
+            return (isinstance(entry, dict) and entry.get("versions", {}).get("sklearn") == versions["sklearn"]
+                    and np.array_equal(entry["X"], X) and np.array_equal(entry["y"], y))
+
+        entry = self.model_cache.get(key, validate=valid)
+        if entry is not None:
+            self.model_daily = entry["model"]
+            self.is_trained = entry["is_trained"]
+            self._fit_stats = entry["fit_stats"]
+            self._risk_cache = dict(entry["risk_cache"])
+            self._risk_table = entry.get("risk_table")
+            return " (cached model)"
+
+        self.train_models()
+        if self.is_trained:
+            # Precompute the next year of risk tables so the heatmap starts warm
+            today = date.today()
+            self.predict_risk_range(today.replace(day=1), date(today.year + 1, today.month, 1) - timedelta(days=1))
+        self.model_cache.put(key, {"versions": versions, "model": self.model_daily, "X": X, "y": y,
+                                   "is_trained": self.is_trained, "fit_stats": self._fit_stats,
+                                   "risk_cache": self._risk_cache, "risk_table": self._risk_table})
+        return ""
+
+    @instrumented
+    def update_models(self, n_new_days):
+        """
+        After an append, grows `trees_per_update` extra trees (warm_start) on the updated history
+        instead of refitting all of them. Falls back to train_models() when the history grew by more
+        than `refit_growth` since the last refit, the absence rate since then drifted by more than
+        `drift`, or the forest would exceed `max_trees`. Returns "grown", "refit" or "untrained".
+        Backends other than the forest always refit.
+        """
+        cfg = self.incremental
+        X, y = self.history.daily_features()
+        fit_days = self._fit_stats['days']
+        if self.risk_model != "forest":
+            self.train_models()
+            return "refit" if self.is_trained else "untrained"
+        if not self.is_trained or not fit_days or len(getattr(self.model_daily, 'classes_', [])) < 2:
+            self.train_models()
+            return "refit" if self.is_trained else "untrained"
+
+        since = y[fit_days:]
+        drift = abs(float(since.mean()) - self._fit_stats['absent_rate']) if len(since) else 0.0
+        too_big = self.model_daily.n_estimators + cfg['trees_per_update'] > cfg['max_trees']
+        if len(X) - fit_days > cfg['refit_growth'] * fit_days or drift > cfg['drift'] or too_big:
+            self.train_models()
+            return "refit"
+
+        # Grown on a copy: a fitted model may still be in use by a snapshot()
+        model = copy.deepcopy(self.model_daily)
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + cfg['trees_per_update'])
+        self.model_daily = model.fit(X, y)
+        self._refresh_risk_table()
+        return "grown"
+
+    def _refresh_risk_table(self):
+        """
+        After a fit: predicts every [weekday, day, month] the features can take in one predict_proba
+        call, so daily risks are table lookups from then on and never call the model.
+        """
+        self._risk_cache = {}
+        self._risk_table = self._predict_feature_space()
+
+    def _predict_feature_space(self):
+        with self._phase("risks.table") as ph:
+            X = feature_space()
+            ph.rows = len(X)
+            try:
+                proba = self.model_daily.predict_proba(X)
+                risks = proba[:, 1] if proba.shape[1] > 1 else np.zeros(len(X))
+            except Exception:
+                risks = np.zeros(len(X))
+        return np.asarray(risks, dtype=float).reshape(FEATURE_SHAPE)
+
+    @property
+    def risk_table(self):
+        # Models restored from a cache entry written before tables existed
+        if self._risk_table is None: self._risk_table = self._predict_feature_space()
+        return self._risk_table
+
+    def _month_risks(self, months):
+        """ Fills the risk cache for every (year, month) in `months` from the risk table. """
+        missing = [ym for ym in dict.fromkeys(months) if ym not in self._risk_cache]
+        if not missing: return
+        days, X = [], []
+        for year, month in missing:
+            month_days = [date(year, month, d) for d in range(1, calendar.monthrange(year, month)[1] + 1)]
+            days.append(month_days)
+            X.extend([d.weekday(), d.day - 1, d.month - 1] for d in month_days)
 
+        with self._phase("risks.lookup") as ph:
+            ph.rows = len(X)
+            X = np.array(X)
+            risks = self.risk_table[X[:, 0], X[:, 1], X[:, 2]]
+
+        offset = 0
+        with self._phase("risks.holidays") as ph:
+            ph.rows = len(X)
+            for ym, month_days in zip(missing, days):
+                month_risk = np.array(risks[offset:offset + len(month_days)], dtype=float)
+                month_risk[self.calendar.off_mask(month_days[0], month_days[-1])] = 0.0
+                self._risk_cache[ym] = month_risk
+                offset += len(month_days)
+
+    @instrumented
+    def predict_risk_range(self, start_date, end_date):
+        """
+        Absence risk for every date in [start_date, end_date] as a NumPy array.
+        Holidays and off-days are 0.0. Results are cached per month until the next train_models().
+        """
+        n_days = (end_date - start_date).days + 1
+        if n_days <= 0: return np.zeros(0)
+        if not self.is_trained: return np.zeros(n_days)
+
+        months = []
+        y, m = start_date.year, start_date.month
+        while (y, m) <= (end_date.year, end_date.month):
+            months.append((y, m))
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        self._month_risks(months)
+
+        out = np.concatenate([self._risk_cache[ym] for ym in months])
+        return out[start_date.day - 1:start_date.day - 1 + n_days]
+
+    @instrumented
     def predict_day_risk(self, date_obj):
-        if not self.is_trained or self.is_holiday_or_off(date_obj): return 0.0
-        try:
-            return self.model_daily.predict_proba([[date_obj.weekday(), date_obj.day, date_obj.month]])[0][1]
-        except:
-            return 0.0
+        if not self.is_trained or self.calendar.is_off(date_obj): return 0.0
+        return float(self.risk_table[date_obj.weekday(), date_obj.day - 1, date_obj.month - 1])
+
+    @property
+    def risk_counters(self):
+        """ Subject / slot counters maintained as absences are ingested (streamed or loaded). """
+        return self.aggregates.counters if self.aggregates is not None else self.history.counters
 
+    @instrumented
     def get_subject_risks(self):
-        # Return cleaned names
-        subjects = [x['Subject'] for x in self.full_history if x['Subject'] != 'Daily_Aggregate']
-        if not subjects: return []
-        from collections import Counter
-        counts = Counter(subjects)
-        most_absent = counts.most_common(1)[0][1] if counts else 1
-        return [(subj, count / most_absent) for subj, count in counts.most_common(10)]
+        # Return cleaned names; variants stored before their subject was known count toward it
+        return self.risk_counters.subject_risks(canonical=self.subject_resolver.canonical)
 
+    @instrumented
     def get_slot_risk_matrix(self):
         """
         Calculates absence risk for every (Day, Time) slot.
         Returns: {(0, '08:45'): 0.8, ...}
         """
-        # Filter for actual class absences
-        class_hist = [x for x in self.full_history if x['Subject'] != 'Daily_Aggregate']
+        # Normalized relative to the worst slot
+        return self.risk_counters.slot_risks()
 
-        slot_counts = {}
-        for item in class_hist:
-            key = (item['Day'], item['Time'])
-            slot_counts[key] = slot_counts.get(key, 0) + 1
+    @property
+    def full_history(self):
+        """ The history in the old list-of-dicts layout (materialized on every access). """
+        return self.history.to_records()
 
-        if not slot_counts: return {}
+    @instrumented
+    def export_history(self, directory):
+        """
+        Saves the parsed history as .npy columns (see HistoryStore.save) plus the timetable,
+        subject map and summary totals, so load_history() can reopen them without any CSV.
+        """
+        try:
+            if self.aggregates is not None:
+                return False, "A streamed history only keeps aggregates; load it with load_absence_details to export."
+            with self._phase("export_history.columns") as ph:
+                ph.rows = len(self.history)
+                digest = self.history.save(directory)
+            state = {"format": EXPORT_FORMAT, "columns": digest,
+                     "timetable": self.week_timetable.to_state(), "week_anchor": self.week_anchor.isoformat(),
+                     "subject_map": self.subject_map,
+                     "summary_table": self.summary_table.to_state(),
+                     "summary": [self.auto_total, self.auto_absent] if self.has_summary_data else None}
+            with open(os.path.join(directory, EXPORT_FILE), "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            return True, f"Exported {self.history.n_days:,} days to {directory}"
+        except Exception as e:
+            return False, str(e)
+
+    @instrumented
+    def load_history(self, directory, mmap=True, train=True):
+        """
+        Restores an export_history() directory exactly, replacing the current history, timetable,
+        subject map and summary totals. mmap=True memory-maps the columns read-only, so opening
+        is near-instant at any size and only the pages that queries read are loaded.
+        """
+        try:
+            state_path = os.path.join(directory, EXPORT_FILE)
+            with open(state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("format") != EXPORT_FORMAT:
+                return False, f"Unsupported export format {state.get('format')}"
+            with self._phase("load_history.columns") as ph:
+                history = HistoryStore.load(directory, mmap)
+                ph.rows = len(history)
 
-        # Normalize relative to the worst slot
-        max_abs = max(slot_counts.values())
-        return {k: v / max_abs for k, v in slot_counts.items()}
+            self.history, self.aggregates = history, None
+            self.week_timetable = WeekTimetable.from_state(state["timetable"])
+            self.week_anchor = date.fromisoformat(state["week_anchor"])
+            self.subject_map = state["subject_map"]
+            self.summary_table = SummaryTable.from_state(state["summary_table"])
+            self.has_summary_data = state["summary"] is not None
+            if self.has_summary_data: self.auto_total, self.auto_absent = state["summary"]
+            self.is_trained = False
+            self._risk_table = None
+            self._risk_cache = {}
+            msg = f"History Loaded ({history.n_days:,} days)."
+            # brain.json holds the column digest, so it keys the model cache like a CSV would
+            if train: msg += self._train_cached(state_path)
+            return True, msg
+        except Exception as e:
+            return False, str(e)
 
+    @instrumented
     def calculate_recovery_plan(self, target_percent, manual_total, manual_absent, start_date, limit_date):
         if manual_total < 0: manual_total = 0
         if manual_absent < 0: manual_absent = 0
@@ -307,14 +884,16 @@ class AttendanceBrain:
             needed = math.ceil(numerator / denominator)
             result["classes_needed"] = needed
 
-            if self.timetable:
-                schedule = self.get_recovery_schedule(needed, start_date, limit_date)
+            if self.week_timetable:
+                with self._phase("calculate_recovery_plan.schedule") as ph:
+                    schedule = self.iter_recovery_schedule(needed, start_date, limit_date)
+                    ph.rows = len(schedule)
                 if not schedule:
                     result["status"] = "no_classes_found"
                     result["end_date"] = start_date
                 else:
-                    result["days_needed"] = len(set(x['Date'] for x in schedule))
-                    result["end_date"] = schedule[-1]['Date']
+                    result["days_needed"] = schedule.days_needed
+                    result["end_date"] = schedule.end_date
                     result["schedule"] = schedule
 
                     if len(schedule) < needed:
@@ -337,22 +916,138 @@ class AttendanceBrain:
 
         return result
 
+    @instrumented
+    def sweep_recovery_plans(self, targets, start_dates, limit_dates, manual_total, manual_absent):
+        """
+        calculate_recovery_plan for every target x start date in one vectorized pass: the class-count
+        curve over the whole horizon is built once, and each cell's end date is a binary search on it.
+        limit_dates is one date for all starts or one per start. Returns a PlanSweep.
+        """
+        manual_total, manual_absent = max(manual_total, 0), max(manual_absent, 0)
+        present = manual_total - manual_absent
+        current_pct = 0.0 if manual_total == 0 else (present / manual_total) * 100
+        starts = list(start_dates)
+        limits = list(limit_dates) if isinstance(limit_dates, (list, tuple)) else [limit_dates] * len(starts)
+        T = np.asarray(targets, dtype=float)[None, :]
+        shape = (len(starts), T.shape[1])
+
+        status, needed, skippable, _ = plan_counts(np.broadcast_to(T, shape), manual_total, manual_absent)
+        deficit_ok = status == PLAN_STATUSES.index("deficit")
+        scheduled = np.zeros(shape, dtype=np.int64)
+        days_needed = np.zeros(shape, dtype=np.int64)
+        end_offset = np.zeros(shape, dtype=np.int64)
+        max_possible = np.zeros(shape)
+
+        if self.week_timetable and starts:
+            first = min(starts)
+            last = max(max(limits), max(starts))
+            with self._phase("sweep_recovery_plans.curve") as ph:
+                counts = self.get_schedule_engine().daily_counts(first, last)
+                ph.rows = len(counts)
+            C = np.concatenate([[0], np.cumsum(counts)])  # classes before day k
+            NZ = np.concatenate([[0], np.cumsum(counts > 0)])  # class days before day k
+            o = np.array([(s - first).days for s in starts])[:, None]
+            e = np.array([(l - first).days for l in limits])[:, None]
+            avail = np.where(e >= o, C[np.clip(e + 1, 0, len(counts))] - C[o], 0)
+            length = np.maximum(0, np.minimum(needed, avail))
+
+            none = deficit_ok & (length == 0)
+            found = deficit_ok & (length > 0)
+            end_abs = np.searchsorted(C, (C[o] + length).ravel(), side='left').reshape(shape) - 1
+            end_abs = np.clip(end_abs, 0, max(len(counts) - 1, 0))
+            scheduled[found] = length[found]
+            end_offset[found] = (end_abs - o)[found]
+            days_needed[found] = (NZ[np.minimum(end_abs + 1, len(counts))] - NZ[o])[found]
+            short = found & (length < needed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                max_possible[short] = ((present + length) / (manual_total + length) * 100)[short]
+            status[none] = PLAN_STATUSES.index("no_classes_found")
+            status[short] = PLAN_STATUSES.index("impossible_timeframe")
+
+        return PlanSweep(list(targets), starts, limits, current_pct, status=status, classes_needed=needed,
+                         classes_skippable=skippable, scheduled=scheduled, days_needed=days_needed,
+                         end_offset=end_offset, max_possible=max_possible)
+
+    @instrumented
+    def calculate_subject_plans(self, target_percent, start_date, limit_date, subject_totals=None):
+        """
+        calculate_recovery_plan per subject, all subjects at once: attending every class of a subject
+        from start_date, how many are needed and on which date its target_percent is reached. Each
+        subject's cumulative class count over the horizon comes from one tiled weekly matrix.
+        subject_totals defaults to the summary's {subject: (held, absent)}. One dict per subject;
+        timetable_subject is the timetable's name for it, None when the timetable has no such subject.
+        """
+        totals = self.subject_totals if subject_totals is None else subject_totals
+        names = list(totals)
+        if not names: return []
+        held = np.array([totals[n][0] for n in names], dtype=np.int64)
+        absent = np.array([totals[n][1] for n in names], dtype=np.int64)
+        status, needed, skippable, current_pct = plan_counts(target_percent, held, absent)
+        held, absent = np.maximum(held, 0), np.maximum(absent, 0)
+        present = held - absent
+        days_needed = np.zeros(len(names), dtype=np.int64)
+        end_offset = np.zeros(len(names), dtype=np.int64)
+        max_possible = np.zeros(len(names))
+        matched = [None] * len(names)
+
+        deficit = status == PLAN_STATUSES.index("deficit")
+        if self.week_timetable:
+            engine = self.get_schedule_engine()
+            with self._phase("calculate_subject_plans.curves") as ph:
+                counts = engine.subject_daily_counts(start_date, limit_date)
+                ph.rows = counts.size
+            # Summary and timetable spellings of a subject may differ ("NAME CODE", case, abbreviations):
+            # both go through the resolver, then each summary name is looked up among the timetable's
+            # names, summing timetable subjects that are one. Unmatched subjects get no columns.
+            canonical = self.subject_resolver.canonical
+            columns, on_timetable = {}, SubjectResolver()  # subject_key -> timetable subject columns
+            for s, j in engine.subject_index.items():
+                name = canonical(s)
+                columns.setdefault(subject_key(name), []).append(j)
+                on_timetable.learn(name, name)
+            pick = np.zeros((counts.shape[1], len(names)), dtype=np.int64)
+            for i, n in enumerate(names):
+                js = columns.get(subject_key(on_timetable.resolve(canonical(n))[0]), [])
+                pick[js, i] = 1
+                if js: matched[i] = engine.subjects[js[0]]
+            counts = counts @ pick
+            zero = np.zeros((1, len(names)), dtype=np.int64)
+            C = np.vstack([zero, np.cumsum(counts, axis=0)])  # classes of each subject before day k
+            NZ = np.vstack([zero, np.cumsum(counts > 0, axis=0)])  # days it is held before day k
+            length = np.maximum(0, np.minimum(needed, C[-1]))
+
+            found = deficit & (length > 0)
+            end_idx = np.argmax(C >= length, axis=0) - 1  # first day by whose end length classes were held
+            end_offset[found] = end_idx[found]
+            days_needed[found] = NZ[end_idx + 1, np.arange(len(names))][found]
+            short = found & (length < needed)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                max_possible[short] = ((present + length) / (held + length) * 100)[short]
+            status[deficit & (length == 0)] = PLAN_STATUSES.index("no_classes_found")
+            status[short] = PLAN_STATUSES.index("impossible_timeframe")
+
+        plans = []
+        for i, name in enumerate(names):
+            plan = {"subject": name, "total": int(held[i]), "absent": int(absent[i]),
+                    "current_pct": float(current_pct[i]), "target": target_percent,
+                    "status": PLAN_STATUSES[status[i]], "classes_skippable": int(skippable[i]),
+                    "classes_needed": int(needed[i]), "days_needed": int(days_needed[i]),
+                    "end_date": start_date + timedelta(days=int(end_offset[i])), "timetable_subject": matched[i]}
+            if plan["status"] == "impossible_timeframe": plan["max_possible"] = float(max_possible[i])
+            plans.append(plan)
+        return plans
+
+    def get_schedule_engine(self):
+        engine = self._schedule_engine
+        if (engine is None or engine.timetable is not self.week_timetable or engine.calendar is not self.calendar
+                or engine.anchor != self.week_anchor):
+            engine = self._schedule_engine = ScheduleEngine(self.week_timetable, self.calendar, self.week_anchor)
+        return engine
+
+    def iter_recovery_schedule(self, classes_needed, start_date, limit_date):
+        """ Lazy RecoverySchedule: len(), end_date and days_needed without building any rows. """
+        return self.get_schedule_engine().plan(classes_needed, start_date, limit_date)
+
+    @instrumented
     def get_recovery_schedule(self, classes_needed, start_date, limit_date):
-        schedule = []
-        sim_date = start_date
-        classes_count = 0
-        while classes_count < classes_needed and sim_date <= limit_date:
-            if not self.is_holiday_or_off(sim_date):
-                day_idx = sim_date.weekday()
-                if day_idx in self.timetable:
-                    daily_classes = self.timetable[day_idx]
-                    sorted_times = sorted(daily_classes.keys())
-                    for time_str in sorted_times:
-                        if classes_count < classes_needed:
-                            schedule.append({
-                                "Date": sim_date, "Day": sim_date.strftime("%A"),
-                                "Time": time_str, "Subject": daily_classes[time_str]
-                            })
-                            classes_count += 1
-            sim_date += timedelta(days=1)
-        return schedule
\ No newline at end of file
+        return list(self.iter_recovery_schedule(classes_needed, start_date, limit_date))
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import pickle
+import platform
+import tempfile
+
+
+def default_cache_dir():
+    return os.environ.get("ATTENDANCE_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "attendance")
+
+
+def file_digest(file_path):
+    """ sha256 of the file's bytes. """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def library_versions():
+    import numpy
+    import pandas
+    import sklearn
+    return {"python": platform.python_version(), "numpy": numpy.__version__,
+            "pandas": pandas.__version__, "sklearn": sklearn.__version__}
+
+
+def cache_key(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:40]
+
+
+class DiskCache:
+    """
+    Directory of pickled entries with a total size cap. Hits refresh the entry's mtime and
+    the oldest entries are evicted first (LRU). Only ever load caches you wrote yourself:
+    entries are pickles.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 2 ** 20, namespace="cache"):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "rejected": 0, "invalidated": 0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{self.namespace}-{key}.pkl")
+
+    def _entries(self):
+        prefix = self.namespace + "-"
+        out = []
+        for fn in os.listdir(self.directory):
+            if fn.startswith(prefix) and fn.endswith(".pkl"):
+                path = os.path.join(self.directory, fn)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def get(self, key, validate=None):
+        """ Cached value, or None. validate(value) -> False rejects and deletes the entry. """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except Exception:
+            value = None
+            validate = lambda v: False  # unreadable / written by incompatible library versions
+        if validate is not None and not validate(value):
+            self.stats["rejected"] += 1
+            self._remove(path)
+            return None
+        self.stats["hits"] += 1
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self._path(key))
+        self.stats["writes"] += 1
+        self._evict()
+
+    def invalidate(self, key=None):
+        """ Drops one entry, or every entry in this namespace when key is None. """
+        paths = [self._path(key)] if key else [p for _, _, p in self._entries()]
+        for path in paths:
+            if self._remove(path): self.stats["invalidated"] += 1
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes: break
+            if self._remove(path):
+                total -= size
+                self.stats["evictions"] += 1
+
+    def summary(self):
+        entries = self._entries()
+        return {**self.stats, "entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
@@ -0,0 +1,236 @@
+"""
+Headless command line over AttendanceBrain. Never imports Qt, and pandas / NumPy / scikit-learn
+only once an input needs them, so it is cheap enough to call from cron and shell loops.
+
+    python -m backend.cli parse    --timetable tt.csv --summary summary.csv
+    python -m backend.cli forecast --absence absences.csv --start 2026-03-01 --days 30
+    python -m backend.cli risk     --absence absences.csv --format csv
+    python -m backend.cli schedule --timetable tt.csv --summary summary.csv --target 75
+    python -m backend.cli subjects --timetable tt.csv --summary summary.csv --target 75
+    python -m backend.cli export   --timetable tt.csv --summary summary.csv --absence absences.csv --out hist/
+    python -m backend.cli risk     --history hist/
+
+JSON goes to stdout (or CSV rows with --format csv); errors go to stderr with exit status 1.
+Parsed files and trained models are reused across invocations through the on-disk cache
+(see backend/cache.py) unless --no-cache is given.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+from backend.attendance_backend import AttendanceBrain
+from backend.risk_models import RISK_MODELS
+
+
+class CliError(Exception):
+    pass
+
+
+def build_brain(args, train=False):
+    brain = AttendanceBrain()
+    # model_daily is built from these on first use
+    brain.risk_model, brain.n_jobs = args.risk_model, args.n_jobs
+    if not args.no_cache: brain.enable_cache(args.cache_dir, models=train)
+    if args.week_anchor: brain.set_week_anchor(args.week_anchor)
+    steps = [(args.history, lambda path: brain.load_history(path, train=train)),
+             (args.calendar, brain.load_calendar),
+             (args.timetable, lambda path: brain.parse_timetable(path, section=args.section)),
+             (args.summary, brain.parse_attendance_summary),
+             (args.absence, lambda path: brain.load_absence_details(path, train=train))]
+    for path, load in steps:
+        if not path: continue
+        ok, msg = load(path)
+        if not ok: raise CliError(f"{path}: {msg}")
+    return brain
+
+
+def horizon(value):
+    """ argparse type for --horizon: 'semester' or a number of days. """
+    if value == "semester": return value
+    try:
+        days = int(value)
+    except ValueError:
+        days = -1
+    if days < 0: raise argparse.ArgumentTypeError(f"expected 'semester' or a number of days, got {value!r}")
+    return days
+
+
+def plan_limit(brain, start, args):
+    """ The plan's last day: the semester's end, or --horizon days after start. """
+    if args.horizon == "semester": return brain.get_semester_end_date(start)
+    try:
+        return start + timedelta(days=args.horizon)
+    except OverflowError:
+        raise CliError(f"--horizon {args.horizon} is out of range")
+
+
+def require(args, *names):
+    # An export_history() directory stands in for the timetable, summary and absence CSVs
+    missing = [n for n in names if not getattr(args, n) and not (args.history and n != "calendar")]
+    if missing: raise CliError(f"{args.command} needs " + ", ".join(f"--{n}" for n in missing) + " (or --history)")
+
+
+def cmd_parse(args):
+    brain = build_brain(args)
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    tt = brain.week_timetable
+    rows = [{"week": week, "day": days[d], "time": t, "subject": s}
+            for p, week in enumerate(tt.patterns) for d in range(7) for t, s in tt.slots(p, d)]
+    report = {"classes": len(rows), "weeks": tt.patterns, "timetable": rows, "subject_map": brain.subject_map,
+              "total": brain.auto_total if brain.has_summary_data else None,
+              "absent": brain.auto_absent if brain.has_summary_data else None,
+              "subjects": {r.pop("subject"): r for r in brain.summary_table.rows()},
+              "subject_resolution": brain.subject_resolution_stats(),
+              "history_days": brain.history.n_days, "absent_slots": len(brain.history)}
+    return report, rows
+
+
+def cmd_forecast(args):
+    require(args, "absence")
+    brain = build_brain(args, train=True)
+    start = args.start or date.today()
+    end = args.end or start + timedelta(days=args.days - 1)
+    risks = brain.predict_risk_range(start, end)
+    rows = [{"date": (start + timedelta(days=i)).isoformat(), "risk": round(float(r), 4),
+             "off": brain.is_holiday_or_off(start + timedelta(days=i))} for i, r in enumerate(risks)]
+    return {"start": start.isoformat(), "end": end.isoformat(), "trained": brain.is_trained, "days": rows}, rows
+
+
+def cmd_risk(args):
+    require(args, "absence")
+    brain = build_brain(args)
+    subjects = [{"subject": s, "risk": round(r, 4)} for s, r in brain.get_subject_risks()]
+    slots = [{"weekday": d, "time": t, "risk": round(r, 4)} for (d, t), r in sorted(brain.get_slot_risk_matrix().items())]
+    return {"subjects": subjects, "slots": slots}, subjects
+
+
+def cmd_schedule(args):
+    require(args, "timetable")
+    brain = build_brain(args)
+    total = args.total if args.total is not None else brain.auto_total
+    absent = args.absent if args.absent is not None else brain.auto_absent
+    if args.total is None and not brain.has_summary_data:
+        raise CliError("schedule needs --summary (or --total and --absent)")
+    start = args.start or date.today()
+    limit = plan_limit(brain, start, args)
+
+    res = brain.calculate_recovery_plan(args.target, total, absent, start, limit)
+    schedule = res.pop("schedule", None) or []
+    n = len(schedule) if args.limit is None else min(args.limit, len(schedule))
+    rows = [{"date": r["Date"].isoformat(), "day": r["Day"], "time": r["Time"], "subject": r["Subject"]}
+            for r in schedule[:n]]
+    res["end_date"] = res["end_date"].isoformat()
+    res.update(limit_date=limit.isoformat(), schedule_length=len(schedule), schedule=rows)
+    return res, rows
+
+
+def cmd_subjects(args):
+    require(args, "timetable", "summary")
+    brain = build_brain(args)
+    if not brain.subject_totals: raise CliError("the summary has no per-subject rows")
+    start = args.start or date.today()
+    limit = plan_limit(brain, start, args)
+    rows = brain.calculate_subject_plans(args.target, start, limit)
+    for row in rows:
+        row["current_pct"] = round(row["current_pct"], 2)
+        row["end_date"] = row["end_date"].isoformat()
+    missing = [row["subject"] for row in rows if row["timetable_subject"] is None]
+    return {"target": args.target, "start": start.isoformat(), "limit_date": limit.isoformat(),
+            "not_on_timetable": missing, "subjects": rows}, rows
+
+
+def cmd_export(args):
+    brain = build_brain(args)
+    ok, msg = brain.export_history(args.out)
+    if not ok: raise CliError(msg)
+    report = {"out": args.out, "days": brain.history.n_days, "absent_slots": len(brain.history),
+              "classes": brain.week_timetable.n_classes}
+    return report, [report]
+
+
+COMMANDS = {"parse": cmd_parse, "forecast": cmd_forecast, "risk": cmd_risk, "schedule": cmd_schedule,
+            "subjects": cmd_subjects, "export": cmd_export}
+
+
+def write(report, rows, fmt, out):
+    if fmt == "json":
+        json.dump(report, out, default=str)
+        out.write("\n")
+        return
+    if not rows: return
+    # Rows may differ: only impossible_timeframe plans carry max_possible
+    fields = list(dict.fromkeys(k for row in rows for k in row))
+    writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def make_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--timetable", help="Timetable CSV")
+    common.add_argument("--section", help="Section of a multi-section timetable export (its 'Section X' row)")
+    common.add_argument("--week-anchor", type=date.fromisoformat,
+                        help="A date in a 'Week A' week, for timetables that alternate A / B weeks")
+    common.add_argument("--absence", help="Absence-details CSV")
+    common.add_argument("--summary", help="Attendance summary CSV")
+    common.add_argument("--calendar", help="Academic calendar JSON")
+    common.add_argument("--history", help="Directory written by the export command, read memory-mapped")
+    common.add_argument("--format", choices=["json", "csv"], default="json",
+                        help="csv writes the main table only (classes, daily risks, subject risks, schedule rows or subject plans)")
+    common.add_argument("--cache-dir", help="Cache directory (default: $ATTENDANCE_CACHE_DIR or ~/.cache/attendance)")
+    common.add_argument("--no-cache", action="store_true", help="Re-parse and re-train on every call")
+    common.add_argument("--risk-model", choices=list(RISK_MODELS), default="forest", help="Daily-risk model backend")
+    common.add_argument("--n-jobs", type=int, help="Worker count for the forest backend")
+
+    parser = argparse.ArgumentParser(prog="python -m backend.cli", description="Attendance planning without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("parse", parents=[common], help="Parsed timetable, subject names and summary totals")
+
+    p = sub.add_parser("forecast", parents=[common], help="Daily absence risk from the trained model")
+    p.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--end", type=date.fromisoformat, help="YYYY-MM-DD (default: start + --days - 1)")
+    p.add_argument("--days", type=int, default=30)
+
+    sub.add_parser("risk", parents=[common], help="Subject and (weekday, time) slot risks")
+
+    p = sub.add_parser("schedule", parents=[common], help="Recovery plan and the classes to attend")
+    p.add_argument("--target", type=int, default=75)
+    p.add_argument("--total", type=int, help="Classes held so far (default: from --summary)")
+    p.add_argument("--absent", type=int, help="Classes missed so far (default: from --summary)")
+    p.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--horizon", type=horizon, default="semester", help="'semester' or a number of days")
+    p.add_argument("--limit", type=int, help="Emit at most this many schedule rows")
+
+    p = sub.add_parser("subjects", parents=[common], help="Recovery plan for every subject of the summary")
+    p.add_argument("--target", type=int, default=75)
+    p.add_argument("--start", type=date.fromisoformat, help="YYYY-MM-DD (default: today)")
+    p.add_argument("--horizon", type=horizon, default="semester", help="'semester' or a number of days")
+
+    p = sub.add_parser("export", parents=[common], help="Save parsed inputs as memory-mappable .npy columns")
+    p.add_argument("--out", required=True, help="Directory to write")
+    return parser
+
+
+def main(argv=None, out=None):
+    args = make_parser().parse_args(argv)
+    try:
+        report, rows = COMMANDS[args.command](args)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    out = out or sys.stdout
+    try:
+        write(report, rows, args.format, out)
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (| head): point stdout at devnull so the exit-time flush stays quiet
+        if out is sys.stdout: os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
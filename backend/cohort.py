@@ -0,0 +1,219 @@
+"""
+Nightly batch runs of the recovery planner over a whole cohort.
+
+    python -m backend.cohort students/ --out results.jsonl --workers 8 --target 75
+
+`students/` is either a directory with one sub-directory per student (holding the
+timetable, absence-details and summary CSVs) or a manifest CSV with the columns
+student_id, timetable, absence, summary and optionally section. A --timetable shared by
+a whole section and the holiday --calendar are parsed once per worker process, not once per
+student. A multi-section timetable needs the student's section (the manifest's section column,
+else --section); without one the student fails instead of silently getting the first section.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from backend.academic_calendar import AcademicCalendar
+from backend.attendance_backend import AttendanceBrain
+from backend.cache import DiskCache
+
+RESULT_FIELDS = ["student_id", "ok", "error", "total", "absent", "current_pct", "target", "status",
+                 "classes_needed", "classes_skippable", "days_needed", "end_date", "max_possible", "subject_risks"]
+
+# Per-worker state, filled by _init_worker and reused for every student the worker handles
+_WORKER = {}
+
+
+def discover_students(source):
+    """ [{'student_id', 'timetable', 'absence', 'summary'[, 'section']}, ...] from a manifest CSV or a directory. """
+    if os.path.isfile(source):
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for key in ("timetable", "absence", "summary"):
+                if row.get(key): row[key] = os.path.join(base, row[key])
+        return rows
+
+    students = []
+    for name in sorted(os.listdir(source)):
+        folder = os.path.join(source, name)
+        if not os.path.isdir(folder): continue
+        entry = {"student_id": name, "timetable": "", "absence": "", "summary": ""}
+        for fn in sorted(os.listdir(folder)):
+            low = fn.lower()
+            if not low.endswith(".csv"): continue
+            if "timetable" in low:
+                entry["timetable"] = os.path.join(folder, fn)
+            elif "absence" in low:
+                entry["absence"] = os.path.join(folder, fn)
+            elif "summary" in low or "attendance" in low:
+                entry["summary"] = os.path.join(folder, fn)
+        students.append(entry)
+    return students
+
+
+def _init_worker(config):
+    _WORKER.clear()
+    _WORKER["config"] = config
+    _WORKER["calendar"] = AcademicCalendar.from_file(config["calendar"]) if config.get("calendar") \
+        else AcademicCalendar.default()
+    _WORKER["timetables"] = {}
+    # Parsed timetables / summaries shared with later runs (and the GUI) through the on-disk parse cache
+    _WORKER["parse_cache"] = DiskCache(config["cache_dir"], 32 * 2 ** 20, namespace="parse") \
+        if config.get("cache_dir") else None
+
+
+def _shared_timetable(path, section=None):
+    """
+    Parses a timetable once per worker and section; returns (ok, msg, timetable, subject_map
+    entries it taught). A sheet of several sections is an error unless section picks one.
+    """
+    cached = _WORKER["timetables"].get((path, section))
+    if cached is None:
+        brain = AttendanceBrain()
+        brain.parse_cache = _WORKER["parse_cache"]
+        ok, msg = brain.parse_timetable(path, section=section)
+        tt = brain.week_timetable
+        if ok and section is None and len(tt.sections) > 1:
+            ok, msg = False, (f"{os.path.basename(path)} has {len(tt.sections)} sections ({tt.section_list()}); "
+                              f"give the student's section")
+        cached = _WORKER["timetables"][(path, section)] = (ok, msg, tt, dict(brain.subject_map))
+    return cached
+
+
+def _plan_student(student):
+    config = _WORKER["config"]
+    row = {"student_id": student.get("student_id", ""), "ok": False, "error": ""}
+    brain = AttendanceBrain()
+    brain.calendar = _WORKER["calendar"]
+    brain.parse_cache = _WORKER["parse_cache"]
+
+    tt_path = student.get("timetable") or config.get("timetable")
+    if tt_path:
+        ok, msg, timetable, learned = _shared_timetable(tt_path, student.get("section") or config.get("section"))
+        if not ok:
+            row["error"] = msg
+            return row
+        brain.week_timetable = timetable
+        brain.subject_resolver.update(learned)
+
+    if student.get("absence"):
+        ok, msg = brain.load_absence_details(student["absence"], train=config.get("train", False))
+        if not ok:
+            row["error"] = msg
+            return row
+    if student.get("summary"):
+        ok, msg = brain.parse_attendance_summary(student["summary"])
+        if not ok:
+            row["error"] = msg
+            return row
+    if not brain.has_summary_data:
+        row["error"] = "No totals in summary."
+        return row
+
+    start = date.fromisoformat(config["start"]) if config.get("start") else date.today()
+    horizon = config.get("horizon", "semester")
+    limit = brain.get_semester_end_date(start) if horizon == "semester" else start + timedelta(days=int(horizon))
+
+    res = brain.calculate_recovery_plan(config["target"], brain.auto_total, brain.auto_absent, start, limit)
+    row.update(ok=True, total=brain.auto_total, absent=brain.auto_absent,
+               current_pct=round(res["current_pct"], 2), target=res["target"], status=res["status"],
+               classes_needed=res["classes_needed"], classes_skippable=res["classes_skippable"],
+               days_needed=res["days_needed"], end_date=res["end_date"].isoformat(),
+               max_possible=round(res["max_possible"], 2) if "max_possible" in res else "",
+               subject_risks=[[s, round(r, 3)] for s, r in brain.get_subject_risks()])
+    return row
+
+
+def _plan_shard(shard):
+    results = []
+    for student in shard:
+        try:
+            results.append(_plan_student(student))
+        except Exception as e:
+            results.append({"student_id": student.get("student_id", ""), "ok": False, "error": str(e)})
+    return results
+
+
+class CohortBrain:
+    """
+    Runs calculate_recovery_plan and get_subject_risks for every student of a cohort,
+    sharded across a ProcessPoolExecutor, streaming one result row per student.
+    """
+
+    def __init__(self, target=75, start=None, horizon="semester", workers=None, shard_size=32,
+                 timetable=None, calendar=None, train=False, cache_dir=None, section=None):
+        self.config = {"target": target, "start": start.isoformat() if start else None, "horizon": horizon,
+                       "timetable": timetable, "calendar": calendar, "train": train, "cache_dir": cache_dir,
+                       "section": section}
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.stats = {}
+
+    def iter_results(self, students):
+        shards = [students[i:i + self.shard_size] for i in range(0, len(students), self.shard_size)]
+        if self.workers <= 1:
+            _init_worker(self.config)
+            for shard in shards: yield from _plan_shard(shard)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.config,)) as pool:
+            for results in pool.map(_plan_shard, shards):
+                yield from results
+
+    def run(self, students, out_path=None):
+        """ Writes JSONL (or CSV if out_path ends in .csv; stdout if None) and returns throughput stats. """
+        t0 = time.perf_counter()
+        n_ok = n = 0
+        out = open(out_path, "w", newline="", encoding="utf-8") if out_path else sys.stdout
+        try:
+            as_csv = bool(out_path) and out_path.lower().endswith(".csv")
+            writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS, extrasaction="ignore") if as_csv else None
+            if writer: writer.writeheader()
+            for row in self.iter_results(students):
+                n += 1
+                n_ok += bool(row.get("ok"))
+                if writer:
+                    writer.writerow({**row, "subject_risks": json.dumps(row.get("subject_risks", []))})
+                else:
+                    out.write(json.dumps(row) + "\n")
+        finally:
+            if out_path: out.close()
+        elapsed = time.perf_counter() - t0
+        self.stats = {"students": n, "ok": n_ok, "failed": n - n_ok, "workers": self.workers,
+                      "seconds": round(elapsed, 3), "students_per_sec": round(n / elapsed, 1) if elapsed else 0.0}
+        return self.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch recovery plans for a cohort.")
+    parser.add_argument("source", help="Directory of per-student folders, or a manifest CSV")
+    parser.add_argument("--out", help="Output .jsonl or .csv (default: JSONL on stdout)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=32)
+    parser.add_argument("--target", type=int, default=75)
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--horizon", default="semester", help="'semester' or a number of days")
+    parser.add_argument("--timetable", help="Section timetable shared by students without their own")
+    parser.add_argument("--section", help="Section of multi-section timetables, for students without a section column")
+    parser.add_argument("--calendar", help="Academic calendar JSON")
+    parser.add_argument("--train", action="store_true", help="Also fit the daily risk model per student")
+    parser.add_argument("--cache-dir", help="Reuse parsed timetables / summaries across runs")
+    args = parser.parse_args(argv)
+
+    cohort = CohortBrain(target=args.target, start=args.start, horizon=args.horizon, workers=args.workers,
+                         shard_size=args.shard_size, timetable=args.timetable, calendar=args.calendar,
+                         train=args.train, cache_dir=args.cache_dir, section=args.section)
+    stats = cohort.run(discover_students(args.source), args.out)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from datetime import date
+
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+# date.toordinal() of 1970-01-01, to convert ordinals <-> datetime64[D]
+EPOCH_ORDINAL = 719163
+
+COLUMN_DTYPES = {"day": "int32", "weekday": "uint8", "slot": "int16", "subject": "int32",
+                 "agg_day": "int32", "agg_absent": "uint8", "agg_offsets": "int64"}
+
+# Bump whenever HistoryStore.save's layout changes; load() refuses other versions
+STORE_FORMAT = 1
+
+
+class RiskCounters:
+    """
+    Absence counts per subject and per (weekday, time) slot, plus the largest of each, kept
+    up to date as rows are ingested. Risk queries then only walk the result, never the history.
+    Subjects keep first-seen order so ties rank like Counter.most_common over the raw rows.
+    """
+
+    def __init__(self):
+        self.subjects = Counter()  # {"SOCIAL PSYCHOLOGY": 12}
+        self.slots = Counter()  # {(0, '08:45'): 3}
+        self.subject_max = 0
+        self.slot_max = 0
+
+    def add(self, subject_counts, slot_counts):
+        """ Folds in [(subject, n), ...] and [((weekday, time), n), ...] from one batch. """
+        for subj, n in subject_counts:
+            total = self.subjects[subj] = self.subjects[subj] + n
+            if total > self.subject_max: self.subject_max = total
+        for key, n in slot_counts:
+            total = self.slots[key] = self.slots[key] + n
+            if total > self.slot_max: self.slot_max = total
+
+    def copy(self):
+        twin = RiskCounters()
+        twin.subjects, twin.slots = Counter(self.subjects), Counter(self.slots)
+        twin.subject_max, twin.slot_max = self.subject_max, self.slot_max
+        return twin
+
+    def to_dict(self):
+        """ JSON-able state; subjects keep their insertion order, which breaks ties in subject_risks. """
+        return {"subjects": list(self.subjects.items()),
+                "slots": [[d, t, n] for (d, t), n in self.slots.items()],
+                "subject_max": self.subject_max, "slot_max": self.slot_max}
+
+    @classmethod
+    def from_dict(cls, state):
+        counters = cls()
+        counters.subjects = Counter(dict(state["subjects"]))
+        counters.slots = Counter({(d, t): n for d, t, n in state["slots"]})
+        counters.subject_max, counters.slot_max = state["subject_max"], state["slot_max"]
+        return counters
+
+    def subject_risks(self, top=10, canonical=None):
+        """
+        [(subject, count / worst subject's count), ...] for the `top` most absent subjects.
+        canonical(name) merges names that turned out to be one subject before ranking.
+        """
+        if not self.subject_max: return []
+        counts, worst = self.subjects, self.subject_max
+        if canonical is not None:
+            counts = Counter()
+            for subj, n in self.subjects.items(): counts[canonical(subj)] += n
+            worst = max(counts.values())
+        return [(subj, count / worst) for subj, count in counts.most_common(top)]
+
+    def slot_risks(self):
+        """ {(weekday, '08:45'): count / worst slot's count} """
+        if not self.slot_max: return {}
+        return {k: v / self.slot_max for k, v in self.slots.items()}
+
+
+class HistoryStore:
+    """
+    Absence history as NumPy columns instead of a list of dicts.
+
+    Class absences (one per absent slot): day (int32 date ordinal), weekday (uint8),
+    slot (int16 index into `times`), subject (int32 index into `subjects`).
+    Daily aggregates (one per loaded day): agg_day (int32), agg_absent (uint8), plus
+    agg_offsets so that day i owns class rows [agg_offsets[i], agg_offsets[i + 1]).
+
+    At 1M class rows (1.2M records with the daily aggregates) the old list of dicts took
+    ~227 MB; these columns take ~13 MB (see benchmarks/bench_history_memory.py).
+    """
+
+    def __init__(self):
+        self.subjects = []  # code -> "SOCIAL PSYCHOLOGY"
+        self.times = []  # slot -> "08:45"
+        self._subject_codes = {}
+        self._time_codes = {}
+        self.counters = RiskCounters()
+
+    def __getattr__(self, name):
+        # Empty columns are only built on first access, so an empty store never imports NumPy
+        if name not in COLUMN_DTYPES: raise AttributeError(name)
+        for col, dtype in COLUMN_DTYPES.items():
+            self.__dict__.setdefault(col, np.zeros(1 if col == "agg_offsets" else 0, dtype=dtype))
+        return self.__dict__[name]
+
+    def __len__(self):
+        return len(self.day) if "day" in self.__dict__ else 0
+
+    def __bool__(self):
+        return "agg_day" in self.__dict__ and len(self.agg_day) > 0
+
+    @property
+    def n_days(self):
+        return len(self.agg_day)
+
+    @property
+    def nbytes(self):
+        arrays = (self.day, self.weekday, self.slot, self.subject, self.agg_day, self.agg_absent, self.agg_offsets)
+        return sum(a.nbytes for a in arrays)
+
+    def _codes(self, values, table, lookup):
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, v in enumerate(values):
+            code = lookup.get(v)
+            if code is None:
+                code = lookup[v] = len(table)
+                table.append(v)
+            codes[i] = code
+        return codes
+
+    def append(self, agg_ordinals, agg_absent, cell_rows, subjects, times):
+        """
+        Adds days in load order. agg_ordinals/agg_absent have one entry per day; cell_rows
+        (sorted, index into this batch's days), subjects and times one entry per absent slot.
+        """
+        agg_ordinals = np.asarray(agg_ordinals, dtype=np.int32)
+        cell_rows = np.asarray(cell_rows, dtype=np.int64)
+        # Distinct strings are coded once, then broadcast back to every row
+        uniq_s, inv_s = np.unique(np.asarray(subjects, dtype=object), return_inverse=True) if len(subjects) \
+            else (np.zeros(0, dtype=object), np.zeros(0, dtype=np.int64))
+        uniq_t, inv_t = np.unique(np.asarray(times, dtype=object), return_inverse=True) if len(times) \
+            else (np.zeros(0, dtype=object), np.zeros(0, dtype=np.int64))
+        # Codes follow first appearance so ties in subject_counts keep load order
+        first = np.unique(inv_s, return_index=True)[1] if len(inv_s) else np.zeros(0, dtype=np.int64)
+        order = np.argsort(first, kind='stable')
+        s_codes = np.empty(len(uniq_s), dtype=np.int64)
+        s_codes[order] = self._codes(uniq_s[order].tolist(), self.subjects, self._subject_codes)
+        t_codes = self._codes(uniq_t.tolist(), self.times, self._time_codes)
+
+        days = agg_ordinals[cell_rows]
+        weekdays = (days - 1) % 7
+        # Batch totals are folded in code order, i.e. the order subjects were first seen
+        per_subject = sorted(zip(s_codes.tolist(), np.bincount(inv_s, minlength=len(uniq_s)).tolist()))
+        n_t = max(len(uniq_t), 1)
+        slot_keys, per_slot = np.unique(weekdays.astype(np.int64) * n_t + inv_t, return_counts=True)
+        self.counters.add([(self.subjects[c], n) for c, n in per_subject],
+                          [((k // n_t, uniq_t[k % n_t]), n) for k, n in zip(slot_keys.tolist(), per_slot.tolist())])
+        self.day = np.concatenate([self.day, days])
+        self.weekday = np.concatenate([self.weekday, weekdays.astype(np.uint8)])
+        self.slot = np.concatenate([self.slot, t_codes[inv_t].astype(np.int16)])
+        self.subject = np.concatenate([self.subject, s_codes[inv_s].astype(np.int32)])
+
+        counts = np.bincount(cell_rows, minlength=len(agg_ordinals))
+        offsets = self.agg_offsets[-1] + np.cumsum(counts)
+        self.agg_day = np.concatenate([self.agg_day, agg_ordinals])
+        self.agg_absent = np.concatenate([self.agg_absent, np.asarray(agg_absent, dtype=np.uint8)])
+        self.agg_offsets = np.concatenate([self.agg_offsets, offsets])
+
+    def copy(self):
+        """ Independent store; column arrays are shared since appends replace rather than mutate them. """
+        twin = HistoryStore()
+        twin.__dict__.update(self.__dict__)
+        twin.subjects, twin.times = list(self.subjects), list(self.times)
+        twin._subject_codes, twin._time_codes = dict(self._subject_codes), dict(self._time_codes)
+        twin.counters = self.counters.copy()
+        return twin
+
+    def save(self, directory):
+        """
+        Writes each column to directory as <column>.npy, plus store.json with the subject / time
+        tables and the risk counters. Returns a digest of the column bytes.
+        """
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        for col, dtype in COLUMN_DTYPES.items():
+            arr = np.ascontiguousarray(getattr(self, col), dtype=dtype)
+            np.save(os.path.join(directory, f"{col}.npy"), arr)
+            digest.update(col.encode())
+            digest.update(arr.tobytes())
+        meta = {"format": STORE_FORMAT, "subjects": self.subjects, "times": self.times,
+                "counters": self.counters.to_dict(), "columns": digest.hexdigest()}
+        with open(os.path.join(directory, "store.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return meta["columns"]
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Reads a save() directory. With mmap the columns are read-only memory maps, so opening costs
+        the same at any size and only the pages a query reads come off disk; appends still work
+        because they replace the arrays rather than write into them.
+        """
+        with open(os.path.join(directory, "store.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != STORE_FORMAT:
+            raise ValueError(f"history format {meta.get('format')}, expected {STORE_FORMAT}")
+        store = cls()
+        for col in COLUMN_DTYPES:
+            store.__dict__[col] = np.load(os.path.join(directory, f"{col}.npy"), mmap_mode="r" if mmap else None)
+        store.subjects, store.times = meta["subjects"], meta["times"]
+        store._subject_codes = {s: i for i, s in enumerate(store.subjects)}
+        store._time_codes = {t: i for i, t in enumerate(store.times)}
+        store.counters = RiskCounters.from_dict(meta["counters"])
+        return store
+
+    def extend(self, other):
+        """ Appends another store's days after this one's, re-coding its subjects and slots. """
+        cell_rows = np.repeat(np.arange(other.n_days), np.diff(other.agg_offsets))
+        self.append(other.agg_day, other.agg_absent, cell_rows,
+                    np.asarray(other.subjects, dtype=object)[other.subject].tolist(),
+                    np.asarray(other.times, dtype=object)[other.slot].tolist())
+
+    @classmethod
+    def from_records(cls, records):
+        """ Builds a store from the old full_history list-of-dicts layout. """
+        store = cls()
+        agg_ordinals, agg_absent, cell_rows, subjects, times = [], [], [], [], []
+        for r in records:
+            if r['Subject'] == 'Daily_Aggregate':
+                agg_ordinals.append(r['Date'].toordinal())
+                agg_absent.append(r['IsAbsent'])
+            else:
+                cell_rows.append(len(agg_ordinals))
+                subjects.append(r['Subject'])
+                times.append(r['Time'])
+        store.append(agg_ordinals, agg_absent, cell_rows, subjects, times)
+        return store
+
+    def to_records(self):
+        """ The old full_history list of dicts, in the same order (slow; for export and comparison). """
+        records = []
+        offsets = self.agg_offsets.tolist()
+        subj, slot = self.subject.tolist(), self.slot.tolist()
+        for i, (ordinal, absent) in enumerate(zip(self.agg_day.tolist(), self.agg_absent.tolist())):
+            d = date.fromordinal(ordinal)
+            day = d.weekday()
+            for k in range(offsets[i], offsets[i + 1]):
+                records.append({'Date': d, 'Day': day, 'Subject': self.subjects[subj[k]],
+                                'Time': self.times[slot[k]], 'IsAbsent': 1})
+            records.append({'Date': d, 'Subject': 'Daily_Aggregate', 'IsAbsent': absent})
+        return records
+
+    def mask(self, subject=None, weekday=None, start=None, end=None):
+        """ Boolean mask over class rows; every filter is optional. """
+        m = np.ones(len(self.day), dtype=bool)
+        if subject is not None:
+            code = self._subject_codes.get(subject, -1)
+            m &= self.subject == code
+        if weekday is not None: m &= self.weekday == weekday
+        if start is not None: m &= self.day >= start.toordinal()
+        if end is not None: m &= self.day <= end.toordinal()
+        return m
+
+    def subject_counts(self, mask=None):
+        """ [(subject, count), ...] most absent first; ties keep first-seen order (like Counter). """
+        codes = self.subject if mask is None else self.subject[mask]
+        counts = np.bincount(codes, minlength=len(self.subjects))
+        order = np.argsort(-counts, kind='stable')
+        return [(self.subjects[c], int(counts[c])) for c in order.tolist() if counts[c]]
+
+    def slot_counts(self, mask=None):
+        """ {(weekday, '08:45'): count} """
+        wd = self.weekday if mask is None else self.weekday[mask]
+        sl = self.slot if mask is None else self.slot[mask]
+        keys, counts = np.unique(wd.astype(np.int64) * len(self.times) + sl, return_counts=True)
+        n = max(len(self.times), 1)
+        return {(k // n, self.times[k % n]): c for k, c in zip(keys.tolist(), counts.tolist())}
+
+    def daily_features(self):
+        """ X = [[weekday, day, month], ...] and y = absent flag, one row per loaded day. """
+        d64 = (self.agg_day.astype(np.int64) - EPOCH_ORDINAL).astype('datetime64[D]')
+        months = d64.astype('datetime64[M]')
+        X = np.column_stack([(self.agg_day.astype(np.int64) - 1) % 7,
+                             (d64 - months).astype(np.int64) + 1,
+                             months.astype(np.int64) % 12 + 1])
+        return X, self.agg_absent.astype(np.int64)
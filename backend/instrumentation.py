@@ -0,0 +1,108 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+
+class _NullPhase:
+    """ What phase() hands out while instrumentation is off: enter/exit and `rows =` do nothing. """
+    __slots__ = ()
+    rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("owner", "name", "rows", "t0")
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.rows = 0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.owner.record(self.name, time.perf_counter() - self.t0, self.rows)
+        return False
+
+
+class Instrumentation:
+    """
+    Call counts, latencies and row counts per public AttendanceBrain method ("train_models")
+    and per internal phase ("train_models.fit"). Percentiles cover the last `window` calls of
+    each name. Thread-safe, so a brain and its snapshot() can share one while loads run.
+    """
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats = {}  # name -> [calls, total_seconds, rows, max_seconds, deque of recent seconds]
+
+    def phase(self, name):
+        """ with instruments.phase("parse_timetable.columns") as ph: ...; ph.rows = n """
+        return _Phase(self, name)
+
+    def record(self, name, seconds, rows=0):
+        with self._lock:
+            entry = self._stats.get(name)
+            if entry is None: entry = self._stats[name] = [0, 0.0, 0, 0.0, deque(maxlen=self.window)]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += rows
+            if seconds > entry[3]: entry[3] = seconds
+            entry[4].append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def summary(self):
+        """ {name: {calls, total_ms, mean_ms, p50_ms, p90_ms, p99_ms, max_ms, rows, rows_per_s}} by name. """
+        with self._lock:
+            items = [(name, e[0], e[1], e[2], e[3], sorted(e[4])) for name, e in self._stats.items()]
+        out = {}
+        for name, calls, total, rows, worst, recent in sorted(items):
+            pct = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] * 1000
+            out[name] = {"calls": calls, "total_ms": round(total * 1000, 3), "mean_ms": round(total * 1000 / calls, 4),
+                         "p50_ms": round(pct(0.50), 4), "p90_ms": round(pct(0.90), 4), "p99_ms": round(pct(0.99), 4),
+                         "max_ms": round(worst * 1000, 4), "rows": rows,
+                         "rows_per_s": round(rows / total, 1) if rows and total else 0.0}
+        return out
+
+    def to_json(self, file_path=None):
+        """ The summary as JSON text, also written to file_path if given. """
+        text = json.dumps(self.summary(), indent=2)
+        if file_path:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+
+def instrumented(method):
+    """ Times a public AttendanceBrain method under its own name while self.instruments is set. """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        inst = self.instruments
+        if inst is None: return method(self, *args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            inst.record(name, time.perf_counter() - t0)
+    return wrapper
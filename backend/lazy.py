@@ -0,0 +1,30 @@
+import importlib
+import threading
+
+_IMPORT_LOCK = threading.Lock()
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is only imported on first attribute access:
+    `np = LazyModule("numpy")` then `np.zeros(3)` works as usual. Keeps pandas, NumPy and
+    scikit-learn off the startup path until a file is actually loaded.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _IMPORT_LOCK:
+                module = self.__dict__["_module"] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
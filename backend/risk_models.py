@@ -0,0 +1,117 @@
+"""
+Daily-risk model backends for AttendanceBrain.model_daily. Each is a classifier over the
+[weekday, day, month] features with fit(X, y, sample_weight=None), predict_proba(X) and
+get_params / set_params, so sklearn's clone works on all of them; see set_risk_model().
+
+    forest     RandomForestClassifier, 100 trees (the original model; the only one grown incrementally)
+    hist_gb    HistGradientBoostingClassifier with weekday and month as categorical features
+    frequency  Smoothed absence rate per (weekday, month); fits in microseconds
+    logistic   Logistic regression on one-hot weekday and month
+"""
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+sk_ensemble = LazyModule("sklearn.ensemble")
+sk_linear = LazyModule("sklearn.linear_model")
+
+# Every [weekday, day, month] the features can take: at most 2,604 rows to predict per fit
+FEATURE_SHAPE = (7, 31, 12)
+
+
+def feature_space():
+    """ All of FEATURE_SHAPE as feature rows, in C order of the (weekday, day - 1, month - 1) table. """
+    w, d, m = np.indices(FEATURE_SHAPE)
+    return np.column_stack([w.ravel(), d.ravel() + 1, m.ravel() + 1])
+
+
+class _Params:
+    """ get_params / set_params over the constructor arguments, as sklearn's clone expects. """
+    PARAMS = ()
+
+    def get_params(self, deep=True):
+        return {name: getattr(self, name) for name in self.PARAMS}
+
+    def set_params(self, **params):
+        for name, value in params.items():
+            if name not in self.PARAMS: raise ValueError(f"{type(self).__name__} has no parameter {name!r}")
+            setattr(self, name, value)
+        return self
+
+    def _one_class_proba(self, n):
+        # Same shape a forest fitted on a single class returns
+        return np.ones((n, 1))
+
+
+class FrequencyTableModel(_Params):
+    """
+    Absence rate per (weekday, month), shrunk toward that weekday's rate, which is shrunk toward
+    the overall rate; alpha is the pseudo-count of each shrink. Day of month is ignored: with one
+    sample per (weekday, day, month) a year there is nothing to learn from it.
+    """
+    PARAMS = ("alpha",)
+
+    def __init__(self, alpha=5.0):
+        self.alpha = alpha
+
+    def fit(self, X, y, sample_weight=None):
+        X, y = np.asarray(X, dtype=np.int64), np.asarray(y)
+        w = np.ones(len(y)) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+        self.classes_ = np.unique(y)
+        held, absent = np.zeros((7, 12)), np.zeros((7, 12))
+        np.add.at(held, (X[:, 0], X[:, 2] - 1), w)
+        np.add.at(absent, (X[:, 0], X[:, 2] - 1), w * (y == 1))
+        overall = absent.sum() / held.sum() if held.sum() else 0.0
+        weekday = (absent.sum(axis=1) + self.alpha * overall) / (held.sum(axis=1) + self.alpha)
+        self.table_ = (absent + self.alpha * weekday[:, None]) / (held + self.alpha)
+        return self
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.int64)
+        if len(self.classes_) < 2: return self._one_class_proba(len(X))
+        p = self.table_[X[:, 0], X[:, 2] - 1]
+        return np.column_stack([1 - p, p])
+
+
+class LogisticModel(_Params):
+    """ Logistic regression on one-hot weekday (7) and month (12). """
+    PARAMS = ("C",)
+
+    def __init__(self, C=1.0):
+        self.C = C
+
+    @staticmethod
+    def _design(X):
+        X = np.asarray(X, dtype=np.int64)
+        out = np.zeros((len(X), 19))
+        rows = np.arange(len(X))
+        out[rows, X[:, 0]] = 1
+        out[rows, 6 + X[:, 2]] = 1
+        return out
+
+    def fit(self, X, y, sample_weight=None):
+        y = np.asarray(y)
+        self.classes_ = np.unique(y)
+        if len(self.classes_) < 2: return self
+        self.model_ = sk_linear.LogisticRegression(C=self.C, max_iter=1000).fit(self._design(X), y,
+                                                                                 sample_weight=sample_weight)
+        return self
+
+    def predict_proba(self, X):
+        if len(self.classes_) < 2: return self._one_class_proba(len(X))
+        return self.model_.predict_proba(self._design(X))
+
+
+RISK_MODELS = {
+    "forest": lambda n_jobs: sk_ensemble.RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs),
+    "hist_gb": lambda n_jobs: sk_ensemble.HistGradientBoostingClassifier(categorical_features=[0, 2], random_state=42),
+    "frequency": lambda n_jobs: FrequencyTableModel(),
+    "logistic": lambda n_jobs: LogisticModel(),
+}
+
+
+def make_model(name, n_jobs=None, **params):
+    """ An unfitted backend; n_jobs only applies to the forest, params go to set_params. """
+    if name not in RISK_MODELS:
+        raise ValueError(f"unknown risk model {name!r}, choose from {', '.join(RISK_MODELS)}")
+    model = RISK_MODELS[name](n_jobs)
+    return model.set_params(**params) if params else model
@@ -0,0 +1,209 @@
+from datetime import timedelta
+
+from backend.lazy import LazyModule
+from backend.timetable import DEFAULT_WEEK_ANCHOR
+
+np = LazyModule("numpy")
+
+PLAN_STATUSES = ["surplus", "deficit", "impossible", "no_classes_found", "impossible_timeframe"]
+
+
+def plan_counts(target, total, absent):
+    """
+    calculate_recovery_plan's arithmetic on broadcast arrays of targets and totals. Returns
+    (status, classes_needed, classes_skippable, current_pct); status is an index into PLAN_STATUSES
+    and is "deficit" wherever classes_needed still have to be found on the timetable.
+    """
+    target = np.asarray(target, dtype=float)
+    total = np.maximum(np.asarray(total), 0)
+    absent = np.maximum(np.asarray(absent), 0)
+    present = total - absent
+    with np.errstate(divide='ignore', invalid='ignore'):
+        current_pct = np.where(total == 0, 0.0, present / total * 100)
+        t = target / 100.0
+        skip = np.where(t == 0, 9999, np.floor(present / t - total))
+        need = np.ceil((t * total - present) / (1 - t))
+    shape = np.broadcast_shapes(target.shape, total.shape, absent.shape)
+    impossible = np.broadcast_to((target >= 100) & (absent > 0), shape)
+    deficit = ~impossible & (current_pct < target)
+    deficit_ok = deficit & (1 - t > 0)
+
+    status = np.zeros(shape, dtype=np.int8)
+    needed = np.zeros(shape, dtype=np.int64)
+    skippable = np.zeros(shape, dtype=np.int64)
+    surplus = ~impossible & ~deficit
+    skippable[surplus] = np.broadcast_to(skip, shape)[surplus]
+    needed[deficit_ok] = np.broadcast_to(need, shape)[deficit_ok]
+    status[impossible | (deficit & ~deficit_ok)] = PLAN_STATUSES.index("impossible")
+    status[deficit_ok] = PLAN_STATUSES.index("deficit")
+    return status, needed, skippable, current_pct
+
+
+class ScheduleEngine:
+    """
+    Week-cycle view of a WeekTimetable. A date horizon is the class count of each date's
+    (week pattern, weekday) minus the calendar's off days, so finding where N classes end
+    is one cumulative sum and a binary search instead of a day-by-day walk. Week pattern p
+    runs in weeks p, p + n_patterns, ... counted from the anchor Monday.
+    """
+
+    def __init__(self, timetable, calendar, anchor=DEFAULT_WEEK_ANCHOR):
+        self.timetable = timetable
+        self.calendar = calendar
+        self.anchor = anchor
+        grid = timetable.grid
+        # Classes per (week pattern, weekday), (n_patterns, 7)
+        self.per_weekday = np.count_nonzero(grid >= 0, axis=2).astype(np.int64)
+        codes = np.unique(grid[grid >= 0])
+        self.subjects = sorted({timetable.subjects[c] for c in codes.tolist()})
+        self.subject_index = {subject: i for i, subject in enumerate(self.subjects)}
+        # Classes of each subject per (week pattern, weekday), (n_patterns, 7, n_subjects)
+        column = np.array([self.subject_index.get(s, 0) for s in timetable.subjects], dtype=np.int64)
+        self.per_weekday_subject = np.zeros(grid.shape[:2] + (len(self.subjects),), dtype=np.int64)
+        p, d, t = np.nonzero(grid >= 0)
+        np.add.at(self.per_weekday_subject, (p, d, column[grid[p, d, t]]), 1)
+
+    def week_days(self, start_date, n_days):
+        """ (week pattern, weekday) of each of n_days dates from start_date. """
+        days = np.arange(n_days)
+        weeks = ((start_date - self.anchor).days + days) // 7
+        return weeks % self.timetable.n_patterns, (start_date.weekday() + days) % 7
+
+    def slots_on(self, day):
+        """ [(time, subject), ...] held on day, by time, calendar aside. """
+        week = (day - self.anchor).days // 7
+        return self.timetable.slots(week % self.timetable.n_patterns, day.weekday())
+
+    def daily_counts(self, start_date, limit_date):
+        """ Classes held on each date of [start_date, limit_date]. """
+        n_days = (limit_date - start_date).days + 1
+        if n_days <= 0: return np.zeros(0, dtype=np.int64)
+        counts = self.per_weekday[self.week_days(start_date, n_days)]
+        counts[self.calendar.off_mask(start_date, limit_date)] = 0
+        return counts
+
+    def subject_daily_counts(self, start_date, limit_date):
+        """ Classes of each subject held on each date of [start_date, limit_date], (n_days, n_subjects). """
+        n_days = (limit_date - start_date).days + 1
+        if n_days <= 0: return np.zeros((0, len(self.subjects)), dtype=np.int64)
+        counts = self.per_weekday_subject[self.week_days(start_date, n_days)]
+        counts[self.calendar.off_mask(start_date, limit_date)] = 0
+        return counts
+
+    def plan(self, classes_needed, start_date, limit_date):
+        return RecoverySchedule(self, classes_needed, start_date, limit_date)
+
+
+class RecoverySchedule:
+    """
+    Lazy, random-access recovery schedule. Length, end date and day count are known
+    up front; rows ({Date, Day, Time, Subject}) are only built when iterated or indexed.
+    """
+
+    def __init__(self, engine, classes_needed, start_date, limit_date):
+        self.engine = engine
+        self.start_date = start_date
+        self.counts = engine.daily_counts(start_date, limit_date)
+        self.cum = np.cumsum(self.counts)
+        available = int(self.cum[-1]) if len(self.cum) else 0
+        self.length = max(0, min(int(classes_needed), available))
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def _day_index(self, i):
+        return int(np.searchsorted(self.cum, i, side='right'))
+
+    def _day(self, day_idx):
+        d = self.start_date + timedelta(days=day_idx)
+        return d, d.strftime("%A"), self.engine.slots_on(d)
+
+    def _row(self, day_idx, slot_idx):
+        d, day_name, slots = self._day(day_idx)
+        time_str, subject = slots[slot_idx]
+        return {"Date": d, "Day": day_name, "Time": time_str, "Subject": subject}
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.length))]
+        if i < 0: i += self.length
+        if not 0 <= i < self.length: raise IndexError("schedule index out of range")
+        day_idx = self._day_index(i)
+        before = int(self.cum[day_idx - 1]) if day_idx else 0
+        return self._row(day_idx, i - before)
+
+    def __iter__(self):
+        remaining = self.length
+        for day_idx in np.flatnonzero(self.counts):
+            if remaining <= 0: return
+            take = min(int(self.counts[day_idx]), remaining)
+            # Date, day name and slots once per day, not per row
+            d, day_name, slots = self._day(int(day_idx))
+            for time_str, subject in slots[:take]:
+                yield {"Date": d, "Day": day_name, "Time": time_str, "Subject": subject}
+            remaining -= take
+
+    def page(self, offset, limit):
+        return self[offset:offset + limit]
+
+    @property
+    def end_date(self):
+        if not self.length: return self.start_date
+        return self.start_date + timedelta(days=self._day_index(self.length - 1))
+
+    @property
+    def days_needed(self):
+        if not self.length: return 0
+        return int(np.count_nonzero(self.counts[:self._day_index(self.length - 1) + 1]))
+
+
+class PlanSweep:
+    """
+    calculate_recovery_plan for every start date x target at once, as (n_starts, n_targets)
+    arrays. status holds indexes into STATUSES; end_offset is days from each start date.
+    """
+    STATUSES = PLAN_STATUSES
+
+    def __init__(self, targets, start_dates, limit_dates, current_pct, **columns):
+        self.targets = list(targets)
+        self.start_dates = list(start_dates)
+        self.limit_dates = list(limit_dates)
+        self.current_pct = current_pct
+        self.status = columns["status"]
+        self.classes_needed = columns["classes_needed"]
+        self.classes_skippable = columns["classes_skippable"]
+        self.scheduled = columns["scheduled"]
+        self.days_needed = columns["days_needed"]
+        self.end_offset = columns["end_offset"]
+        self.max_possible = columns["max_possible"]
+
+    @property
+    def shape(self):
+        return self.status.shape
+
+    def end_date(self, i, j):
+        return self.start_dates[i] + timedelta(days=int(self.end_offset[i, j]))
+
+    def plan(self, i, j):
+        """ The calculate_recovery_plan result for start_dates[i] and targets[j], minus the schedule. """
+        status = self.STATUSES[self.status[i, j]]
+        res = {"current_pct": self.current_pct, "target": self.targets[j], "status": status,
+               "classes_skippable": int(self.classes_skippable[i, j]), "classes_needed": int(self.classes_needed[i, j]),
+               "days_needed": int(self.days_needed[i, j]), "end_date": self.end_date(i, j)}
+        if status == "impossible_timeframe": res["max_possible"] = float(self.max_possible[i, j])
+        return res
+
+    def rows(self):
+        """ Compact table: one dict per (start_date, target). """
+        out = []
+        for i, start in enumerate(self.start_dates):
+            for j, target in enumerate(self.targets):
+                out.append({"start_date": start, "target": target, "status": self.STATUSES[self.status[i, j]],
+                            "classes_needed": int(self.classes_needed[i, j]),
+                            "classes_skippable": int(self.classes_skippable[i, j]),
+                            "scheduled": int(self.scheduled[i, j]), "days_needed": int(self.days_needed[i, j]),
+                            "end_date": self.end_date(i, j)})
+        return out
@@ -0,0 +1,344 @@
+"""
+Local HTTP service for a student portal: recovery plans and risks from warm AttendanceBrains.
+
+    python -m backend.service --port 8765 --cache-mb 512 --workers 4
+
+Every POST body is JSON naming the student and their input files on this machine:
+
+    {"student": "S00042", "timetable": "/data/S00042/timetable.csv",
+     "absence": "/data/S00042/absence.csv", "summary": "/data/S00042/summary.csv"}
+
+A multi-section timetable also needs "section": "B"; without it the request fails with 422.
+
+POST /plan          + target, total, absent, start (YYYY-MM-DD), horizon ('semester' | days), limit
+POST /subject-plans + target, start, horizon: the plan for every subject of the summary
+POST /subject-risks
+POST /slot-risks
+POST /risks         + dates: ["2026-03-02", ...] or start / end
+GET  /stats         brain cache and per-endpoint latency percentiles
+GET  /health
+
+Loaded, trained brains stay in an LRU cache keyed by student and input version (path, size and
+mtime of every file, and the section), capped by estimated memory. Loading, training and planning run in a
+thread pool so the event loop keeps accepting requests; concurrent requests for a student that
+is not loaded yet share one load. A brain builds some state on first use (subject index, schedule
+engine, risk cache) without locking, so each brain serves one request at a time.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from backend.attendance_backend import AttendanceBrain
+from backend.instrumentation import Instrumentation
+
+INPUTS = ("calendar", "timetable", "summary", "absence")
+MAX_BODY = 1 << 20
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def input_version(spec):
+    """ (student, ((input, path, size, mtime_ns), ...), section); changes whenever any input file does. """
+    student = str(spec.get("student") or "")
+    if not student: raise ServiceError(400, "missing 'student'")
+    parts = []
+    for name in INPUTS:
+        path = spec.get(name)
+        if not path: continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise ServiceError(404, f"{name} not found: {path}")
+        parts.append((name, path, st.st_size, st.st_mtime_ns))
+    section = spec.get("section")
+    return student, tuple(parts), None if section is None else str(section)
+
+
+def brain_nbytes(brain):
+    """ Rough resident size: history columns plus the fitted forest's node and value arrays. """
+    size = 64 * 1024 + brain.history.nbytes
+    for tree in getattr(brain.model_daily, "estimators_", []):
+        size += tree.tree_.node_count * 64 + tree.tree_.value.nbytes
+    return size
+
+
+def load_timetable(brain, path, section):
+    """ parse_timetable, refusing to pick a section of a multi-section sheet on the caller's behalf. """
+    ok, msg = brain.parse_timetable(path, section=section)
+    tt = brain.week_timetable
+    if ok and section is None and len(tt.sections) > 1:
+        return False, f"{len(tt.sections)} sections ({tt.section_list()}); send 'section'"
+    return ok, msg
+
+
+def load_brain(key):
+    _, parts, section = key
+    brain = AttendanceBrain()
+    paths = {name: path for name, path, _, _ in parts}
+    steps = [("calendar", brain.load_calendar), ("timetable", lambda path: load_timetable(brain, path, section)),
+             ("summary", brain.parse_attendance_summary), ("absence", brain.load_absence_details)]
+    for name, load in steps:
+        if name not in paths: continue
+        ok, msg = load(paths[name])
+        if not ok: raise ServiceError(422, f"{name}: {msg}")
+    return brain
+
+
+class BrainCache:
+    """ LRU of loaded brains under a byte budget; one in-flight load per key. """
+
+    def __init__(self, max_bytes, loop, executor):
+        self.max_bytes = max_bytes
+        self.loop = loop
+        self.executor = executor
+        self._brains = OrderedDict()  # key -> (brain, nbytes)
+        self._loading = {}  # key -> Future
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "shared_loads": 0}
+
+    async def get(self, key):
+        entry = self._brains.get(key)
+        if entry is not None:
+            self._brains.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.stats["shared_loads"] += 1
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        pending = self._loading[key] = self.loop.create_future()
+        try:
+            brain = await self.loop.run_in_executor(self.executor, load_brain, key)
+            nbytes = await self.loop.run_in_executor(self.executor, brain_nbytes, brain)
+        except BaseException as e:
+            pending.set_exception(e)
+            pending.exception()  # retrieved here, so waiters-less failures are not logged
+            raise
+        finally:
+            del self._loading[key]
+        self._put(key, brain, nbytes)
+        pending.set_result(brain)
+        return brain
+
+    def _put(self, key, brain, nbytes):
+        # A student's older input version is dead weight once a newer one is loaded
+        for old in [k for k in self._brains if k[0] == key[0]]:
+            self.bytes -= self._brains.pop(old)[1]
+        self._brains[key] = (brain, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.max_bytes and len(self._brains) > 1:
+            _, (_, size) = self._brains.popitem(last=False)
+            self.bytes -= size
+            self.stats["evictions"] += 1
+
+    def summary(self):
+        return {**self.stats, "brains": len(self._brains), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+def parse_day(value, field):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"'{field}' must be YYYY-MM-DD")
+
+
+def parse_int(value, field):
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ServiceError(400, f"'{field}' must be an integer")
+
+
+def parse_limit(brain, start, body):
+    """ The plan's last day: the semester's end, or start + 'horizon' days. """
+    horizon = body.get("horizon", "semester")
+    if horizon == "semester": return brain.get_semester_end_date(start)
+    try:
+        return start + timedelta(days=parse_int(horizon, "horizon"))
+    except OverflowError:
+        raise ServiceError(400, "'horizon' is out of range")
+
+
+def do_plan(brain, body):
+    total = body.get("total", brain.auto_total)
+    absent = body.get("absent", brain.auto_absent)
+    if "total" not in body and not brain.has_summary_data:
+        raise ServiceError(422, "no totals: send a summary file or total / absent")
+    start = parse_day(body["start"], "start") if body.get("start") else date.today()
+    limit = parse_limit(brain, start, body)
+
+    res = brain.calculate_recovery_plan(parse_int(body.get("target", 75), "target"), parse_int(total, "total"),
+                                        parse_int(absent, "absent"), start, limit)
+    schedule = res.pop("schedule", None) or []
+    n = min(parse_int(body.get("limit", 100), "limit"), len(schedule))
+    res["end_date"] = res["end_date"].isoformat()
+    res["schedule_length"] = len(schedule)
+    res["schedule"] = [{"date": r["Date"].isoformat(), "day": r["Day"], "time": r["Time"], "subject": r["Subject"]}
+                       for r in schedule[:n]]
+    return res
+
+
+def do_subject_plans(brain, body):
+    start = parse_day(body["start"], "start") if body.get("start") else date.today()
+    limit = parse_limit(brain, start, body)
+    plans = brain.calculate_subject_plans(parse_int(body.get("target", 75), "target"), start, limit)
+    for plan in plans: plan["end_date"] = plan["end_date"].isoformat()
+    return {"subjects": plans, "not_on_timetable": [p["subject"] for p in plans if p["timetable_subject"] is None]}
+
+
+def do_risks(brain, body):
+    if body.get("dates") is not None:
+        days = [parse_day(d, "dates") for d in body["dates"]]
+        return {"risks": [{"date": d.isoformat(), "risk": round(brain.predict_day_risk(d), 4)} for d in days]}
+    start = parse_day(body.get("start"), "start")
+    end = parse_day(body.get("end"), "end")
+    risks = brain.predict_risk_range(start, end)
+    return {"start": start.isoformat(), "risks": [round(float(r), 4) for r in risks]}
+
+
+def do_subject_risks(brain, body):
+    return {"subjects": [{"subject": s, "risk": round(r, 4)} for s, r in brain.get_subject_risks()]}
+
+
+def do_slot_risks(brain, body):
+    return {"slots": [{"weekday": d, "time": t, "risk": round(r, 4)}
+                      for (d, t), r in sorted(brain.get_slot_risk_matrix().items())]}
+
+
+def locked(lock, action, brain, body):
+    with lock: return action(brain, body)
+
+
+ROUTES = {"/plan": do_plan, "/subject-plans": do_subject_plans, "/risks": do_risks, "/subject-risks": do_subject_risks, "/slot-risks": do_slot_risks}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+class AttendanceService:
+    def __init__(self, max_bytes=512 * 2 ** 20, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="brain")
+        self.max_bytes = max_bytes
+        self.cache = None
+        self.latency = Instrumentation()
+        self.server = None
+        self._locks = weakref.WeakKeyDictionary()  # brain -> Lock held while an action runs on it
+        self._connections = {}  # handler task -> writer; closed on shutdown so handlers exit cleanly
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.cache = BrainCache(self.max_bytes, asyncio.get_running_loop(), self.executor)
+        self.server = await asyncio.start_server(self._connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            for writer in self._connections.values(): writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, method, path, body):
+        """ (status, payload) for one request. """
+        if path == "/health": return 200, {"ok": True}
+        if path == "/stats": return 200, {"cache": self.cache.summary(), "latency": self.latency.summary()}
+        action = ROUTES.get(path)
+        if action is None: return 404, {"error": f"unknown path {path}"}
+        if method != "POST": return 405, {"error": "use POST with a JSON body"}
+        try:
+            spec = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "body is not JSON"}
+        if not isinstance(spec, dict): return 400, {"error": "body must be a JSON object"}
+
+        brain = await self.cache.get(input_version(spec))
+        lock = self._locks.setdefault(brain, threading.Lock())
+        loop = asyncio.get_running_loop()
+        return 200, await loop.run_in_executor(self.executor, locked, lock, action, brain, spec)
+
+    async def _connection(self, reader, writer):
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""): break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                path = target.split("?", 1)[0]
+                t0 = time.perf_counter()
+                try:
+                    status, payload = await self.handle(method.upper(), path, body)
+                except ServiceError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                self.latency.record(path, time.perf_counter() - t0)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive: break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive=True):
+        data = json.dumps(payload, default=str).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(host, port, max_bytes, workers):
+    service = AttendanceService(max_bytes, workers)
+    host, port = await service.start(host, port)
+    print(f"serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP service for recovery plans and risks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-mb", type=int, default=512, help="Memory budget for warm brains")
+    parser.add_argument("--workers", type=int, default=4, help="Threads for loading, training and planning")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.cache_mb * 2 ** 20, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
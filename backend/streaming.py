@@ -0,0 +1,56 @@
+import os
+from collections import Counter
+from datetime import date
+
+from backend.history_store import RiskCounters
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+
+def iter_csv_chunks(file_path, chunksize, progress=None, **read_kwargs):
+    """
+    Yields DataFrame chunks of at most `chunksize` rows.
+    progress(rows_done, bytes_done, bytes_total) is called after each chunk.
+    """
+    total = os.path.getsize(file_path)
+    rows = 0
+    with open(file_path, "rb") as f:
+        with pd.read_csv(f, chunksize=chunksize, **read_kwargs) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                yield chunk
+                if progress: progress(rows, min(f.tell(), total), total)
+
+
+class AbsenceAggregates:
+    """
+    Running totals folded from absence-detail chunks. Size grows with the number of
+    distinct dates, subjects and slots, never with the number of rows in the file.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.daily = {}  # {date ordinal: [rows, absent_rows]}
+        self.counters = RiskCounters()
+
+    def fold(self, ordinals, absent_day, cell_days, subjects, times):
+        """ ordinals/absent_day are per kept row; cell_days/subjects/times are per absent slot. """
+        self.rows += len(ordinals)
+        for d, a in zip(ordinals.tolist(), absent_day.tolist()):
+            entry = self.daily.get(d)
+            if entry is None: entry = self.daily[d] = [0, 0]
+            entry[0] += 1
+            entry[1] += a
+        self.counters.add(Counter(subjects).items(), Counter(zip(cell_days.tolist(), times)).items())
+
+    def training_set(self):
+        """ One weighted sample per (date, label) instead of one per row. """
+        X, y, w = [], [], []
+        for ordinal, (n, absent) in self.daily.items():
+            d = date.fromordinal(ordinal)
+            feat = [d.weekday(), d.day, d.month]
+            if absent: X.append(feat); y.append(1); w.append(absent)
+            if n - absent: X.append(feat); y.append(0); w.append(n - absent)
+        return np.array(X).reshape(-1, 3), np.array(y), np.array(w, dtype=float)
@@ -0,0 +1,228 @@
+"""
+Raw subject strings from timetables, absence exports and summaries -> one canonical name per
+subject, so "SOCIAL PSYCHOLOGY BPSY201-4", "Social Psychology" and "SOCIAL PSYCH" all count
+as SOCIAL PSYCHOLOGY. Each lookup ends in one of OUTCOMES:
+
+    exact       the raw string (or bare code) is already in the map
+    parsed      "NAME CODE": NAME is used and both strings are added to the map
+    normalized  same letters and digits as a known name, ignoring case, punctuation and a code
+    fuzzy       the known name sharing the most character trigrams, when close, unambiguous and
+                an abbreviation of it (see words_fit): "SOCIAL PSYCH" is SOCIAL PSYCHOLOGY, while
+                "DEVELOPMENTAL PSYCHOLOGY", "PSYCHOLOGY" and "STATISTICS II" are never merged
+                into SOCIAL PSYCHOLOGY or STATISTICS I
+    unmatched   returned as is
+"""
+import re
+from collections import Counter, OrderedDict
+
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+
+# A code has a digit: "BPSY201-4" is one, the "PSYCH" of "SOCIAL PSYCH" is not
+SUBJECT_CODE_RE = re.compile(r'^(.*?)\s+((?=[A-Z-]*[0-9])[A-Z0-9-]{3,})$')
+CODE_TAIL_RE = re.compile(r'\s+(?=[A-Z-]*[0-9])[A-Z0-9-]{3,}$')
+NON_CODE_RE = re.compile(r'[^0-9A-Z-]+')
+NON_ALNUM_RE = re.compile(r'[^0-9A-Z]+')
+ROMAN_RE = re.compile(r'^X{0,3}(IX|IV|V?I{0,3})$')
+ROMAN = {"I": 1, "V": 5, "X": 10}
+OUTCOMES = ("exact", "parsed", "normalized", "fuzzy", "unmatched")
+
+
+def split_subject(raw_text):
+    """ "SOCIAL PSYCHOLOGY BPSY201-4" -> ("SOCIAL PSYCHOLOGY", "BPSY201-4"), or None. """
+    match = SUBJECT_CODE_RE.search(raw_text)
+    if match:
+        name_part = match.group(1).strip()
+        if len(name_part) > 2:
+            return name_part, match.group(2).strip()
+    return None
+
+
+def subject_key(text):
+    """ "Social Psych. (BPSY201-4)" -> "SOCIAL PSYCH": upper case, no trailing code, no punctuation. """
+    text = CODE_TAIL_RE.sub("", NON_CODE_RE.sub(" ", text.upper()).strip())
+    return " ".join(NON_ALNUM_RE.sub(" ", text).split())
+
+
+def numeral(word):
+    """ "2" / "II" -> 2; None for any other word. """
+    if word.isdigit(): return int(word)
+    if not word or not ROMAN_RE.match(word): return None
+    values = [ROMAN[c] for c in word]
+    return sum(-v if v < after else v for v, after in zip(values, values[1:] + [0]))
+
+
+def split_numbers(key):
+    """ "STATISTICS II" -> (["STATISTICS"], [2]): the words and the sorted numbers of a key. """
+    words, numbers = [], []
+    for w in key.split():
+        n = numeral(w)
+        if n is None: words.append(w)
+        else: numbers.append(n)
+    return words, sorted(numbers)
+
+
+def words_fit(query, name):
+    """
+    Whether key query can abbreviate key name: the same numbers ("2" = "II") and, in order, every
+    other word of query the start of name's word, with none of name's words left over.
+    """
+    (query, numbers), (words, name_numbers) = (split_numbers(key) for key in (query, name))
+    if numbers != name_numbers or len(query) != len(words): return False
+    return all(full.startswith(w) for w, full in zip(query, words))
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SubjectResolver:
+    """
+    mapping is the exact table (AttendanceBrain.subject_map: raw string or code -> name); its
+    values are the known names. Strings it does not hold are matched against a trigram index of
+    those names, which only visits names sharing a trigram with the query, and the answer is kept
+    in an LRU memo of memo_size strings. New names are indexed as they are learned.
+    """
+
+    def __init__(self, mapping=None, memo_size=4096, min_score=0.55, margin=0.05):
+        self.mapping = {} if mapping is None else mapping
+        self.memo_size = memo_size
+        self.min_score = min_score  # Dice coefficient of the trigram sets
+        self.margin = margin  # over the runner-up, else the match is ambiguous
+        self.stats = Counter()
+        self._memo = OrderedDict()  # raw string -> (name, outcome)
+        self._synced = None  # len(mapping) the index was last brought up to date with
+        self._by_key = {}  # subject_key -> known name
+        self._keys, self._names, self._grams = [], [], []  # per key, in _by_key order
+        self._index = {}  # trigram -> [key number, ...]
+        self._arrays = {}  # trigram -> _index[trigram] as an array, built on first query
+        self._sizes = ()  # trigram count per key, as an array
+
+    def copy(self):
+        twin = SubjectResolver(dict(self.mapping), self.memo_size, self.min_score, self.margin)
+        twin.stats = Counter(self.stats)
+        return twin
+
+    def learn(self, key, name):
+        self.mapping[key] = name
+        self._index_name(name)
+
+    def update(self, entries):
+        self.mapping.update(entries)
+        for name in entries.values(): self._index_name(name)
+
+    def replace(self, mapping):
+        self.mapping = mapping
+        self._synced = None
+
+    def _sync(self):
+        # The map is a plain dict callers may also write to; growth not seen here rebuilds the index
+        if self._synced == len(self.mapping): return
+        self._memo.clear()
+        self._by_key, self._keys, self._names, self._grams, self._index, self._arrays = {}, [], [], [], {}, {}
+        for name in dict.fromkeys(self.mapping.values()): self._add_key(name)
+        self._synced = len(self.mapping)
+
+    def _index_name(self, name):
+        if self._synced is None: return  # not built yet; _sync() will see it
+        self._synced = len(self.mapping)
+        if self._add_key(name): self._memo.clear()  # a new name can change earlier fuzzy answers
+
+    def _add_key(self, name):
+        # One entry per key: "SOCIAL PSYCHOLOGY" and "SOCIAL PSYCHOLOGY BPSY201-4" are one subject
+        key = subject_key(name)
+        if key in self._by_key: return False
+        self._by_key[key] = name
+        self._keys.append(key)
+        self._names.append(name)
+        self._grams.append(trigrams(key))
+        for g in self._grams[-1]:
+            self._index.setdefault(g, []).append(len(self._names) - 1)
+            self._arrays.pop(g, None)
+        return True
+
+    def resolve(self, raw_text, fuzzy=True):
+        """
+        (name, outcome) for one raw string. fuzzy=False stops after the exact and "NAME CODE"
+        steps and returns (raw_text, None) instead of looking further.
+        """
+        raw_text = str(raw_text).strip()
+        name = self.mapping.get(raw_text)
+        if name is not None:
+            self.stats["exact"] += 1
+            return name, "exact"
+        split = split_subject(raw_text)
+        if split:
+            name_part, code_part = split
+            self.mapping[code_part] = name_part
+            self.mapping[raw_text] = name_part
+            self._index_name(name_part)
+            self.stats["parsed"] += 1
+            return name_part, "parsed"
+        if not fuzzy: return raw_text, None
+
+        self._sync()
+        hit = self._memo.get(raw_text)
+        if hit is not None:
+            self._memo.move_to_end(raw_text)
+            self.stats["memo_hits"] += 1
+        else:
+            hit = self._memo[raw_text] = self._match(raw_text)
+            if len(self._memo) > self.memo_size: self._memo.popitem(last=False)
+        self.stats[hit[1]] += 1
+        return hit
+
+    def resolve_strict(self, raw_text):
+        """
+        resolve() without the fuzzy step, for strings that must keep their own subject (timetable
+        cells): a known name is only found by its exact spelling, code or key.
+        """
+        name, outcome = self.resolve(raw_text, fuzzy=False)
+        if outcome is not None: return name, outcome
+        self._sync()
+        known = self._by_key.get(subject_key(name))
+        outcome = "unmatched" if known is None else "normalized"
+        self.stats[outcome] += 1
+        return (name if known is None else known), outcome
+
+    def _match(self, raw_text):
+        key = subject_key(raw_text)
+        name = self._by_key.get(key)
+        if name is not None: return name, "normalized"
+        if len(key) < 4: return raw_text, "unmatched"
+
+        all_grams = trigrams(key)
+        grams = [g for g in all_grams if g in self._index]
+        if not grams: return raw_text, "unmatched"
+        postings = []
+        for g in grams:
+            arr = self._arrays.get(g)
+            if arr is None: arr = self._arrays[g] = np.array(self._index[g], dtype=np.int32)
+            postings.append(arr)
+        # Shared trigrams with every name any of them occurs in, counted in one pass
+        candidates = np.concatenate(postings)
+        shared = np.bincount(candidates, minlength=len(self._names))
+        ids = np.flatnonzero(shared)
+        if len(self._sizes) != len(self._grams): self._sizes = np.array([len(g) for g in self._grams], dtype=np.float64)
+        scores = 2 * shared[ids] / (len(all_grams) + self._sizes[ids])
+        # The best two close names the query can abbreviate; others are different subjects however close
+        fits = []
+        for i in np.argsort(scores)[::-1].tolist():
+            if scores[i] < self.min_score or len(fits) == 2: break
+            if words_fit(key, self._keys[ids[i]]): fits.append(i)
+        if not fits: return raw_text, "unmatched"
+        if len(fits) > 1 and scores[fits[0]] - scores[fits[1]] < self.margin: return raw_text, "unmatched"
+        return self._names[ids[fits[0]]], "fuzzy"
+
+    def canonical(self, name):
+        """ The name a stored subject resolves to now; never adds to the map. """
+        if name in self.mapping: return self.mapping[name]
+        self._sync()
+        hit = self._memo.get(name) or self._match(name)
+        return hit[0]
+
+    def summary(self):
+        return {**{k: self.stats[k] for k in OUTCOMES}, "memo_hits": self.stats["memo_hits"],
+                "memo_size": len(self._memo), "known_names": len(self._names)}
@@ -0,0 +1,192 @@
+"""
+Attendance summary sheets -> SummaryTable, the per-subject held / attended / absent counts
+plus the sheet's "Total" row, read in one pass.
+
+A sheet is a header row (a cell containing "Subject", fewer than three numbers), subject rows and
+a row whose first three cells say "total"; a registrar export repeats that block for every student.
+A row's counts are its last three numbers (held, attended, absent) wherever the columns are, and
+rows whose first three cells say "total" or "percentage" are never subjects.
+"""
+from backend.lazy import LazyModule
+from backend.streaming import iter_csv_chunks
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+# Rows per read: memory stays flat however many students a summary export holds
+SUMMARY_CHUNK_ROWS = 5_000
+
+
+class SummaryTable:
+    """
+    subjects[i] with counts[i] = (held, attended, absent) in an (n, 3) int64 array, in first-seen
+    order, the last row winning for a repeated name; total is the block's (held, attended, absent)
+    or None. Treat instances as immutable, like WeekTimetable, so brains and snapshots can share them.
+    """
+
+    def __init__(self, subjects, counts, total=None):
+        self.subjects = list(subjects)
+        self._counts = counts  # converted on first access, so an empty table never imports NumPy
+        self.total = None if total is None else tuple(int(x) for x in total)
+        self._totals = None
+
+    @classmethod
+    def empty(cls):
+        return cls([], [])
+
+    @classmethod
+    def from_counts(cls, counts, total=None):
+        """ From {subject: (held, attended, absent)}. """
+        return cls(counts, list(counts.values()), total)
+
+    @classmethod
+    def from_totals(cls, totals):
+        """ From the {subject: (held, absent)} layout; attended is held - absent. """
+        return cls(totals, [(h, h - a, a) for h, a in totals.values()])
+
+    def to_state(self):
+        """ JSON-able form for the parse cache and export_history(). """
+        return {"subjects": self.subjects, "counts": self.counts.tolist() if self.subjects else [],
+                "total": None if self.total is None else list(self.total)}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state["subjects"], state["counts"], state["total"])
+
+    @property
+    def counts(self):
+        if not isinstance(self._counts, np.ndarray):
+            self._counts = np.asarray(self._counts, dtype=np.int64).reshape(-1, 3)
+        return self._counts
+
+    @property
+    def held(self):
+        return self.counts[:, 0]
+
+    @property
+    def attended(self):
+        return self.counts[:, 1]
+
+    @property
+    def absent(self):
+        return self.counts[:, 2]
+
+    def __len__(self):
+        return len(self.subjects)
+
+    @property
+    def percentage(self):
+        """ attended / held per subject, as the sheet reports it; 0 where nothing was held. """
+        return np.where(self.held > 0, 100 * self.attended / np.maximum(self.held, 1), 0.0)
+
+    def subject_totals(self):
+        """ {subject: (held, absent)}, the planners' layout. A shared, read-only view. """
+        if self._totals is None:
+            if not self.subjects: return {}
+            self._totals = dict(zip(self.subjects, zip(self.held.tolist(), self.absent.tolist())))
+        return self._totals
+
+    def rows(self):
+        """ One dict per subject, for CSV / JSON output. """
+        if not self.subjects: return []
+        return [{"subject": s, "held": h, "attended": at, "absent": ab, "percentage": round(p, 2)}
+                for s, h, at, ab, p in zip(self.subjects, self.held.tolist(), self.attended.tolist(),
+                                           self.absent.tolist(), self.percentage.tolist())]
+
+
+def last_three(values):
+    """
+    (held, attended, absent, ok) per row of a float matrix (NaN = not a number): the row's last
+    three numbers truncated to ints, held and absent swapped when held < absent; ok where it has 3+.
+    """
+    finite = ~np.isnan(values)
+    right = np.cumsum(finite[:, ::-1], axis=1)[:, ::-1]  # numbers at or right of each cell
+    rows = np.arange(len(values))
+    held, attended, absent = (np.nan_to_num(values[rows, np.argmax(finite & (right == k), axis=1)]).astype(np.int64)
+                              for k in (3, 2, 1))
+    swap = held < absent
+    return np.where(swap, absent, held), attended, np.where(swap, held, absent), right[:, 0] >= 3
+
+
+class SummaryScanner:
+    """
+    Turns header=None string chunks into SummaryTables, one per block, as each "Total" row arrives.
+    Only the open block's subject rows are held between chunks. Like parse_timetable_frame, every
+    string test and the number conversion run once per distinct cell string of a chunk, not per cell.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.blocks = 0
+        self._name_col = None
+        self._open = {}  # subject -> (held, attended, absent), the block being read
+
+    def tables(self, chunks):
+        """ Yields tables lazily: stop iterating and the rest of the input is never read. """
+        for df in chunks: yield from self.feed(df)
+        if self._open: yield self._close(None)
+
+    def feed(self, df):
+        """ The tables completed by this chunk. """
+        n_rows, n_cols = df.shape
+        self.rows += n_rows
+        codes, uniques = pd.factorize(df.to_numpy(dtype=object).ravel())
+        codes = np.where(codes < 0, len(uniques), codes).reshape(n_rows, n_cols)  # NaN -> the "" at the end
+        text = [str(u).strip() for u in uniques.tolist()] + [""]
+
+        # 1. What each distinct string is; plain loops, as .str would loop per string too, plus set-up
+        low = [t.lower() for t in text]
+        is_total = np.array(["total" in t for t in low], dtype=bool)
+        is_pct = np.array(["percentage" in t for t in low], dtype=bool)
+        is_subject_label = np.array(["Subject" in t for t in text], dtype=bool)
+        numbers = pd.to_numeric(np.array([t.replace("%", "") for t in text], dtype=object), errors="coerce")
+        numbers = np.where(np.isfinite(numbers), numbers, np.nan).astype(np.float64)
+        names = np.array(text, dtype=object)
+
+        # 2. Row kinds: totals / percentages by the first three cells, headers by a "Subject" cell
+        held, attended, absent, counted = last_three(numbers[codes])
+        lead = codes[:, :3]
+        says_total, says_pct = is_total[lead].any(axis=1), is_pct[lead].any(axis=1)
+        totals = says_total & ~says_pct & counted
+        subject_label = is_subject_label[codes]
+        headers = subject_label.any(axis=1) & ~counted
+
+        # 3. Subject rows, named from the column of the last header above them
+        name_col = np.where(headers, np.argmax(subject_label, axis=1), -1)
+        last_header = np.maximum.accumulate(np.where(headers, np.arange(n_rows), -1))
+        row_col = np.where(last_header >= 0, name_col[np.maximum(last_header, 0)],
+                           -1 if self._name_col is None else self._name_col)
+        rows = np.flatnonzero(counted & ~says_total & ~says_pct & (row_col >= 0) & (row_col < n_cols))
+        row_names = names[codes[rows, row_col[rows]]]
+        rows = rows[row_names != ""]
+        row_names = row_names[row_names != ""].tolist()
+        row_counts = list(zip(held[rows].tolist(), attended[rows].tolist(), absent[rows].tolist()))
+
+        # 4. Walk the few header / total rows; the subject rows between them go in as one update
+        events = np.flatnonzero(headers | totals)
+        out, start = [], 0
+        for i, end in zip(events.tolist(), np.searchsorted(rows, events).tolist()):
+            self._open.update(zip(row_names[start:end], row_counts[start:end]))
+            start = end
+            if totals[i]:
+                out.append(self._close((held[i], attended[i], absent[i])))
+            else:
+                if self._open: out.append(self._close(None))
+                self._name_col = int(name_col[i])
+        self._open.update(zip(row_names[start:], row_counts[start:]))
+        return out
+
+    def _close(self, total):
+        table = SummaryTable.from_counts(self._open, total)
+        self._open = {}
+        self.blocks += 1
+        return table
+
+
+def iter_summary_tables(file_path, chunksize=SUMMARY_CHUNK_ROWS, progress=None):
+    """ Every block of a (multi-student) summary CSV, read chunksize rows at a time. """
+    chunks = iter_csv_chunks(file_path, chunksize, progress, header=None, dtype=str)
+    try:
+        yield from SummaryScanner().tables(chunks)
+    finally:
+        chunks.close()
@@ -0,0 +1,223 @@
+"""
+Timetable sheets -> WeekTimetable, the compact (week pattern, weekday, slot) grid that the
+schedule engine, the planners and the GUI heatmap read.
+
+A sheet may hold several sections ("Section B" rows) and rotating weeks, marked either by
+"Week A" / "Week B" rows above a block of day rows or on the day rows themselves
+("Monday (A)", "Mon - Week B", "B Saturday"). Day rows without a week apply to every week.
+"""
+import re
+from datetime import date
+
+from backend.lazy import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5}
+DAY_ROW_RE = re.compile(r"^(?:(?:week|wk) ?)?(?:(?P<pre>[a-z0-9]) )?"
+                        r"(?P<day>mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|fri(?:day)?|sat(?:urday)?)"
+                        r"(?: (?:week|wk))?(?: (?P<post>[a-z0-9]))?$")
+WEEK_ROW_RE = re.compile(r"^(?:week|wk) ?(?P<week>[a-z0-9])$")
+SECTION_ROW_RE = re.compile(r"^section (?P<section>.+)$")
+TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+NOT_SUBJECTS = {'nan', '', 'break', 'lunch', 'mentoring', 'session', 'course code', 'time'}
+
+# Weeks alternate from this Monday on unless AttendanceBrain.set_week_anchor() says otherwise
+DEFAULT_WEEK_ANCHOR = date(2024, 1, 1)
+
+
+class TimetableFormatError(ValueError):
+    """ The sheet has no time header, or not the requested section. """
+
+
+def normalize(text):
+    """ Lower case, every run of non-alphanumerics collapsed to one space. """
+    return NON_ALNUM_RE.sub(" ", text.lower()).strip()
+
+
+class WeekTimetable:
+    """
+    Subject codes in a (n_patterns, 7, n_slots) int16 grid, -1 where there is no class.
+    times[slot] is "HH:MM" (sorted), subjects[code] the cleaned name, patterns[p] the week
+    label ("A", "B"; "" when the timetable does not rotate). section is the "Section X" block it
+    was read from and sections every block of the sheet ([] for a sheet without sections).
+    Treat instances as immutable: parsers build new ones, so brains and snapshots can share them.
+    """
+
+    def __init__(self, grid, times, subjects, patterns=("",), section=None, sections=()):
+        self._grid = grid  # None: no slots yet, built on first access so a new brain never imports NumPy
+        self.times = list(times)
+        self.subjects = list(subjects)
+        self.patterns = list(patterns)
+        self.section = section
+        self.sections = list(sections)
+        self._slots = {}
+        self._weekly = {}
+
+    @classmethod
+    def empty(cls):
+        return cls(None, [], [])
+
+    @property
+    def grid(self):
+        if self._grid is None: self._grid = np.full((len(self.patterns), 7, len(self.times)), -1, dtype=np.int16)
+        return self._grid
+
+    @classmethod
+    def from_dict(cls, weekly):
+        """ From the single-week {weekday: {"08:45": subject}} layout. """
+        times = sorted({t for slots in weekly.values() for t in slots})
+        subjects = list(dict.fromkeys(s for d in sorted(weekly) for s in weekly[d].values()))
+        t_idx, s_idx = {t: i for i, t in enumerate(times)}, {s: i for i, s in enumerate(subjects)}
+        grid = np.full((1, 7, len(times)), -1, dtype=np.int16)
+        for d, slots in weekly.items():
+            for t, s in slots.items(): grid[0, int(d), t_idx[t]] = s_idx[s]
+        return cls(grid, times, subjects)
+
+    def to_state(self):
+        """ JSON-able form for export_history(). """
+        return {"patterns": self.patterns, "times": self.times, "subjects": self.subjects, "grid": self.grid.tolist(),
+                "section": self.section, "sections": self.sections}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(np.array(state["grid"], dtype=np.int16).reshape(len(state["patterns"]), 7, len(state["times"])),
+                   state["times"], state["subjects"], state["patterns"], state.get("section"), state.get("sections", ()))
+
+    @property
+    def n_patterns(self):
+        return len(self.patterns)
+
+    @property
+    def n_classes(self):
+        return int(np.count_nonzero(self.grid >= 0)) if self.times else 0
+
+    def __bool__(self):
+        return bool(self.times) and self.n_classes > 0
+
+    def section_list(self, shown=5):
+        """ "Section 0, Section 1, ..." for messages: the first shown of sections. """
+        return ", ".join(self.sections[:shown]) + (", ..." if len(self.sections) > shown else "")
+
+    def slots(self, pattern, weekday):
+        """ [(time, subject), ...] taught on weekday in week pattern, by time. """
+        if not self.times: return []
+        key = (pattern, weekday)
+        out = self._slots.get(key)
+        if out is None:
+            out = self._slots[key] = [(self.times[s], self.subjects[c])
+                                      for s, c in enumerate(self.grid[pattern, weekday].tolist()) if c >= 0]
+        return out
+
+    def weekly(self, pattern=None):
+        """
+        {weekday: {time: subject}} for one week pattern; pattern=None merges them, each slot taking
+        the first pattern that has a class there. A shared, read-only view.
+        """
+        out = self._weekly.get(pattern)
+        if out is None:
+            out = {}
+            for p in ([pattern] if pattern is not None else range(self.n_patterns)):
+                for d in range(7):
+                    for t, s in self.slots(p, d): out.setdefault(d, {}).setdefault(t, s)
+            self._weekly[pattern] = out
+        return out
+
+
+def parse_timetable_frame(df, clean, section=None):
+    """
+    Parses a whole sheet (header=None, string cells) with frame-wide operations. Exports repeat a
+    few hundred distinct strings across the grid, so the cells are factorized once and every string
+    test (time header, day / week / section row, subject cell) runs on the distinct values, then is
+    broadcast back through the codes. clean maps a sequence of raw cells to subject names in order
+    (AttendanceBrain.clean_subject_sequence, fuzzy=False); section keeps only that "Section X"
+    block, and a sheet with several sections defaults to its first rather than merging them (see
+    WeekTimetable.section).
+    Returns a WeekTimetable; raises TimetableFormatError.
+    """
+    n_rows, n_cols = df.shape
+    codes, uniques = pd.factorize(df.to_numpy(dtype=object).ravel())
+    codes = np.where(codes < 0, len(uniques), codes).reshape(n_rows, n_cols)  # NaN -> the "" at the end
+    text = [str(u).strip() for u in uniques.tolist()] + [""]
+
+    # 1. What each distinct string is; plain loops, as .str would loop per string too, plus set-up
+    norm = [normalize(t) for t in text]
+    days = [DAY_ROW_RE.match(t) for t in norm]
+    day_of = np.array([m and m["day"] for m in days], dtype=object)
+    label_of = np.array([m and (m["post"] or m["pre"]) for m in days], dtype=object)
+    week_of = np.array([m and m["week"] for m in map(WEEK_ROW_RE.match, norm)], dtype=object)
+    section_of = np.array([m and m["section"] for m in map(SECTION_ROW_RE.match, norm)], dtype=object)
+    times = [TIME_RE.search(t) for t in text]
+    is_time = np.array([m is not None for m in times], dtype=bool)
+    is_subject = np.array([len(t) > 2 and t.lower() not in NOT_SUBJECTS for t in text], dtype=bool)
+    text = np.array(text, dtype=object)
+
+    # 2. Row kinds: day rows by their first cell, week / section markers by their first non-empty cell
+    rows = np.arange(n_rows)
+    first = codes[:, 0]
+    lead = codes[rows, (text[codes] != "").argmax(axis=1)]
+    section_marks = section_of[lead]
+    marked = section_marks != None  # noqa: E711 (elementwise)
+    keep = np.ones(n_rows, dtype=bool)
+    block = np.cumsum(marked)
+    mark_rows = np.flatnonzero(marked)
+    # Each section once, as its sheet label ("Section B"), in sheet order
+    found = dict(zip(section_marks[mark_rows].tolist(), text[lead[mark_rows]].tolist()))
+    if section is None and len(found) > 1: section = next(iter(found))
+    if section is not None:
+        wanted = normalize(str(section))
+        wanted = wanted[len("section "):] if wanted.startswith("section ") else wanted
+        starts = np.flatnonzero(marked & (section_marks == wanted))
+        if not len(starts): raise TimetableFormatError(f"Section {section} not found.")
+        keep = block == block[starts[0]]
+        section = found[wanted]
+
+    # 3. Time header: the first (kept) row with 3+ "H:MM" cells
+    has_time = is_time[codes]
+    headers = np.flatnonzero((has_time.sum(axis=1) >= 3) & keep)
+    if not len(headers): raise TimetableFormatError("Could not detect time slots.")
+    time_cols = np.flatnonzero(has_time[headers[0]])
+    col_times = [f"{int(times[c][1]):02d}:{times[c][2]}" for c in codes[headers[0], time_cols].tolist()]
+
+    # 4. Week of every day row: its own label, else the last "Week X" row of its section, else every week
+    week_marks = week_of[lead]
+    last_mark = np.maximum.accumulate(np.where(week_marks != None, rows, -1))  # noqa: E711
+    in_block = (last_mark >= 0) & (block[np.maximum(last_mark, 0)] == block)
+    block_week = np.where(in_block, week_marks[np.maximum(last_mark, 0)], None)
+    label = label_of[first]
+    label = np.where(label != None, label, block_week)  # noqa: E711
+    day_names = day_of[first]
+    day_rows = np.flatnonzero((day_names != None) & keep)  # noqa: E711
+    weekday = np.array([WEEKDAYS[d[:3]] for d in day_names[day_rows]], dtype=np.int64)
+    row_label = label[day_rows]
+
+    # 5. Subject cells, row-major like the original loop, so subject cleaning sees the same order
+    cell_codes = codes[np.ix_(day_rows, time_cols)]
+    r_idx, c_idx = np.nonzero(is_subject[cell_codes])
+    names = clean(text[cell_codes[r_idx, c_idx]])
+    patterns = [p.upper() for p in dict.fromkeys(x for x in row_label if isinstance(x, str))] or [""]
+    slot_times = sorted(set(col_times))
+    slot_of_col = np.searchsorted(slot_times, col_times)
+    subjects = list(dict.fromkeys(names))
+    code_of = {s: i for i, s in enumerate(subjects)}
+    subject_codes = np.array([code_of[n] for n in names], dtype=np.int16)
+    pattern_of = {p: i for i, p in enumerate(patterns)}
+    cell_pattern = np.array([pattern_of[x.upper()] if isinstance(x, str) else -1 for x in row_label],
+                            dtype=np.int64)[r_idx]
+    cell_day, cell_slot = weekday[r_idx], slot_of_col[c_idx]
+
+    # 6. Every-week cells first, then week-specific cells over them; within each the last cell wins
+    out = np.full((len(patterns), 7, len(slot_times)), -1, dtype=np.int16)
+    for sel in (cell_pattern < 0, cell_pattern >= 0):
+        if not sel.any(): continue
+        p, d, t, c = cell_pattern[sel], cell_day[sel], cell_slot[sel], subject_codes[sel]
+        key = (np.maximum(p, 0) * 7 + d) * len(slot_times) + t
+        _, last = np.unique(key[::-1], return_index=True)
+        last = len(key) - 1 - last
+        if p[0] < 0:
+            out[:, d[last], t[last]] = c[last]
+        else:
+            out[p[last], d[last], t[last]] = c[last]
+    return WeekTimetable(out, slot_times, subjects, patterns, section, found.values())
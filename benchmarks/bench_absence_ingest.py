@@ -0,0 +1,47 @@
+"""
+Row-wise vs vectorized load_absence_details on a synthetic absence export.
+
+    python benchmarks/bench_absence_ingest.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.attendance_backend import AttendanceBrain
+from benchmarks.generators import write_absence_export
+
+
+def run(path, vectorized):
+    brain = AttendanceBrain()
+    brain.train_models = lambda: None  # time ingestion only
+    t0 = time.perf_counter()
+    ok, msg = brain.load_absence_details(path, vectorized=vectorized)
+    elapsed = time.perf_counter() - t0
+    if not ok: raise SystemExit(msg)
+    return brain, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "absence.csv")
+        write_absence_export(path, args.rows)
+        old, t_rows = run(path, vectorized=False)
+        new, t_cols = run(path, vectorized=True)
+
+    same = old.history.to_records() == new.history.to_records() and old.subject_map == new.subject_map
+    print(f"rows={args.rows:,} history={len(new.history):,} slots / {new.history.n_days:,} days identical={same}")
+    print(f"row-wise   {t_rows:8.3f}s")
+    print(f"vectorized {t_cols:8.3f}s  ({t_rows / t_cols:.1f}x)")
+    if not same: raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Cohort batch throughput: students per second through CohortBrain at several worker counts.
+
+    python benchmarks/bench_cohort.py --students 2000 --workers 1 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.cohort import CohortBrain, discover_students
+from benchmarks.generators import write_cohort
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--semesters", type=int, default=1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        students = discover_students(write_cohort(tmp, args.students, args.semesters))
+        for workers in args.workers:
+            cohort = CohortBrain(target=75, start=date(2026, 5, 4), horizon=180, workers=workers)
+            stats = cohort.run(students, os.path.join(tmp, f"out_{workers}.jsonl"))
+            print(f"workers={workers:2d}  {stats['students']} students in {stats['seconds']:.2f}s"
+                  f"  -> {stats['students_per_sec']:.1f} students/s  (failed: {stats['failed']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Reopening parsed histories: CSV re-parse vs export_history() directories loaded eagerly or
+memory-mapped, for a cohort of multi-semester students and one very large export.
+
+    python benchmarks/bench_history_binary.py --students 200 --semesters 5 --rows 1000000
+
+Models are not trained in any variant; every reopened brain is checked against the CSV one.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.attendance_backend import AttendanceBrain
+from backend.cohort import discover_students
+from benchmarks.generators import write_absence_export, write_cohort
+
+
+def timed(fn, items):
+    t0 = time.perf_counter()
+    brains = [fn(item) for item in items]
+    return time.perf_counter() - t0, brains
+
+
+def from_csv(paths):
+    brain = AttendanceBrain()
+    if paths.get("timetable"): brain.parse_timetable(paths["timetable"])
+    ok, msg = brain.load_absence_details(paths["absence"], train=False)
+    if not ok: raise RuntimeError(msg)
+    return brain
+
+
+def from_export(directory, mmap):
+    brain = AttendanceBrain()
+    ok, msg = brain.load_history(directory, mmap=mmap, train=False)
+    if not ok: raise RuntimeError(msg)
+    return brain
+
+
+def compare(label, items, exports):
+    t_csv, csv_brains = timed(from_csv, items)
+    for brain, directory in zip(csv_brains, exports):
+        ok, msg = brain.export_history(directory)
+        if not ok: raise RuntimeError(msg)
+    t_eager, eager = timed(lambda d: from_export(d, False), exports)
+    t_mmap, mapped = timed(lambda d: from_export(d, True), exports)
+    # First query on the mapped brains: risk counters come from store.json, not the columns
+    t_query, _ = timed(lambda b: b.get_subject_risks(), mapped)
+    for a, b, c in zip(csv_brains, eager, mapped):
+        assert a.history.to_records() == b.history.to_records() == c.history.to_records()
+    n = len(items)
+    print(f"{label}: {n} histories, {sum(len(b.history) for b in csv_brains):,} absent slots")
+    for name, t in (("csv parse", t_csv), ("npy eager", t_eager), ("npy mmap", t_mmap)):
+        print(f"  {name:10s} {t:8.3f}s  {t / n * 1000:9.2f} ms/history  {t_csv / t:8.1f}x")
+    print(f"  subject risks on mapped brains: {t_query / n * 1000:.3f} ms/history")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--semesters", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows of the single large export")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        students = discover_students(write_cohort(tmp, args.students, args.semesters))
+        compare(f"cohort {args.students}x{args.semesters}", students,
+                [os.path.join(tmp, "npy", s["student_id"]) for s in students])
+        big = write_absence_export(os.path.join(tmp, "big.csv"), args.rows)
+        compare(f"export of {args.rows:,} rows", [{"absence": big}], [os.path.join(tmp, "npy", "big")])
+
+
+if __name__ == "__main__":
+    main()
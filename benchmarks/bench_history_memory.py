@@ -0,0 +1,59 @@
+"""
+Memory of the absence history: old list-of-dicts full_history vs HistoryStore columns.
+
+    python benchmarks/bench_history_memory.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.history_store import HistoryStore
+
+SUBJECTS = ["SOCIAL PSYCHOLOGY", "COGNITIVE PSYCHOLOGY", "STATISTICS", "ENGLISH COMMUNICATION", "ETHICS"]
+TIMES = ["08:45", "09:45", "10:45", "11:45", "13:45", "14:45"]
+
+
+def build_records(n_rows, seed=3):
+    """ n_rows class absences (5 per day on average) plus one Daily_Aggregate per day. """
+    rng = random.Random(seed)
+    records, ordinal, n_class = [], date(2000, 1, 3).toordinal(), 0
+    while n_class < n_rows:
+        d = date.fromordinal(ordinal)
+        k = min(rng.randint(0, 10), n_rows - n_class)
+        n_class += k
+        for _ in range(k):
+            records.append({'Date': d, 'Day': d.weekday(), 'Subject': rng.choice(SUBJECTS),
+                            'Time': rng.choice(TIMES), 'IsAbsent': 1})
+        records.append({'Date': d, 'Subject': 'Daily_Aggregate', 'IsAbsent': 1})
+        ordinal += 1
+    return records
+
+
+def measure(fn):
+    tracemalloc.start()
+    obj = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    records, list_bytes = measure(lambda: build_records(args.rows))
+    store = HistoryStore.from_records(records)
+    print(f"records: {len(records):,} ({len(store):,} class rows, {store.n_days:,} days)")
+    print(f"list of dicts  {list_bytes / 2 ** 20:8.1f} MB")
+    print(f"HistoryStore   {store.nbytes / 2 ** 20:8.1f} MB  ({list_bytes / store.nbytes:.0f}x smaller)")
+    assert store.to_records() == records
+
+
+if __name__ == "__main__":
+    main()
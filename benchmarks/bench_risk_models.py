@@ -0,0 +1,89 @@
+"""
+Daily-risk backends (see backend/risk_models.py) against the original 100-tree forest: training
+time, the one-off feature-space table, per-day lookup latency and calibration on held-out days.
+
+    python benchmarks/bench_risk_models.py --years 4 --n-jobs 1
+
+Data comes from generators.write_seasonal_absences, whose true absence probability is known, so
+calibration is reported both against the outcomes (Brier, log loss, ECE) and against the truth.
+The first 75% of days train, the last 25% test.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.attendance_backend import AttendanceBrain
+from backend.history_store import EPOCH_ORDINAL
+from backend.risk_models import RISK_MODELS, feature_space, make_model
+from benchmarks.generators import absence_probability, write_seasonal_absences
+
+
+def calibration(p, y, truth, bins=10):
+    p = np.clip(p, 1e-6, 1 - 1e-6)
+    brier = float(np.mean((p - y) ** 2))
+    log_loss = float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+    which = np.minimum((p * bins).astype(int), bins - 1)
+    ece = sum(abs(p[which == b].mean() - y[which == b].mean()) * np.mean(which == b)
+              for b in range(bins) if np.any(which == b))
+    return brier, log_loss, float(ece), float(np.mean(np.abs(p - truth)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--n-jobs", type=int, default=None, help="Forest workers")
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_seasonal_absences(os.path.join(tmp, "absences.csv"), args.years)
+        base = AttendanceBrain()
+        ok, msg = base.load_absence_details(path, train=False)
+        if not ok: raise SystemExit(msg)
+
+    X, y = base.history.daily_features()
+    days = [date.fromordinal(int(o) - EPOCH_ORDINAL + date(1970, 1, 1).toordinal()) for o in base.history.agg_day]
+    truth = np.array([absence_probability(d) for d in days])
+    split = int(len(X) * 0.75)
+    space = feature_space()
+    lookup_days = [date(2026, 1, 1) + timedelta(days=i % 3650) for i in range(args.lookups)]
+    print(f"{len(X):,} days ({split:,} train / {len(X) - split:,} test), absence rate {y.mean():.3f}")
+    print(f"{'model':10s} {'fit ms':>9s} {'table ms':>9s} {'call us':>9s} {'lookup us':>10s}"
+          f" {'brier':>7s} {'logloss':>8s} {'ece':>6s} {'|p-true|':>9s}")
+
+    for name in RISK_MODELS:
+        model = make_model(name, args.n_jobs)
+        t0 = time.perf_counter()
+        model.fit(X[:split], y[:split])
+        fit = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        table = model.predict_proba(space)[:, 1]
+        table_ms = (time.perf_counter() - t0) * 1000
+        # What each uncached lookup cost before the table: one predict_proba call
+        t0 = time.perf_counter()
+        for row in X[:50]: model.predict_proba(row[None, :])
+        call_us = (time.perf_counter() - t0) / 50 * 1e6
+
+        test = X[split:]
+        p = table.reshape(7, 31, 12)[test[:, 0], test[:, 1] - 1, test[:, 2] - 1]
+        brier, log_loss, ece, err = calibration(p, y[split:], truth[split:])
+
+        brain = AttendanceBrain()
+        brain.history = base.history
+        brain.set_risk_model(name, args.n_jobs)
+        t0 = time.perf_counter()
+        for d in lookup_days: brain.predict_day_risk(d)
+        lookup_us = (time.perf_counter() - t0) / len(lookup_days) * 1e6
+        print(f"{name:10s} {fit * 1000:9.1f} {table_ms:9.1f} {call_us:9.1f} {lookup_us:10.2f}"
+              f" {brier:7.4f} {log_loss:8.4f} {ece:6.3f} {err:9.4f}")
+
+
+if __name__ == "__main__":
+    main()
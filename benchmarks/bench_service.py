@@ -0,0 +1,149 @@
+"""
+Load test for backend.service: concurrent keep-alive clients against a service subprocess,
+with client-side latency percentiles per endpoint for cold (first load) and warm requests.
+
+    python benchmarks/bench_service.py --students 50 --clients 16 --requests 2000
+    python benchmarks/bench_service.py --url http://127.0.0.1:8765 ...   # an already running service
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.cohort import discover_students
+from benchmarks.generators import FIRST_SEMESTER, write_cohort
+
+PLAN_START = FIRST_SEMESTER.replace(month=3)
+
+
+def start_service(cache_mb, workers):
+    proc = subprocess.Popen([sys.executable, "-m", "backend.service", "--port", "0", "--cache-mb", str(cache_mb),
+                             "--workers", str(workers)], cwd=ROOT, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    if "serving on" not in line:
+        proc.kill()
+        raise SystemExit(f"service did not start: {line}")
+    host, port = line.rsplit("/", 1)[1].strip().rsplit(":", 1)
+    return proc, host, int(port)
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""): break
+            if line.lower().startswith(b"content-length:"): length = int(line.split(b":")[1])
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer: self.writer.close()
+
+
+def make_request(rng, student):
+    spec = {"student": student["student_id"], "timetable": student["timetable"],
+            "absence": student["absence"], "summary": student["summary"]}
+    kind = rng.choices(["/plan", "/subject-risks", "/slot-risks", "/risks"], weights=[4, 2, 2, 2])[0]
+    if kind == "/plan":
+        spec.update(target=rng.choice([65, 75, 85]), start=PLAN_START.isoformat(), limit=50)
+    elif kind == "/risks":
+        spec["dates"] = [(PLAN_START.replace(day=1 + i)).isoformat() for i in range(rng.randint(1, 28))]
+    return kind, spec
+
+
+def percentiles(samples):
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(q * len(s)))] * 1000
+    return f"n={len(s):6d}  p50 {pick(0.5):8.2f}ms  p90 {pick(0.9):8.2f}ms  p99 {pick(0.99):8.2f}ms  max {s[-1] * 1000:8.2f}ms"
+
+
+async def load_test(host, port, students, clients, n_requests, seed):
+    rng = random.Random(seed)
+    queue = asyncio.Queue()
+    for _ in range(n_requests): queue.put_nowait(make_request(rng, rng.choice(students)))
+    loaded, cold, warm, errors = set(), [], {}, []
+
+    async def worker():
+        client = Client(host, port)
+        try:
+            while not queue.empty():
+                kind, spec = queue.get_nowait()
+                first = spec["student"] not in loaded  # includes requests that waited on its load
+                t0 = time.perf_counter()
+                status, payload = await client.request("POST", kind, spec)
+                elapsed = time.perf_counter() - t0
+                loaded.add(spec["student"])
+                if status != 200: errors.append((status, payload))
+                if first:
+                    cold.append(elapsed)
+                else:
+                    warm.setdefault(kind, []).append(elapsed)
+        finally:
+            client.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+
+    print(f"{n_requests} requests, {clients} clients, {len(students)} students in {elapsed:.2f}s "
+          f"-> {n_requests / elapsed:.1f} req/s  (errors: {len(errors)})")
+    if cold: print(f"cold (student not loaded yet)     {percentiles(cold)}")
+    for kind, samples in sorted(warm.items()):
+        print(f"warm {kind:28s} {percentiles(samples)}")
+    if errors: print("first error:", errors[0])
+
+    client = Client(host, port)
+    _, stats = await client.request("GET", "/stats")
+    client.close()
+    print("service cache:", json.dumps(stats["cache"]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--semesters", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--cache-mb", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--url", help="Use a running service instead of starting one")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        students = discover_students(write_cohort(tmp, args.students, args.semesters))
+        proc = None
+        if args.url:
+            host, port = args.url.split("//", 1)[-1].rstrip("/").rsplit(":", 1)
+            port = int(port)
+        else:
+            proc, host, port = start_service(args.cache_mb, args.workers)
+        try:
+            asyncio.run(load_test(host, port, students, args.clients, args.requests, args.seed))
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Cold start: time from launching a fresh interpreter until MainWindow is visible.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --save       # record benchmarks/baselines/startup.json
+    python benchmarks/bench_startup.py --check      # exit 1 if median is >25% over the baseline
+
+Also reports whether pandas / NumPy / scikit-learn were imported before the window showed
+(they should not be; see backend/lazy.py).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "startup.json")
+HEAVY = ("pandas", "numpy", "sklearn")
+
+# Runs in the child: same import path as main.py, stops at the first shown + painted window
+CHILD = """
+import json, sys, time
+from PyQt6.QtWidgets import QApplication
+from frontend.attendance_gui import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.processEvents()
+print(json.dumps({"visible_at": time.time(), "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def launch_once():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    t0 = time.time()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["visible_at"] - t0, result["heavy"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="Store the median as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Fail if the median regressed past --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    launch_once()  # warm the OS file cache and __pycache__
+    times, heavy = [], []
+    for _ in range(args.runs):
+        seconds, heavy = launch_once()
+        times.append(seconds)
+    median = statistics.median(times)
+    print(f"window visible  median {median:.3f}s  min {min(times):.3f}s  max {max(times):.3f}s  ({args.runs} runs)")
+    print(f"heavy modules imported before first paint: {', '.join(heavy) or 'none'}")
+
+    if args.save:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({"median_seconds": round(median, 3), "heavy": heavy}, f, indent=2)
+        print(f"saved {BASELINE}")
+    if args.check:
+        with open(BASELINE, encoding="utf-8") as f:
+            base = json.load(f)
+        limit = base["median_seconds"] * (1 + args.tolerance)
+        if median > limit or len(heavy) > len(base["heavy"]):
+            print(f"REGRESSION: {median:.3f}s vs baseline {base['median_seconds']:.3f}s (limit {limit:.3f}s)")
+            sys.exit(1)
+        print(f"ok: within {args.tolerance:.0%} of baseline {base['median_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
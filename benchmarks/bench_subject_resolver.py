@@ -0,0 +1,138 @@
+"""
+SubjectResolver on cohort-sized vocabularies: thousands of distinct raw subject strings (case,
+punctuation, course codes, truncated words, typos, unrelated entries) resolved against a few
+hundred known subjects, with the trigram index vs a scan over every known name.
+
+    python benchmarks/bench_subject_resolver.py --subjects 300 --variants 5000
+
+Prints lookups per second, how many strings resolved by each route, and how many landed on
+the subject they were generated from. Near misses are different subjects one word or number away
+from a known one ("DEVELOPMENTAL PSYCHOLOGY" next to "SOCIAL PSYCHOLOGY", "STATISTICS II" next to
+"STATISTICS I", "PSYCHOLOGY", "SOCIAL PSYCHOLOGY LAB"); none of them may resolve to another subject.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.subject_resolver import SubjectResolver, subject_key, trigrams
+
+WORDS = ["SOCIAL", "COGNITIVE", "DEVELOPMENTAL", "CLINICAL", "ORGANIZATIONAL", "PSYCHOLOGY", "STATISTICS",
+         "RESEARCH", "METHODS", "ETHICS", "ENGLISH", "COMMUNICATION", "ENVIRONMENTAL", "STUDIES", "ECONOMICS",
+         "HISTORY", "MODERN", "INDIAN", "POLITICAL", "THEORY", "APPLIED", "ADVANCED", "INTRODUCTION", "DATA",
+         "ANALYSIS", "BIOLOGY", "CHEMISTRY", "ORGANIC", "PHYSICS", "QUANTUM", "LITERATURE", "PHILOSOPHY"]
+
+
+def make_subjects(n, rng):
+    names = set()
+    while len(names) < n:
+        # Some courses come in parts: "STATISTICS I" alongside "STATISTICS II" and "STATISTICS 3"
+        names.add(" ".join(rng.sample(WORDS, rng.randint(2, 3))) + rng.choice(["", "", "", " I"]))
+    return [(name, f"B{name[:3]}{100 + i}-{rng.randint(1, 4)}") for i, name in enumerate(sorted(names))]
+
+
+def variant(name, code, rng):
+    kind = rng.randrange(5)
+    if kind == 0: return f"{name} {code}"
+    if kind == 1: return name.title() + rng.choice(["", ".", " (Theory)"[:0]])
+    if kind == 2: return f"{name.lower()} ({code})"
+    if kind == 3: return " ".join(w[:max(4, len(w) - rng.randint(0, 5))] for w in name.split())
+    i = rng.randrange(len(name))
+    return name[:i] + name[i + 1:]  # one dropped letter
+
+
+def near_miss(name, rng):
+    """ Another subject one word or number away from name. """
+    words = name.split()
+    kind = rng.randrange(4)
+    if kind == 0:
+        i = rng.randrange(len(words))
+        words[i] = rng.choice([w for w in WORDS if w not in words])
+    elif kind == 1:
+        words.append(rng.choice(["LAB", "PRACTICAL", "SEMINAR"]))
+    elif kind == 2 and len(words) > 2:
+        del words[rng.randrange(len(words))]
+    elif words[-1] == "I":
+        words[-1] = rng.choice(["II", "2", "III"])
+    else:
+        words.append(rng.choice(["II", "2"]))
+    return " ".join(words)
+
+
+def scan_match(resolver, raw):
+    """ The index's answer found the slow way: score every known name. """
+    grams = trigrams(subject_key(raw))
+    best = max(((2 * len(grams & g) / (len(grams) + len(g)), i) for i, g in enumerate(resolver._grams)), default=None)
+    return resolver._names[best[1]] if best and best[0] >= resolver.min_score else raw
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subjects", type=int, default=300)
+    parser.add_argument("--variants", type=int, default=5000)
+    parser.add_argument("--junk", type=int, default=500, help="Strings that match no subject")
+    parser.add_argument("--near-misses", type=int, default=1000, help="Other subjects close to a known one")
+    parser.add_argument("--min-score", type=float, default=0.55)
+    parser.add_argument("--margin", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    subjects = make_subjects(args.subjects, rng)
+    raws, truth = [], {}
+    for _ in range(args.variants):
+        name, code = rng.choice(subjects)
+        raw = variant(name, code, rng)
+        raws.append(raw)
+        truth.setdefault(raw, name)
+    for i in range(args.junk):
+        raw = f"{rng.choice(['LAB', 'TUTORIAL', 'ROOM', 'SEMINAR'])} {i} {rng.choice(['NOTE', 'SWAP', 'HOLD'])}"
+        raws.append(raw)
+        truth.setdefault(raw, raw)
+    known = {name for name, _ in subjects}
+    misses = set()
+    for _ in range(args.near_misses):
+        raw = near_miss(rng.choice(subjects)[0], rng)
+        if raw in known: continue  # the change landed on another real subject
+        raws.append(raw)
+        truth.setdefault(raw, raw)
+        misses.add(raw)
+    rng.shuffle(raws)
+    distinct = list(dict.fromkeys(raws))
+
+    resolver = SubjectResolver(min_score=args.min_score, margin=args.margin)
+    for name, code in subjects: resolver.resolve(f"{name} {code}")  # what a summary / timetable teaches
+    resolver.stats.clear()
+
+    t0 = time.perf_counter()
+    names = [resolver.resolve(raw)[0] for raw in distinct]
+    t_index = time.perf_counter() - t0
+    stats = resolver.summary()
+    t0 = time.perf_counter()
+    for raw in raws: resolver.resolve(raw)
+    t_memo = time.perf_counter() - t0
+
+    sample = distinct[:min(len(distinct), 1000)]
+    t0 = time.perf_counter()
+    for raw in sample: scan_match(resolver, raw)
+    t_scan = (time.perf_counter() - t0) * len(distinct) / len(sample)
+
+    correct = sum(truth[raw] == name for raw, name in zip(distinct, names))
+    wrong = sum(truth[raw] != name and name != raw.strip() for raw, name in zip(distinct, names))
+    merged = sum(raw in misses and name != raw for raw, name in zip(distinct, names))
+    print(f"{len(distinct):,} distinct strings, {args.subjects} subjects")
+    print(f"  trigram index  {t_index * 1000:8.1f}ms  ({len(distinct) / t_index:10,.0f} strings/s)")
+    print(f"  full scan      {t_scan * 1000:8.1f}ms  (estimated from {len(sample)} strings)")
+    print(f"  memo, {len(raws):,} repeated lookups {t_memo * 1000:6.1f}ms")
+    print("  resolved: " + ", ".join(f"{k} {stats[k]:,}" for k in ("exact", "parsed", "normalized", "fuzzy", "unmatched")))
+    print(f"  to the generating subject: {correct:,} / {len(distinct):,} ({correct / len(distinct):.1%}), "
+          f"to another subject: {wrong:,} ({wrong / len(distinct):.1%})")
+    print(f"  near misses merged into a known subject: {merged:,} / {len(misses):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Summary parsing: the original two-read, row-by-row parser vs the single-pass SummaryScanner, on
+one student's summary and on a registrar export holding many students' blocks.
+
+    python benchmarks/bench_summary_parse.py --students 1000 10000 100000
+
+parse_attendance_summary stops at the export's first Total row; iter_summary_tables streams
+every block with memory bounded by --chunk rows. Peak memory is traced Python / numpy allocation.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.attendance_backend import AttendanceBrain
+from backend.summary import SUMMARY_CHUNK_ROWS, iter_summary_tables
+from benchmarks.generators import write_student, write_summary_export
+
+
+def counts(row):
+    nums = []
+    for val in row:
+        try:
+            v = float(str(val).replace('%', '').strip())
+            if v == v: nums.append(int(v))
+        except (ValueError, OverflowError):
+            pass
+    if len(nums) < 3: return None
+    held, absent = nums[-3], nums[-1]
+    return (absent, held) if held < absent else (held, absent)
+
+
+def two_pass(path):
+    """ The original parser: subject rows from a header read, the first Total row from a second read. """
+    import pandas as pd
+    df = pd.read_csv(path)
+    df.columns = [c.strip() for c in df.columns]
+    col_sub = next((c for c in df.columns if 'Subject' in c), None)
+    subjects, total = {}, None
+    if col_sub:
+        for name, row in zip(df[col_sub], df.itertuples(index=False, name=None)):
+            if pd.isna(name) or not str(name).strip(): continue
+            lead = " ".join(str(x).lower() for x in row[:3])
+            if "total" in lead or "percentage" in lead: continue
+            c = counts(row)
+            if c: subjects[str(name).strip()] = c
+    for row in pd.read_csv(path, header=None).itertuples(index=False, name=None):
+        lead = " ".join(str(x).lower() for x in row[:3])
+        if "total" in lead and "percentage" not in lead:
+            total = counts(row)
+            if total: break
+    return subjects, total
+
+
+def single_pass(path):
+    brain = AttendanceBrain()
+    ok, msg = brain.parse_attendance_summary(path)
+    if not ok: raise RuntimeError(msg)
+    return brain.subject_totals, (brain.auto_total, brain.auto_absent) if brain.has_summary_data else None
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def peak_mib(fn):
+    """ Traced in a separate run: tracing slows the timed one several-fold. """
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--files", type=int, default=200, help="Single-student summaries to parse")
+    parser.add_argument("--chunk", type=int, default=SUMMARY_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [write_student(tmp, f"S{n:05d}")[1] for n in range(args.files)]
+        single_pass(paths[0])  # imports pandas once
+        t_old, old = timed(lambda: [two_pass(p) for p in paths])
+        t_new, new = timed(lambda: [single_pass(p) for p in paths])
+        print(f"{args.files} student summaries: two-pass {t_old * 1000:8.1f}ms  single-pass {t_new * 1000:8.1f}ms "
+              f"({t_old / t_new:4.1f}x, same={old == new})")
+
+        for n in args.students:
+            path = os.path.join(tmp, f"export{n}.csv")
+            truth = write_summary_export(path, n)
+            size = os.path.getsize(path) / 2 ** 20
+            stream = lambda: [(t.total[0], t.total[2]) for t in iter_summary_tables(path, args.chunk)]
+            t_old, old = timed(lambda: two_pass(path))
+            t_first, first = timed(lambda: single_pass(path))
+            t_all, tables = timed(stream)
+            m_old, m_all = peak_mib(lambda: two_pass(path)), peak_mib(stream)
+            print(f"{n:7,d} students ({size:6.1f} MiB): two-pass {t_old * 1000:8.1f}ms {m_old:7.1f} MiB peak  "
+                  f"first student {t_first * 1000:6.1f}ms (same={old[1] == first[1]})  "
+                  f"every student {t_all * 1000:8.1f}ms {m_all:6.1f} MiB peak (correct={tables == truth})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Timetable parsing on wide, messy multi-section exports: the original row-by-row parser vs the
+frame-wide vectorized one, on whole files and on one section of a rotating (A / B week) file.
+
+    python benchmarks/bench_timetable_parse.py --sections 20 50 200 --slots 12
+
+The row-by-row parser knows one weekly grid only and merges every section, while the vectorized
+one keeps the first section unless told otherwise; results are compared on a one-section,
+non-rotating export, where both must produce the same timetable and subject map.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.attendance_backend import AttendanceBrain
+from benchmarks.generators import write_timetable_export
+
+
+def best_of(repeat, fn):
+    times, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def parse(path, **kwargs):
+    brain = AttendanceBrain()
+    ok, msg = brain.parse_timetable(path, **kwargs)
+    if not ok: raise RuntimeError(msg)
+    return brain
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sections", type=int, nargs="+", default=[20, 50, 200])
+    parser.add_argument("--slots", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parse(write_timetable_export(os.path.join(tmp, "warm.csv"), 2, args.slots))  # imports pandas once
+        for n in args.sections:
+            flat = write_timetable_export(os.path.join(tmp, f"flat{n}.csv"), n, args.slots, rotating=False)
+            rotating = write_timetable_export(os.path.join(tmp, f"rot{n}.csv"), n, args.slots)
+            size = os.path.getsize(rotating) / 1024
+
+            t_rows, _ = best_of(args.repeat, lambda: parse(flat, vectorized=False))
+            t_vec, _ = best_of(args.repeat, lambda: parse(flat))
+            # The row parser merges every section; the vectorized one keeps the first, so compare on one
+            one = write_timetable_export(os.path.join(tmp, f"one{n}.csv"), 1, args.slots, rotating=False, seed=n)
+            old, new = parse(one, vectorized=False), parse(one)
+            same = ({d: s for d, s in old.timetable.items() if s} == new.timetable
+                    and old.subject_map == new.subject_map)
+            t_sec, brain = best_of(args.repeat, lambda: parse(rotating, section=str(n // 2)))
+            t_all, _ = best_of(args.repeat, lambda: parse(rotating))
+
+            print(f"{n:4d} sections x {args.slots} slots ({size:7.1f} KiB): row-by-row {t_rows * 1000:8.2f}ms  "
+                  f"vectorized {t_vec * 1000:7.2f}ms ({t_rows / t_vec:5.1f}x, same={same})  "
+                  f"A/B file: one section {t_sec * 1000:7.2f}ms, first (default) {t_all * 1000:7.2f}ms "
+                  f"({brain.week_timetable.n_patterns} weeks, {brain.week_timetable.n_classes} classes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Deterministic synthetic inputs for the benchmarks: timetable, absence-details and summary
+CSVs in the layouts the parsers expect, from one student up to whole cohorts. The same
+arguments (including seed) always produce byte-identical files, and nothing touches the network.
+"""
+import os
+import random
+from datetime import date, timedelta
+
+SUBJECTS = ["SOCIAL PSYCHOLOGY BPSY201-4", "COGNITIVE PSYCHOLOGY BPSY202-4", "STATISTICS BSTA101-3",
+            "ENGLISH COMMUNICATION BENG103-2", "ETHICS BETH110-2", "RESEARCH METHODS BPSY205-3",
+            "DEVELOPMENTAL PSYCHOLOGY BPSY203-4", "ENVIRONMENTAL STUDIES BEVS100-2"]
+TIMES = ["8:45 - 9:45", "9:45 - 10:45", "10:45 - 11:45", "11:45 - 12:45", "13:45 - 14:45", "14:45 - 15:45"]
+TIME_COLS = ["P8-45AM", "P9-45AM", "P10-45AM", "P11-45AM", "P13-45PM", "P14-45PM"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+FIRST_SEMESTER = date(2026, 1, 5)
+SEMESTER_WEEKS = 18
+BREAK_WEEKS = 4
+
+
+def semester_days(semesters):
+    """ Teaching dates (Mon-Sat) of `semesters` back-to-back semesters with breaks in between. """
+    days = []
+    for s in range(semesters):
+        start = FIRST_SEMESTER + timedelta(weeks=s * (SEMESTER_WEEKS + BREAK_WEEKS))
+        for i in range(SEMESTER_WEEKS * 7):
+            d = start + timedelta(days=i)
+            if d.weekday() < 6: days.append(d)
+    return days
+
+
+def section_grid(section, seed=11):
+    """ {weekday: [subject or '' per slot]} for one section; free periods are ''. """
+    rng = random.Random(f"{seed}-section-{section}")
+    return {wd: [rng.choice(SUBJECTS) if rng.random() < 0.85 else "" for _ in TIMES] for wd in range(6)}
+
+
+def write_timetable(path, section=0, seed=11):
+    grid = section_grid(section, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"Section {section}," + "," * (len(TIMES) - 1) + "\n")
+        f.write("Time," + ",".join(TIMES) + "\n")
+        for wd, day in enumerate(DAYS):
+            f.write(day + "," + ",".join(grid[wd]) + "\n")
+    return path
+
+
+def write_timetable_export(path, sections=20, slots=12, rotating=True, seed=11):
+    """
+    A wide, messy registrar export: title and note rows, one block per "Section k" with its own
+    time header in mixed formats, free / LUNCH / Break cells, a trailing room column and blank
+    separator rows. rotating=True gives every section A / B weeks (alternately as "Week A" rows
+    and as "Monday (A)" labels) and Saturday classes in B weeks only.
+    """
+    rng = random.Random(seed)
+    formats = ["{h}:{m:02d} - {h2}:{m:02d}", "{h:02d}:{m:02d}AM-{h2:02d}:{m:02d}", "Slot {k} ({h}:{m:02d})"]
+    width = slots + 3
+
+    def row(cells):
+        return ",".join(cells + [""] * (width - len(cells))) + "\n"
+
+    def day_rows(days, label, weekly_sat):
+        out = []
+        for wd, day in enumerate(days):
+            if wd == 5 and not weekly_sat: continue
+            cells = [rng.choice(SUBJECTS) if rng.random() < 0.8 else rng.choice(["", "LUNCH", "Break", "-"])
+                     for _ in range(slots)]
+            name = day if not label else (f"{day} ({label})" if rng.random() < 0.5 else f"{day[:3]} - Week {label}")
+            out.append(row([name] + cells + [f"Room {rng.randint(100, 450)}"]))
+        return out
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(row(["UNIVERSITY TIMETABLE EXPORT", "", "generated"]))
+        f.write(row(["Note: rooms subject to change"]))
+        for sec in range(sections):
+            f.write(row([]))
+            f.write(row([f"Section {sec}"]))
+            fmt = formats[sec % len(formats)]
+            header = [fmt.format(h=8 + k, h2=9 + k, m=45, k=k + 1) for k in range(slots)]
+            f.write(row(["Time"] + header + ["Room"]))
+            if not rotating:
+                f.writelines(day_rows(DAYS, "", True))
+            elif sec % 2:
+                for week in "AB":
+                    f.write(row([f"Week {week}"]))
+                    f.writelines(day_rows(DAYS, "", week == "B"))
+            else:
+                for week in "AB": f.writelines(day_rows(DAYS, week, week == "B"))
+    return path
+
+
+def write_student(root, student_id, semesters=1, section=0, seed=11):
+    """
+    Absence-details and summary CSVs for one student of `section`. Absences only fall on
+    scheduled classes, and the summary's per-subject and total counts agree with them.
+    Returns (absence_path, summary_path).
+    """
+    rng = random.Random(f"{seed}-{student_id}")
+    grid = section_grid(section, seed)
+    skip = rng.uniform(0.05, 0.35)
+    held, absent = {}, {}
+    absence_path = os.path.join(root, f"{student_id}_absence.csv")
+    with open(absence_path, "w", encoding="utf-8") as f:
+        f.write("Sr,Date," + ",".join(TIME_COLS) + ",Total,Percentage\n")
+        done = missed = 0
+        for i, d in enumerate(semester_days(semesters)):
+            cells = []
+            for subj in grid[d.weekday()]:
+                if not subj:
+                    cells.append("")
+                    continue
+                held[subj] = held.get(subj, 0) + 1
+                done += 1
+                if rng.random() < skip:
+                    absent[subj] = absent.get(subj, 0) + 1
+                    missed += 1
+                    cells.append(subj)
+                else:
+                    cells.append("")
+            n_abs = sum(1 for c in cells if c)
+            pct = round(100 * (done - missed) / done) if done else 100
+            f.write(f"{i + 1},{d.strftime('%d-%m-%Y')}," + ",".join(cells) + f",{n_abs},{pct}%\n")
+
+    summary_path = os.path.join(root, f"{student_id}_summary.csv")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write("Sr No,Subject Name,Code,Held,Attended,Absent\n")
+        for i, subj in enumerate(s for s in SUBJECTS if s in held):
+            name, code = subj.rsplit(" ", 1)
+            f.write(f"{i + 1},{name},{code},{held[subj]},{held[subj] - absent.get(subj, 0)},{absent.get(subj, 0)}\n")
+        total, total_abs = sum(held.values()), sum(absent.values())
+        f.write(f",Total,,{total},{total - total_abs},{total_abs}\n")
+    return absence_path, summary_path
+
+
+def write_cohort(root, n_students, semesters=1, sections=4, seed=11):
+    """
+    One timetable per section plus a manifest.csv (student_id,timetable,absence,summary)
+    for backend.cohort. Returns the manifest path.
+    """
+    timetables = [write_timetable(os.path.join(root, f"section_{s}_timetable.csv"), s, seed)
+                  for s in range(sections)]
+    manifest = os.path.join(root, "manifest.csv")
+    with open(manifest, "w", encoding="utf-8") as f:
+        f.write("student_id,timetable,absence,summary\n")
+        for n in range(n_students):
+            sid = f"S{n:05d}"
+            absence, summary = write_student(root, sid, semesters, n % sections, seed)
+            f.write(f"{sid},{os.path.basename(timetables[n % sections])},"
+                    f"{os.path.basename(absence)},{os.path.basename(summary)}\n")
+    return manifest
+
+
+def write_absence_export(path, n_rows, seed=7):
+    """
+    A single large, messy absence export: several rows per date, bare subject codes mixed
+    with full names, and a few rows whose Total disagrees with their cells.
+    """
+    subjects = SUBJECTS[:5] + ["BPSY201-4", "Yoga"]
+    cols = ["P8-45AM", "P9-45AM", "P10-45AM", "P11-45AM", "P12-45PM", "P13-45PM", "P14-45PM", "P15-45PM"]
+    rng = random.Random(seed)
+    d = date(2020, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Sr,Date," + ",".join(cols) + ",Total,Percentage\n")
+        for i in range(n_rows):
+            cells = [rng.choice(subjects) if rng.random() < 0.2 else "" for _ in cols]
+            total = sum(1 for c in cells if c) + (1 if rng.random() < 0.05 else 0)
+            f.write(f"{i + 1},{d.strftime('%d-%m-%Y')}," + ",".join(cells) + f",{total},80%\n")
+            d += timedelta(days=1) if rng.random() < 0.3 else timedelta(days=0)
+    return path
+
+
+def write_summary_export(path, n_students, seed=17):
+    """
+    A registrar's summary export: for every student a "Student ID" row, the header, one row per
+    subject, a Total row and a Percentage row. Returns the per-student (held, absent) totals.
+    """
+    rng = random.Random(seed)
+    totals = []
+    with open(path, "w", encoding="utf-8") as f:
+        for n in range(n_students):
+            f.write(f"Student ID,S{n:06d},,,,\nSr No,Subject Name,Code,Held,Attended,Absent\n")
+            held = absent = 0
+            for i, subj in enumerate(rng.sample(SUBJECTS, rng.randint(4, len(SUBJECTS)))):
+                name, code = subj.rsplit(" ", 1)
+                h = rng.randint(30, 60)
+                a = rng.randint(0, h // 3)
+                f.write(f"{i + 1},{name},{code},{h},{h - a},{a}\n")
+                held, absent = held + h, absent + a
+            f.write(f",Total,,{held},{held - absent},{absent}\n,Percentage,,,{round(100 * (held - absent) / held)}%,\n")
+            totals.append((held, absent))
+    return totals
+
+
+def absence_probability(d):
+    """ The true chance of an absence on date d in write_seasonal_absences. """
+    p = 0.15
+    if d.weekday() == 0: p += 0.15  # Mondays
+    if d.weekday() == 5: p += 0.20  # Saturdays
+    if d.month in (4, 11): p += 0.15  # exam months
+    if d.month in (1, 8): p -= 0.05  # start of semester
+    return p
+
+
+def write_seasonal_absences(path, years=4, seed=13):
+    """
+    Absence-details CSV with one row per Mon-Sat date from 2020, where each day has an absence
+    with absence_probability(d), so risk models have a known signal to recover.
+    """
+    rng = random.Random(seed)
+    d, end = date(2020, 1, 1), date(2020 + years, 1, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Sr,Date," + ",".join(TIME_COLS) + ",Total,Percentage\n")
+        i = 0
+        while d < end:
+            if d.weekday() < 6:
+                absent = rng.random() < absence_probability(d)
+                cells = [rng.choice(SUBJECTS) if absent and k == 0 else "" for k in range(len(TIME_COLS))]
+                i += 1
+                f.write(f"{i},{d.strftime('%d-%m-%Y')}," + ",".join(cells) + f",{int(absent)},80%\n")
+            d += timedelta(days=1)
+    return path
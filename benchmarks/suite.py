@@ -0,0 +1,209 @@
+"""
+Benchmark suite: the main AttendanceBrain operations on generated students (see generators.py),
+with throughput, peak memory and the change against a stored baseline. Headless and offline.
+
+    python benchmarks/suite.py                                  # 1 student, 1 semester
+    python benchmarks/suite.py --students 1000 --semesters 5 --ops parse_timetable load_absence_details
+    python benchmarks/suite.py --save                           # store as the baseline for this scale
+    python benchmarks/suite.py --check                          # exit 1 if an op is >25% slower
+
+Timings cover every student; peak memory is traced on the first student in a separate pass so
+tracemalloc does not slow the timed runs. Baselines live in benchmarks/baselines/suite.json,
+one entry per scale, and only compare meaningfully on the machine that recorded them.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.attendance_backend import AttendanceBrain
+from backend.cache import library_versions
+from backend.cohort import discover_students
+from benchmarks.generators import FIRST_SEMESTER, write_cohort
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "suite.json")
+PLAN_START = FIRST_SEMESTER + timedelta(weeks=8)
+TARGETS = range(60, 100, 5)
+
+
+def op_parse_timetable(brain, student):
+    ok, msg = brain.parse_timetable(student["timetable"])
+    if not ok: raise RuntimeError(msg)
+    return 1
+
+
+def op_parse_attendance_summary(brain, student):
+    ok, msg = brain.parse_attendance_summary(student["summary"])
+    if not ok: raise RuntimeError(msg)
+    return 1
+
+
+def op_load_absence_details(brain, student):
+    ok, msg = brain.load_absence_details(student["absence"], train=False)
+    if not ok: raise RuntimeError(msg)
+    return brain.history.n_days
+
+
+def op_train_models(brain, student):
+    brain.train_models()
+    return brain.history.n_days
+
+
+def op_predict_day_risk(brain, student):
+    for i in range(365):
+        brain.predict_day_risk(PLAN_START + timedelta(days=i))
+    return 365
+
+
+def op_get_recovery_schedule(brain, student):
+    return len(brain.get_recovery_schedule(200, PLAN_START, brain.get_semester_end_date(PLAN_START)))
+
+
+def op_calculate_recovery_plan(brain, student):
+    limit = brain.get_semester_end_date(PLAN_START)
+    for target in TARGETS:
+        brain.calculate_recovery_plan(target, brain.auto_total, brain.auto_absent, PLAN_START, limit)
+    return len(TARGETS)
+
+
+def op_sweep_recovery_plans(brain, student):
+    starts = [PLAN_START + timedelta(weeks=w) for w in range(4)]
+    sweep = brain.sweep_recovery_plans(range(60, 96), starts, [brain.get_semester_end_date(s) for s in starts],
+                                       brain.auto_total, brain.auto_absent)
+    return sweep.status.size
+
+
+# (name, fn, unit, prerequisites), in the order a student's pipeline runs them
+OPS = [
+    ("parse_timetable", op_parse_timetable, "files", []),
+    ("parse_attendance_summary", op_parse_attendance_summary, "files", []),
+    ("load_absence_details", op_load_absence_details, "days", []),
+    ("train_models", op_train_models, "days", ["load_absence_details"]),
+    ("predict_day_risk", op_predict_day_risk, "calls", ["train_models"]),
+    ("get_recovery_schedule", op_get_recovery_schedule, "rows", ["parse_timetable"]),
+    ("calculate_recovery_plan", op_calculate_recovery_plan, "plans", ["parse_timetable", "parse_attendance_summary"]),
+    ("sweep_recovery_plans", op_sweep_recovery_plans, "plans", ["parse_timetable", "parse_attendance_summary"]),
+]
+
+
+def pipeline(selected):
+    """ Selected ops plus whatever they depend on, in pipeline order. """
+    needed, stack = set(), list(selected)
+    prereqs = {name: deps for name, _, _, deps in OPS}
+    while stack:
+        name = stack.pop()
+        if name in needed: continue
+        needed.add(name)
+        stack.extend(prereqs[name])
+    return [op for op in OPS if op[0] in needed]
+
+
+def peak_memory(student, ops):
+    """ {op: peak traced bytes} for one student, after an untraced warm-up run (lazy imports). """
+    warm = AttendanceBrain()
+    for _, fn, _, _ in ops: fn(warm, student)
+    peaks = {}
+    brain = AttendanceBrain()
+    tracemalloc.start()
+    try:
+        for name, fn, _, _ in ops:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(brain, student)
+            peaks[name] = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def run_suite(students, selected):
+    ops = pipeline(selected)
+    peaks = peak_memory(students[0], ops)
+    seconds = {name: 0.0 for name, _, _, _ in ops}
+    units = {name: 0 for name, _, _, _ in ops}
+    for student in students:
+        brain = AttendanceBrain()
+        for name, fn, _, _ in ops:
+            t0 = time.perf_counter()
+            units[name] += fn(brain, student)
+            seconds[name] += time.perf_counter() - t0
+
+    results = {}
+    for name, _, unit, _ in ops:
+        if name not in selected: continue
+        results[name] = {"seconds": round(seconds[name], 4), "unit": unit, "units": units[name],
+                         "per_sec": round(units[name] / seconds[name], 1) if seconds[name] else 0.0,
+                         "peak_mb": round(peaks[name] / 2 ** 20, 2)}
+    return results
+
+
+def load_baselines():
+    if not os.path.exists(BASELINE): return {}
+    with open(BASELINE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def report(results, baseline, tolerance):
+    """ Prints the table; returns the ops that are slower than baseline by more than tolerance. """
+    regressions = []
+    print(f"{'op':26s} {'seconds':>9s} {'throughput':>22s} {'peak MB':>8s}  vs baseline")
+    for name, r in results.items():
+        base = baseline.get(name)
+        delta = ""
+        if base and base["per_sec"]:
+            ratio = r["per_sec"] / base["per_sec"]
+            delta = f"{ratio:5.2f}x throughput"
+            if ratio < 1 - tolerance:
+                delta += "  REGRESSION"
+                regressions.append(name)
+        print(f"{name:26s} {r['seconds']:9.3f} {r['per_sec']:>14,.1f} {r['unit'] + '/s':>7s} {r['peak_mb']:8.2f}  {delta}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--students", type=int, default=1, help="1 up to 10000")
+    parser.add_argument("--semesters", type=int, default=1, choices=range(1, 6))
+    parser.add_argument("--ops", nargs="+", default=[name for name, _, _, _ in OPS],
+                        choices=[name for name, _, _, _ in OPS])
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--save", action="store_true", help="Store these results as the baseline for this scale")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a regression past --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    scale = f"{args.students}x{args.semesters}"
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        manifest = write_cohort(tmp, args.students, args.semesters, seed=args.seed)
+        students = discover_students(manifest)
+        print(f"scale {scale} (students x semesters): generated in {time.perf_counter() - t0:.2f}s")
+        results = run_suite(students, args.ops)
+
+    baselines = load_baselines()
+    regressions = report(results, baselines.get(scale, {}).get("results", {}), args.tolerance)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scale": scale, "results": results}, f, indent=2)
+    if args.save:
+        entry = baselines.setdefault(scale, {"results": {}})
+        entry["results"].update(results)
+        entry["versions"] = library_versions()
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"saved baseline {scale} to {BASELINE}")
+    if args.check and regressions:
+        print(f"regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,17 @@ from datetime import date, timedelta
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QFileDialog,
                              QCalendarWidget, QFrame, QStackedWidget,
-                             QSpinBox, QComboBox, QDateEdit, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QProgressBar, QScrollArea, QMessageBox, QTabWidget)
-from PyQt6.QtCore import Qt, QDate
-from PyQt6.QtGui import QColor
+                             QSpinBox, QComboBox, QDateEdit, QTableWidget, QTableView,
+                             QTableWidgetItem, QHeaderView, QProgressBar, QScrollArea, QMessageBox, QTabWidget, QCheckBox)
+from PyQt6.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex, QPointF, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen
 
 from backend.attendance_backend import AttendanceBrain
+from frontend.workers import BrainRunner
+
+LOAD_CHUNK_ROWS = 50_000
+SWEEP_TARGETS = range(60, 96)
+SWEEP_START_WEEKS = [0, 1, 2, 4]  # curves for starting now and 1, 2 and 4 weeks later
 
 STYLESHEET = """
 QMainWindow { background-color: #000000; }
@@ -24,7 +29,7 @@ QPushButton:hover { background-color: #111111; border-color: #666666; }
 QPushButton[class="Primary"] { background-color: #ededed; color: #000000; border: 1px solid #ededed; }
 QPushButton[class="Auto"] { background-color: #0070F3; color: white; border: none; }
 QSpinBox, QComboBox, QDateEdit { background-color: #0A0A0A; border: 1px solid #333333; padding: 8px; border-radius: 6px; color: white; }
-QTableWidget { background-color: #0A0A0A; border: 1px solid #333; gridline-color: #222; }
+QTableWidget, QTableView { background-color: #0A0A0A; border: 1px solid #333; gridline-color: #222; }
 QHeaderView::section { background-color: #111; padding: 4px; border: none; color: #888; }
 QProgressBar { border: none; background-color: #222; height: 6px; border-radius: 3px; }
 QProgressBar::chunk { background-color: #0070F3; border-radius: 3px; }
@@ -38,15 +43,32 @@ class DateHeatmap(QCalendarWidget):
     def __init__(self, brain):
         super().__init__()
         self.brain = brain
+        self.risk_start = None
+        self.risks = None
         self.setGridVisible(False)
         self.setVerticalHeaderFormat(QCalendarWidget.VerticalHeaderFormat.NoVerticalHeader)
+        self.currentPageChanged.connect(lambda y, m: self.refresh_risks())
+
+    def refresh_risks(self):
+        """ Scores the whole visible page in one batch so paintCell only does lookups. """
+        if not self.brain.is_trained:
+            self.risks = None
+            return
+        # The grid shows 6 weeks, starting up to a week before the 1st
+        self.risk_start = date(self.yearShown(), self.monthShown(), 1) - timedelta(days=7)
+        self.risks = self.brain.predict_risk_range(self.risk_start, self.risk_start + timedelta(days=48))
+        self.updateCells()
 
     def paintCell(self, painter, rect, date):
         super().paintCell(painter, rect, date)
         if self.brain.is_trained:
             py_date = date.toPyDate()
             if py_date >= date.currentDate().toPyDate():
-                risk = self.brain.predict_day_risk(py_date)
+                offset = (py_date - self.risk_start).days if self.risks is not None else -1
+                if 0 <= offset < len(self.risks):
+                    risk = self.risks[offset]
+                else:
+                    risk = self.brain.predict_day_risk(py_date)
                 if risk > 0.6:
                     painter.fillRect(rect, QColor(255, 0, 80, 80))
                 elif risk > 0.3:
@@ -66,25 +88,24 @@ class TimetableHeatmap(QTableWidget):
     def update_data(self, brain):
         self.clearContents()
         risk_matrix = brain.get_slot_risk_matrix()  # {(DayIdx, Time): Risk}
-        timetable = brain.timetable
-
-        # 1. Collect all unique time slots from timetable
-        all_times = set()
-        for day, slots in timetable.items():
-            all_times.update(slots.keys())
+        tt = brain.week_timetable
 
-        sorted_times = sorted(list(all_times))
-        if not sorted_times: return  # No data yet
+        # 1. Time slots with a class in any week, straight off the (week, weekday, slot) grid
+        grid = tt.grid[:, :6]
+        used = [s for s in range(len(tt.times)) if (grid[:, :, s] >= 0).any()]
+        if not used: return  # No data yet
+        sorted_times = [tt.times[s] for s in used]
 
         self.setRowCount(len(sorted_times))
         self.setVerticalHeaderLabels(sorted_times)
 
-        for r, time_str in enumerate(sorted_times):
+        for r, (s, time_str) in enumerate(zip(used, sorted_times)):
             for c in range(6):  # Mon=0 to Sat=5
-                # Get Subject Name
-                subj_name = ""
-                if c in timetable and time_str in timetable[c]:
-                    subj_name = timetable[c][time_str]
+                # Get Subject Name: one line per week when A / B weeks differ
+                names = [tt.subjects[k] if k >= 0 else "" for k in grid[:, c, s].tolist()]
+                subj_name = names[0]
+                if len(set(names)) > 1:
+                    subj_name = "\n".join(f"{week}: {name or '-'}" for week, name in zip(tt.patterns, names))
 
                 # Get Risk
                 risk = risk_matrix.get((c, time_str), 0)
@@ -109,10 +130,167 @@ class TimetableHeatmap(QTableWidget):
                 self.setItem(r, c, item)
 
 
+class ScheduleModel(QAbstractTableModel):
+    """
+    Recovery schedule as a table model. Rows come from the backend's lazy RecoverySchedule
+    (any indexable sequence works), so only the rows the view actually paints are built.
+    """
+    HEADERS = ["Date", "Day", "Time", "Subject"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.schedule = []
+        self._row_cache = {}  # row -> schedule entry; the view repaints the same rows often
+
+    def set_schedule(self, schedule):
+        """ Swaps in a new result in O(1): the view re-queries rowCount and its visible rows only. """
+        self.beginResetModel()
+        self.schedule = schedule if schedule is not None else []
+        self._row_cache = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.schedule)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def entry(self, row):
+        item = self._row_cache.get(row)
+        if item is None:
+            if len(self._row_cache) > 512: self._row_cache.clear()
+            item = self._row_cache[row] = self.schedule[row]
+        return item
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole: return None
+        item = self.entry(index.row())
+        col = index.column()
+        if col == 0: return item['Date'].strftime("%d-%m")
+        if col == 1: return item['Day']
+        if col == 2: return item['Time']
+        return item['Subject']
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class SweepCurve(QWidget):
+    """
+    Classes to attend (or days until the target is reached) against target %, one line per
+    start date, from a PlanSweep. Hovering shows the plan at a point; clicking picks it.
+    """
+    picked = pyqtSignal(int, object)  # target, start date
+    COLORS = ["#0070F3", "#50E3C2", "#F5A623", "#FF0080"]
+    MARGIN = (48, 12, 12, 28)  # left, top, right, bottom
+
+    def __init__(self):
+        super().__init__()
+        self.sweep = None
+        self.metric = "classes_needed"
+        self.setMouseTracking(True)
+        self.setMinimumHeight(180)
+
+    def set_sweep(self, sweep):
+        self.sweep = sweep
+        self.update()
+
+    def set_metric(self, metric):
+        self.metric = metric
+        self.update()
+
+    def _values(self):
+        """ (n_starts, n_targets) values to plot; None where a target cannot be reached. """
+        sw = self.sweep
+        values = getattr(sw, self.metric)
+        reached = [i for i, name in enumerate(sw.STATUSES) if name in ("surplus", "deficit")]
+        return [[int(values[i, j]) if sw.status[i, j] in reached else None for j in range(len(sw.targets))]
+                for i in range(len(sw.start_dates))]
+
+    def _frame(self):
+        left, top, right, bottom = self.MARGIN
+        return left, top, self.width() - left - right, self.height() - top - bottom
+
+    def _point(self, j, value, y_max):
+        x0, y0, w, h = self._frame()
+        n = max(len(self.sweep.targets) - 1, 1)
+        return QPointF(x0 + w * j / n, y0 + h * (1 - value / y_max))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        x0, y0, w, h = self._frame()
+        painter.setPen(QPen(QColor("#333333")))
+        painter.drawRect(x0, y0, w, h)
+        if self.sweep is None or not self.sweep.targets:
+            painter.setPen(QColor("#888888"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Calculate a forecast to see every target")
+            return
+
+        rows = self._values()
+        y_max = max([v for row in rows for v in row if v is not None] + [1])
+        painter.setPen(QColor("#888888"))
+        painter.drawText(4, y0 + 10, str(y_max))
+        painter.drawText(4, y0 + h, "0")
+        targets = self.sweep.targets
+        for j in (0, len(targets) // 2, len(targets) - 1):
+            painter.drawText(self._point(j, 0, y_max) + QPointF(-8, 16), f"{targets[j]}%")
+
+        for i, row in enumerate(rows):
+            color = QColor(self.COLORS[i % len(self.COLORS)])
+            painter.setPen(QPen(color, 2))
+            prev = None
+            for j, v in enumerate(row):
+                pt = None if v is None else self._point(j, v, y_max)
+                if pt is not None and prev is not None: painter.drawLine(prev, pt)
+                prev = pt
+            painter.drawText(x0 + 8, y0 + 14 + 14 * i, self.sweep.start_dates[i].strftime("from %d %b"))
+
+    def _hit(self, pos):
+        """ (start index, target index) of the plotted point nearest to pos, or None. """
+        if self.sweep is None or not self.sweep.targets: return None
+        x0, _, w, _ = self._frame()
+        n = max(len(self.sweep.targets) - 1, 1)
+        j = min(max(round((pos.x() - x0) * n / max(w, 1)), 0), len(self.sweep.targets) - 1)
+        rows = self._values()
+        y_max = max([v for row in rows for v in row if v is not None] + [1])
+        best = None
+        for i, row in enumerate(rows):
+            if row[j] is None: continue
+            dist = abs(self._point(j, row[j], y_max).y() - pos.y())
+            if best is None or dist < best[0]: best = (dist, i)
+        return None if best is None or best[0] > 24 else (best[1], j)
+
+    def mouseMoveEvent(self, event):
+        hit = self._hit(event.position())
+        if hit is None:
+            self.setToolTip("")
+            return
+        plan = self.sweep.plan(*hit)
+        start = self.sweep.start_dates[hit[0]].strftime("%d %b")
+        if plan["status"] == "surplus":
+            text = f"{plan['target']}% from {start}: safe, skip {plan['classes_skippable']}"
+        else:
+            text = (f"{plan['target']}% from {start}: attend {plan['classes_needed']} classes over "
+                    f"{plan['days_needed']} days, reached {plan['end_date'].strftime('%d %b %Y')}")
+        self.setToolTip(text)
+
+    def mousePressEvent(self, event):
+        hit = self._hit(event.position())
+        if hit is not None: self.picked.emit(self.sweep.targets[hit[1]], self.sweep.start_dates[hit[0]])
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.brain = AttendanceBrain()
+        self.brain.enable_cache()
+        self.runner = BrainRunner(lambda: self.brain, self)
+        self.runner.progress.connect(self.on_task_progress)
+        self.runner.failed.connect(self.on_task_failed)
+        self.runner.busy_changed.connect(self.on_busy_changed)
         self.setWindowTitle("Attendance...")
         self.resize(1300, 950)
         self.setStyleSheet(STYLESHEET)
@@ -153,19 +331,39 @@ class MainWindow(QMainWindow):
         sb_layout.addWidget(self.btn_tt)
 
         self.btn_daily = QPushButton("2. Load Absence Details")
-        self.btn_daily.clicked.connect(self.load_absence_details)
+        self.btn_daily.clicked.connect(lambda: self.load_absence_details())
         sb_layout.addWidget(self.btn_daily)
 
+        self.btn_daily_more = QPushButton("+ Append Newer Absences")
+        self.btn_daily_more.clicked.connect(lambda: self.load_absence_details(append=True))
+        sb_layout.addWidget(self.btn_daily_more)
+
         self.btn_summary = QPushButton("3. Load Attendance Details")
         self.btn_summary.clicked.connect(self.load_summary)
         sb_layout.addWidget(self.btn_summary)
 
+        self.btn_calendar = QPushButton("Load Academic Calendar")
+        self.btn_calendar.clicked.connect(self.load_calendar)
+        sb_layout.addWidget(self.btn_calendar)
+
         self.lbl_status = QLabel("System Ready")
         self.lbl_status.setStyleSheet("color: #444; font-size: 12px; margin-top:10px;")
         self.lbl_status.setWordWrap(True)
         sb_layout.addWidget(self.lbl_status)
+
+        self.task_bar = QProgressBar()
+        self.task_bar.setVisible(False)
+        sb_layout.addWidget(self.task_bar)
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.runner.cancel)
+        sb_layout.addWidget(self.btn_cancel)
         sb_layout.addStretch()
 
+        self.btn_debug = QPushButton("Debug Stats")
+        self.btn_debug.clicked.connect(self.show_debug_panel)
+        sb_layout.addWidget(self.btn_debug)
+
         self.stack = QStackedWidget()
         self.page_dash = QWidget()
         self.setup_dashboard(self.page_dash)
@@ -175,6 +373,10 @@ class MainWindow(QMainWindow):
         self.setup_planner(self.page_plan)
         self.stack.addWidget(self.page_plan)
 
+        self.page_debug = QWidget()
+        self.setup_debug_panel(self.page_debug)
+        self.stack.addWidget(self.page_debug)
+
         main_layout.addWidget(sidebar)
         main_layout.addWidget(self.stack)
 
@@ -232,6 +434,60 @@ class MainWindow(QMainWindow):
 
         layout.addLayout(row1)
 
+    DEBUG_COLUMNS = ["calls", "total_ms", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms", "rows"]
+
+    def setup_debug_panel(self, parent):
+        layout = QVBoxLayout(parent)
+        layout.setContentsMargins(32, 32, 32, 32)
+        l_db = QLabel("Instrumentation")
+        l_db.setProperty("class", "Header")
+        layout.addWidget(l_db)
+
+        controls = QHBoxLayout()
+        self.chk_instrument = QCheckBox("Record timings")
+        self.chk_instrument.toggled.connect(self.toggle_instrumentation)
+        controls.addWidget(self.chk_instrument)
+        controls.addStretch()
+        for text, slot in (("Refresh", self.refresh_debug_panel), ("Reset", self.reset_debug_stats),
+                           ("Export JSON", self.export_debug_stats)):
+            btn = QPushButton(text)
+            btn.clicked.connect(slot)
+            controls.addWidget(btn)
+        layout.addLayout(controls)
+
+        self.debug_table = QTableWidget(0, len(self.DEBUG_COLUMNS) + 1)
+        self.debug_table.setHorizontalHeaderLabels(["Method / Phase"] + self.DEBUG_COLUMNS)
+        self.debug_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.debug_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.debug_table.verticalHeader().setVisible(False)
+        self.debug_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.debug_table)
+
+    def show_debug_panel(self):
+        self.stack.setCurrentIndex(2)
+        self.refresh_debug_panel()
+
+    def toggle_instrumentation(self, on):
+        self.brain.enable_instrumentation(on)
+        self.refresh_debug_panel()
+
+    def reset_debug_stats(self):
+        if self.brain.instruments is not None: self.brain.instruments.reset()
+        self.refresh_debug_panel()
+
+    def export_debug_stats(self):
+        if self.brain.instruments is None: return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Stats", "attendance_stats.json", "JSON (*.json)")
+        if path: self.brain.instruments.to_json(path)
+
+    def refresh_debug_panel(self):
+        stats = self.brain.instrumentation_stats()
+        self.debug_table.setRowCount(len(stats))
+        for row, (name, st) in enumerate(stats.items()):
+            self.debug_table.setItem(row, 0, QTableWidgetItem(name))
+            for col, key in enumerate(self.DEBUG_COLUMNS, start=1):
+                self.debug_table.setItem(row, col, QTableWidgetItem(f"{st[key]:,}"))
+
     def setup_planner(self, parent):
         layout = QVBoxLayout(parent)
         layout.setContentsMargins(32, 32, 32, 32)
@@ -333,6 +589,25 @@ class MainWindow(QMainWindow):
         res_row.addWidget(self.res_timeline, stretch=1)
         layout.addLayout(res_row)
 
+        curve_card = QFrame()
+        curve_card.setProperty("class", "Card")
+        curve_lay = QVBoxLayout(curve_card)
+        curve_head = QHBoxLayout()
+        l_sw = QLabel("ALL TARGETS")
+        l_sw.setProperty("class", "SubHeader")
+        curve_head.addWidget(l_sw)
+        curve_head.addStretch()
+        self.combo_curve = QComboBox()
+        self.combo_curve.addItems(["Classes to Attend", "Days to Reach"])
+        self.combo_curve.currentIndexChanged.connect(
+            lambda i: self.sweep_curve.set_metric(["classes_needed", "days_needed"][i]))
+        curve_head.addWidget(self.combo_curve)
+        curve_lay.addLayout(curve_head)
+        self.sweep_curve = SweepCurve()
+        self.sweep_curve.picked.connect(self.pick_sweep_point)
+        curve_lay.addWidget(self.sweep_curve)
+        layout.addWidget(curve_card)
+
         self.table_card = QFrame()
         self.table_card.setProperty("class", "Card")
         table_lay = QVBoxLayout(self.table_card)
@@ -340,9 +615,9 @@ class MainWindow(QMainWindow):
         l_rs.setProperty("class", "SubHeader")
         table_lay.addWidget(l_rs)
 
-        self.sched_table = QTableWidget()
-        self.sched_table.setColumnCount(4)
-        self.sched_table.setHorizontalHeaderLabels(["Date", "Day", "Time", "Subject"])
+        self.sched_model = ScheduleModel(self)
+        self.sched_table = QTableView()
+        self.sched_table.setModel(self.sched_model)
         self.sched_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.sched_table.verticalHeader().setVisible(False)
         self.sched_table.setShowGrid(False)
@@ -363,36 +638,89 @@ class MainWindow(QMainWindow):
         l.addWidget(v)
         return w
 
+    # --- Background tasks: see BrainRunner for how loads are isolated from what the GUI reads ---
+    def set_brain(self, brain):
+        """ Commits a brain loaded in the background; only ever called on the GUI thread. """
+        self.brain = brain
+        self.cal_view.brain = brain
+
+    def on_task_progress(self, kind, pct, text):
+        self.task_bar.setValue(pct)
+        if text: self.lbl_status.setText(f"Loading {kind}... {text}")
+
+    def on_task_failed(self, kind, error):
+        if kind == "calc" and error != "Cancelled":
+            QMessageBox.critical(self, "Calc Error", error)
+        else:
+            self.lbl_status.setText(f"{kind.title()}: {error}")
+
+    def on_busy_changed(self, busy):
+        self.task_bar.setValue(0)
+        self.task_bar.setVisible(busy)
+        self.btn_cancel.setVisible(busy)
+        if not busy and self.stack.currentIndex() == 2: self.refresh_debug_panel()
+
     def load_timetable(self):
         path, _ = QFileDialog.getOpenFileName(self, "Timetable", "", "CSV (*.csv)")
         if path:
-            ok, msg = self.brain.parse_timetable(path)
-            self.lbl_status.setText(msg)
-            if ok:
-                self.btn_tt.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
-                self.time_view.update_data(self.brain)  # Refresh view
-
-    def load_absence_details(self):
+            self.runner.submit("timetable", lambda brain, report: brain.parse_timetable(
+                path, chunksize=LOAD_CHUNK_ROWS, progress=lambda rows, done, total: report(done, total, f"{rows:,} rows")),
+                self.timetable_loaded, mutates=True)
+
+    def timetable_loaded(self, result):
+        brain, (ok, msg) = result
+        self.lbl_status.setText(msg)
+        if ok:
+            self.set_brain(brain)
+            self.btn_tt.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
+            self.time_view.update_data(self.brain)  # Refresh view
+
+    def load_absence_details(self, append=False):
         path, _ = QFileDialog.getOpenFileName(self, "Absence Details", "", "CSV (*.csv)")
         if path:
-            ok, msg = self.brain.load_absence_details(path)
-            self.lbl_status.setText(msg)
-            if ok:
-                self.btn_daily.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
-                self.cal_view.updateCell(QDate.currentDate())
-                self.time_view.update_data(self.brain)  # Refresh view
-                self.refresh_dashboard_widgets()
+            self.runner.submit("absences", lambda brain, report: brain.load_absence_details(
+                path, append=append, progress=lambda rows, done, total: report(done, total, f"{rows:,} rows")),
+                self.absences_loaded, mutates=True)
+
+    def absences_loaded(self, result):
+        brain, (ok, msg) = result
+        self.lbl_status.setText(msg)
+        if ok:
+            self.set_brain(brain)
+            self.btn_daily.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
+            self.cal_view.refresh_risks()
+            self.refresh_dashboard_widgets()  # also refreshes the timetable view
 
     def load_summary(self):
         path, _ = QFileDialog.getOpenFileName(self, "Attendance Details", "", "CSV (*.csv)")
         if path:
-            ok, msg = self.brain.parse_attendance_summary(path)
-            self.lbl_status.setText(msg)
-            if ok:
-                self.btn_summary.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
-                self.btn_auto.setVisible(True)
-                self.btn_auto.setText(f"⚡ AUTO FILL ({self.brain.auto_total} / {self.brain.auto_absent})")
-                self.refresh_dashboard_widgets()
+            self.runner.submit("summary", lambda brain, report: brain.parse_attendance_summary(
+                path, chunksize=LOAD_CHUNK_ROWS, progress=lambda rows, done, total: report(done, total, f"{rows:,} rows")),
+                self.summary_loaded, mutates=True)
+
+    def summary_loaded(self, result):
+        brain, (ok, msg) = result
+        self.lbl_status.setText(msg)
+        if ok:
+            self.set_brain(brain)
+            self.btn_summary.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
+            self.btn_auto.setVisible(True)
+            self.btn_auto.setText(f"⚡ AUTO FILL ({self.brain.auto_total} / {self.brain.auto_absent})")
+            self.refresh_dashboard_widgets()
+
+    def load_calendar(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Academic Calendar", "", "JSON (*.json)")
+        if path:
+            self.runner.submit("calendar", lambda brain, report: brain.load_calendar(path),
+                               self.calendar_loaded, mutates=True)
+
+    def calendar_loaded(self, result):
+        brain, (ok, msg) = result
+        self.lbl_status.setText(msg)
+        if ok:
+            self.set_brain(brain)
+            self.btn_calendar.setStyleSheet("border: 1px solid #0070F3; color: #0070F3;")
+            self.cal_view.refresh_risks()
 
     def refresh_dashboard_widgets(self):
         self.time_view.update_data(self.brain)
@@ -438,22 +766,40 @@ class MainWindow(QMainWindow):
             target = self.spin_target.value()
             start = date.today()
             if self.combo_start.currentIndex() == 1: start = self.date_edit_start.date().toPyDate()
+            limit = self.plan_limit(start)
 
-            mode = self.combo_end.currentIndex()
-            if mode == 0:
-                limit = start + timedelta(days=180)
-            elif mode == 1:
-                limit = self.brain.get_semester_end_date(start)
-            else:
-                limit = self.date_edit_end.date().toPyDate()
+            self.runner.submit("calc", lambda brain, report: brain.calculate_recovery_plan(
+                target, tot, absent, start, limit), self.plan_ready)
 
-            res = self.brain.calculate_recovery_plan(target, tot, absent, start, limit)
+            starts = [start + timedelta(weeks=w) for w in SWEEP_START_WEEKS]
+            limits = [self.plan_limit(s) for s in starts]
+            self.runner.submit("sweep", lambda brain, report: brain.sweep_recovery_plans(
+                SWEEP_TARGETS, starts, limits, tot, absent), self.sweep_curve.set_sweep)
+        except Exception as e:
+            QMessageBox.critical(self, "Calc Error", str(e))
 
+    def plan_limit(self, start):
+        mode = self.combo_end.currentIndex()
+        if mode == 0: return start + timedelta(days=180)
+        if mode == 1: return self.brain.get_semester_end_date(start)
+        return self.date_edit_end.date().toPyDate()
+
+    def pick_sweep_point(self, target, start):
+        """ A click on the curve: plan that target from that start date in full. """
+        self.spin_target.setValue(target)
+        if start != date.today():
+            self.combo_start.setCurrentIndex(1)
+            self.date_edit_start.setDate(QDate(start.year, start.month, start.day))
+        self.calculate_plan()
+
+    def plan_ready(self, res):
+        try:
+            tot = self.spin_total.value()
             if tot > 0: self.badge_pct.setText(f"CURRENT: {res['current_pct']:.1f}%")
 
             act_lbl = self.res_action.findChild(QLabel, "StatValue")
             time_lbl = self.res_timeline.findChild(QLabel, "StatValue")
-            self.sched_table.setRowCount(0)
+            self.sched_model.set_schedule(res.get('schedule'))
 
             if res['status'] == 'impossible':
                 act_lbl.setText("Impossible Target")
@@ -466,15 +812,6 @@ class MainWindow(QMainWindow):
                 end_str = res['end_date'].strftime('%d %b %Y')
                 act_lbl.setText(f"IMPOSSIBLE BY {end_str}")
                 time_lbl.setText(f"Max Possible: {max_p:.1f}%")
-                if 'schedule' in res:
-                    for item in res['schedule']:
-                        row = self.sched_table.rowCount()
-                        self.sched_table.insertRow(row)
-                        self.sched_table.setItem(row, 0, QTableWidgetItem(item['Date'].strftime("%d-%m")))
-                        self.sched_table.setItem(row, 1, QTableWidgetItem(item['Day']))
-                        self.sched_table.setItem(row, 2, QTableWidgetItem(item['Time']))
-                        self.sched_table.setItem(row, 3, QTableWidgetItem(item['Subject']))
-
             elif res['status'] == 'surplus':
                 act_lbl.setText(f"SAFE: Skip {res['classes_skippable']}")
                 time_lbl.setText("Target Met")
@@ -483,22 +820,18 @@ class MainWindow(QMainWindow):
                 if 'days_needed' in res:
                     end_str = res['end_date'].strftime('%d %b %Y')
                     time_lbl.setText(f"{res['days_needed']} Days\nUntil {end_str}")
-                    if 'schedule' in res:
-                        for item in res['schedule']:
-                            row = self.sched_table.rowCount()
-                            self.sched_table.insertRow(row)
-                            self.sched_table.setItem(row, 0, QTableWidgetItem(item['Date'].strftime("%d-%m")))
-                            self.sched_table.setItem(row, 1, QTableWidgetItem(item['Day']))
-                            self.sched_table.setItem(row, 2, QTableWidgetItem(item['Time']))
-                            self.sched_table.setItem(row, 3, QTableWidgetItem(item['Subject']))
                 else:
                     time_lbl.setText("Load Timetable")
         except Exception as e:
             QMessageBox.critical(self, "Calc Error", str(e))
 
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def main(argv=None):
+    app = QApplication(sys.argv if argv is None else argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,147 @@
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class TaskCancelled(BaseException):
+    """ A BaseException, so the brain loaders' `except Exception` error handling lets it through. """
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(object, int, str)  # task, percent, text
+    done = pyqtSignal(object, object)  # task, result
+    failed = pyqtSignal(object, str)  # task, error
+
+
+class BrainTask(QRunnable):
+    """
+    One AttendanceBrain operation on a pool thread. fn(brain, report) does the work;
+    report(done, total, text) publishes progress and raises TaskCancelled once cancel() was called.
+    """
+
+    def __init__(self, kind, fn, brain, on_done, mutates):
+        super().__init__()
+        self.kind = kind
+        self.fn = fn
+        self.brain = brain
+        self.on_done = on_done
+        self.mutates = mutates
+        self.signals = TaskSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, done, total, text=""):
+        if self.cancelled: raise TaskCancelled()
+        pct = int(100 * done / total) if total else 0
+        self.signals.progress.emit(self, pct, text)
+
+    def run(self):
+        try:
+            if self.cancelled: raise TaskCancelled()
+            result = self.fn(self.brain, self.report)
+            self.signals.done.emit(self, result)
+        except TaskCancelled:
+            self.signals.failed.emit(self, "Cancelled")
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+
+
+class BrainRunner(QObject):
+    """
+    Runs AttendanceBrain work off the GUI thread.
+
+    Isolation rule: background work never mutates the brain the GUI is reading.
+    - Mutating tasks (loads) run one at a time on get_brain().snapshot(), taken when the task
+      starts. On success the loaded snapshot is handed to on_done on the GUI thread, which
+      commits it by swapping the window's brain; until then the GUI keeps reading the old one.
+    - Read-only tasks (calculations) run on the committed brain and are coalesced per kind:
+      submitting a new one cancels the previous, and only the latest one's result is delivered.
+    """
+
+    progress = pyqtSignal(str, int, str)  # kind, percent, text
+    busy_changed = pyqtSignal(bool)
+    failed = pyqtSignal(str, str)  # kind, error
+
+    def __init__(self, get_brain, parent=None):
+        super().__init__(parent)
+        self.get_brain = get_brain
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(2)
+        self._queue = deque()  # pending mutating tasks: (kind, fn, on_done)
+        self._load = None  # running mutating task
+        self._latest = {}  # kind -> latest read-only task
+        self._alive = set()  # every started task, kept referenced until its final signal
+
+    def submit(self, kind, fn, on_done, mutates=False):
+        if mutates:
+            self._queue.append((kind, fn, on_done))
+            self._start_next_load()
+        else:
+            previous = self._latest.get(kind)
+            if previous: previous.cancel()
+            task = BrainTask(kind, fn, self.get_brain(), on_done, mutates=False)
+            self._latest[kind] = task
+            self._start(task)
+        self.busy_changed.emit(self.busy)
+
+    @property
+    def busy(self):
+        return self._load is not None or any(not t.cancelled for t in self._latest.values())
+
+    def cancel(self):
+        """ Cancels the running load, drops queued ones, and cancels every calculation. """
+        self._queue.clear()
+        if self._load: self._load.cancel()
+        for task in self._latest.values(): task.cancel()
+
+    def _start_next_load(self):
+        if self._load is not None or not self._queue: return
+        kind, fn, on_done = self._queue.popleft()
+        self._load = BrainTask(kind, fn, self.get_brain().snapshot(), on_done, mutates=True)
+        self._start(self._load)
+
+    def _start(self, task):
+        task.setAutoDelete(False)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.done.connect(self._on_done)
+        task.signals.failed.connect(self._on_failed)
+        self._alive.add(task)
+        self.pool.start(task)
+
+    def _is_current(self, task):
+        return task is self._load if task.mutates else self._latest.get(task.kind) is task
+
+    def _finish(self, task):
+        if task.mutates:
+            self._load = None
+            self._start_next_load()
+        elif self._latest.get(task.kind) is task:
+            del self._latest[task.kind]
+        self.busy_changed.emit(self.busy)
+
+    @pyqtSlot(object, int, str)
+    def _on_progress(self, task, pct, text):
+        if self._is_current(task) and not task.cancelled: self.progress.emit(task.kind, pct, text)
+
+    @pyqtSlot(object, object)
+    def _on_done(self, task, result):
+        self._alive.discard(task)
+        current = self._is_current(task)
+        if current and not task.cancelled:
+            # Committed on the GUI thread; for loads the result is (task.brain, fn's return value)
+            task.on_done((task.brain, result) if task.mutates else result)
+        if current: self._finish(task)
+
+    @pyqtSlot(object, str)
+    def _on_failed(self, task, error):
+        self._alive.discard(task)
+        current = self._is_current(task)
+        if current: self.failed.emit(task.kind, error)
+        if current: self._finish(task)
@@ -1,4 +1,7 @@
-import os
+import sys
+
+from frontend.attendance_gui import main
 
 if __name__ == "__main__":
-    os.system("python frontend/attendance_gui.py")
\ No newline at end of file
+    # Same interpreter: pandas / NumPy / scikit-learn are only imported once a file is loaded
+    sys.exit(main())